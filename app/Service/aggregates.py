@@ -0,0 +1,191 @@
+import re
+from collections import Counter
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from app.models import models
+from app.utils.constant import STOPWORDS
+
+
+_LOWER_STOPWORDS = {word.lower() for word in STOPWORDS}
+WORD_MAX_LENGTH = 100
+
+def tokenize_summary(text: str) -> list:
+    '''
+    wordcloud 입력과 같은 방식으로 요약문을 단어 리스트로 변환 (구두점 제거 + 불용어 제외)
+    '''
+    text = re.sub(r"[^\w\s]", "", text or "")
+    return [
+        word for word in text.split()
+        if word.lower() not in _LOWER_STOPWORDS and not word.isdigit() and len(word) <= WORD_MAX_LENGTH
+    ]
+
+class AggregateDelta:
+    '''
+    국가별 집계 변화량(+/-)을 모은 뒤 한 번에 반영
+    '''
+    def __init__(self):
+        self.words = {}   # {country_id: Counter(word)}
+        self.genres = {}  # {country_id: Counter(genre_id)}
+        self.stats = {}   # {country_id: [movie_count, score_sum]}
+
+    def add_movie(self, country_id: int, summary: str, score: float, genre_ids, sign: int = 1):
+        '''
+        :param sign: 1이면 영화 추가, -1이면 (갱신 전 값) 제거
+        '''
+        words = self.words.setdefault(country_id, Counter())
+        for word in tokenize_summary(summary):
+            words[word] += sign
+        genres = self.genres.setdefault(country_id, Counter())
+        for genre_id in genre_ids:
+            genres[genre_id] += sign
+        stats = self.stats.setdefault(country_id, [0, 0.0])
+        stats[1] += sign * (score or 0.0)
+
+    def count_movie(self, country_id: int):
+        self.stats.setdefault(country_id, [0, 0.0])[0] += 1
+
+    def apply(self, db: Session):
+        word_rows = [
+            {'country_id': country_id, 'word': word, 'count': count}
+            for country_id, counter in self.words.items() for word, count in counter.items() if count
+        ]
+        genre_rows = [
+            {'country_id': country_id, 'genre_id': genre_id, 'count': count}
+            for country_id, counter in self.genres.items() for genre_id, count in counter.items() if count
+        ]
+        stats_rows = [
+            {'country_id': country_id, 'movie_count': count, 'score_sum': score_sum}
+            for country_id, (count, score_sum) in self.stats.items() if count or score_sum
+        ]
+        _upsert_increment(db, models.CountryWordFrequency, ['country_id', 'word'], ['count'], word_rows)
+        _upsert_increment(db, models.CountryGenreCount, ['country_id', 'genre_id'], ['count'], genre_rows)
+        _upsert_increment(db, models.CountryStats, ['country_id'], ['movie_count', 'score_sum'], stats_rows)
+        # 0 이하가 된 단어/장르는 정리
+        db.execute(delete(models.CountryWordFrequency).where(models.CountryWordFrequency.count <= 0))
+        db.execute(delete(models.CountryGenreCount).where(models.CountryGenreCount.count <= 0))
+
+def _upsert_increment(db: Session, model, key_columns: list, value_columns: list, rows: list):
+    '''
+    키가 있으면 값에 더하고 없으면 INSERT (MySQL: ON DUPLICATE KEY UPDATE, SQLite: ON CONFLICT DO UPDATE)
+    '''
+    if not rows:
+        return
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql_insert(model)
+        stmt = stmt.on_duplicate_key_update({
+            column: table.c[column] + stmt.inserted[column] for column in value_columns
+        })
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: table.c[column] + stmt.excluded[column] for column in value_columns}
+        )
+    else:
+        # refresh_country_aggregates 는 대상 국가의 행을 지운 뒤 반영하므로 일반 INSERT 로 충분
+        stmt = insert(model)
+    for i in range(0, len(rows), 500):
+        db.execute(stmt, rows[i:i + 500])
+
+def aggregate_movie_ids(db: Session, country_id: int):
+    '''
+    집계 대상 영화 id 조회문. 대시보드 TOP-K 와 같은 모집단이 되도록 국가의 최신 랭킹 스냅샷에 있는 영화만 사용하고,
+    랭킹 스냅샷이 없는 국가(이전 데이터)는 국가의 모든 영화를 사용한다.
+    '''
+    snapshot_at = db.scalar(
+        select(func.max(models.Ranking.crawled_at)).where(models.Ranking.country_id == country_id)
+    )
+    if snapshot_at is None:
+        return select(models.Movie.id).where(models.Movie.country_id == country_id)
+    return select(models.Ranking.movie_id).distinct().where(
+        models.Ranking.country_id == country_id, models.Ranking.crawled_at == snapshot_at
+    )
+
+def _collect_country_aggregates(db: Session, country_ids) -> AggregateDelta:
+    delta = AggregateDelta()
+    for country_id in country_ids:
+        movie_ids = aggregate_movie_ids(db, country_id)
+        genres_by_movie = {}
+        for movie_id, genre_id in db.execute(
+            select(models.MovieGenre.movie_id, models.MovieGenre.genre_id).where(models.MovieGenre.movie_id.in_(movie_ids))
+        ):
+            genres_by_movie.setdefault(movie_id, []).append(genre_id)
+        for movie_id, summary, score in db.execute(
+            select(models.Movie.id, models.Movie.summary, models.Movie.score).where(models.Movie.id.in_(movie_ids))
+        ):
+            delta.add_movie(country_id, summary, score, genres_by_movie.get(movie_id, []))
+            delta.count_movie(country_id)
+    return delta
+
+def refresh_country_aggregates(db: Session, country_ids):
+    '''
+    국가별 집계를 최신 스냅샷 기준으로 다시 계산 (적재 직후 적재된 국가에 대해 호출, 커밋은 호출자가 함).
+    누적 증분이 아니라 매번 다시 계산하므로 스냅샷에서 빠진 영화는 집계에서도 빠진다.
+    '''
+    country_ids = sorted(set(country_ids))
+    delete_country_aggregates(db, country_ids)
+    _collect_country_aggregates(db, country_ids).apply(db)
+
+def delete_country_aggregates(db: Session, country_ids):
+    country_ids = sorted(set(country_ids))
+    for model in (models.CountryWordFrequency, models.CountryGenreCount, models.CountryStats):
+        for i in range(0, len(country_ids), 500):
+            db.execute(delete(model).where(model.country_id.in_(country_ids[i:i + 500])))
+
+def rebuild_country_aggregates(db: Session):
+    '''
+    모든 국가의 집계를 처음부터 다시 계산 (집계 테이블 도입 이전 DB 백필용)
+    '''
+    refresh_country_aggregates(db, db.scalars(select(models.Country.id)).all())
+    db.commit()
+
+def get_country_aggregates(db: Session, country_name: str, max_words: int = 200, top_genres: int = 8):
+    '''
+    국가별 단어 빈도(상위 max_words), 장르 수(상위 top_genres), 평점 통계를 반환 (모집단은 aggregate_movie_ids).
+    집계 테이블이 아직 채워지지 않은 국가는 같은 모집단으로 즉석에서 계산하고, 영화가 없으면 None.
+    '''
+    country_id = db.scalar(select(models.Country.id).where(models.Country.name == country_name))
+    if country_id is None:
+        return None
+    stats = db.get(models.CountryStats, country_id)
+    if stats is None or not stats.movie_count:
+        return _compute_country_aggregates(db, country_id, max_words, top_genres)
+    word_frequencies = dict(db.execute(
+        select(models.CountryWordFrequency.word, models.CountryWordFrequency.count)
+        .where(models.CountryWordFrequency.country_id == country_id)
+        .order_by(models.CountryWordFrequency.count.desc())
+        .limit(max_words)
+    ).all())
+    genre_counts = dict(db.execute(
+        select(models.Genre.name, models.CountryGenreCount.count)
+        .join(models.Genre, models.Genre.id == models.CountryGenreCount.genre_id)
+        .where(models.CountryGenreCount.country_id == country_id)
+        .order_by(models.CountryGenreCount.count.desc())
+        .limit(top_genres)
+    ).all())
+    return {
+        'word_frequencies': word_frequencies,
+        'genre_counts': genre_counts,
+        'average_score': stats.average_score,
+        'movie_count': stats.movie_count,
+    }
+
+def _compute_country_aggregates(db: Session, country_id: int, max_words: int, top_genres: int):
+    delta = _collect_country_aggregates(db, [country_id])
+    movie_count, score_sum = delta.stats.get(country_id, (0, 0.0))
+    if not movie_count:
+        return None
+    genre_counts = delta.genres.get(country_id, Counter()).most_common(top_genres)
+    genre_names = dict(db.execute(
+        select(models.Genre.id, models.Genre.name).where(models.Genre.id.in_([genre_id for genre_id, _ in genre_counts]))
+    ).all())
+    return {
+        'word_frequencies': dict(delta.words.get(country_id, Counter()).most_common(max_words)),
+        'genre_counts': {genre_names[genre_id]: count for genre_id, count in genre_counts},
+        'average_score': score_sum / movie_count,
+        'movie_count': movie_count,
+    }
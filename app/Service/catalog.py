@@ -0,0 +1,165 @@
+import base64
+import json
+import math
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+from app.models import models
+
+
+MAX_PAGE_SIZE = 200
+# 선택 가능한 영화 필드 (genres/actors 는 요청한 경우에만 별도 쿼리로 조회)
+MOVIE_COLUMNS = {
+    "id": models.Movie.id,
+    "title": models.Movie.title,
+    "release_year": models.Movie.release_year,
+    "score": models.Movie.score,
+    "summary": models.Movie.summary,
+    "image_url": models.Movie.image_url,
+    "country": models.Country.name,
+}
+MOVIE_RELATIONS = {
+    "genres": (models.MovieGenre, models.Genre, models.MovieGenre.genre_id),
+    "actors": (models.MovieActor, models.Actor, models.MovieActor.actor_id),
+}
+DEFAULT_MOVIE_FIELDS = ("id", "title", "release_year", "score", "country")
+# 정렬 키: (정렬 컬럼, 내림차순 여부). id 를 같은 방향의 두 번째 키로 써서 순서를 유일하게 만듦
+MOVIE_SORTS = {
+    "id": (None, False),
+    "title": (models.Movie.title, False),
+    "-score": (models.Movie.score, True),
+}
+# 정렬별 커서 값의 타입 (list_movies 가 만드는 [정렬 값, id] 또는 [id] 와 같은 모양)
+MOVIE_CURSOR_TYPES = {
+    "id": (int,),
+    "title": (str, int),
+    "-score": (float, int),
+}
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, types: tuple) -> list:
+    '''
+    커서를 디코딩하고 값의 개수와 타입이 정렬 키와 맞는지 검증 (다른 정렬의 커서나 조작된 커서는 400)
+    '''
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    if (not isinstance(values, list) or len(values) != len(types)
+            or not all(_is_cursor_value(value, type_) for value, type_ in zip(values, types))):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return values
+
+def _is_cursor_value(value, type_) -> bool:
+    if isinstance(value, bool):
+        return False
+    if type_ is float:
+        return isinstance(value, (int, float)) and math.isfinite(value)
+    return isinstance(value, type_)
+
+def parse_fields(fields: str, allowed, default) -> list:
+    '''
+    "id,title,genres" 형식의 필드 목록을 검증 (id 는 커서 계산에 필요하므로 항상 포함)
+    '''
+    if not fields:
+        return list(default)
+    selected = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = set(selected) - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return (["id"] if "id" not in selected else []) + selected
+
+def _keyset_condition(sort_column, descending: bool, id_column, cursor: list):
+    '''
+    (정렬 값, id) 가 커서 다음인 행 조건. 행 값 비교라 OFFSET 과 달리 인덱스에서 바로 시작 위치를 찾음
+    '''
+    key = id_column if sort_column is None else tuple_(sort_column, id_column)
+    value = cursor[0] if sort_column is None else tuple_(*cursor)
+    return key < value if descending else key > value
+
+def list_movies(db: Session, cursor: str = None, limit: int = 50, sort: str = "id", fields: str = None,
+                country: str = None, genre: str = None) -> dict:
+    '''
+    영화 목록을 커서 기반으로 페이지 조회
+
+    :param sort: id | title | -score (점수가 없는 영화는 -score 정렬에서 제외)
+    :param fields: 쉼표로 구분한 필드 목록 (기본값: DEFAULT_MOVIE_FIELDS)
+    :return: {"items": [...], "next_cursor": 다음 페이지 커서 또는 None}
+    '''
+    if sort not in MOVIE_SORTS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    selected = parse_fields(fields, list(MOVIE_COLUMNS) + list(MOVIE_RELATIONS), DEFAULT_MOVIE_FIELDS)
+    columns = [field for field in selected if field in MOVIE_COLUMNS]
+    sort_column, descending = MOVIE_SORTS[sort]
+
+    query = select(*(MOVIE_COLUMNS[field].label(field) for field in columns))
+    if sort_column is not None:
+        query = query.add_columns(sort_column.label("_sort"))
+    if "country" in columns or country is not None:
+        query = query.outerjoin(models.Country, models.Country.id == models.Movie.country_id)
+    if country is not None:
+        query = query.where(models.Country.name == country)
+    if genre is not None:
+        query = query.where(models.Movie.id.in_(
+            select(models.MovieGenre.movie_id)
+            .join(models.Genre, models.Genre.id == models.MovieGenre.genre_id)
+            .where(models.Genre.name == genre)
+        ))
+    if sort_column is not None and descending:
+        query = query.where(sort_column.is_not(None))
+    if cursor:
+        values = decode_cursor(cursor, MOVIE_CURSOR_TYPES[sort])
+        query = query.where(_keyset_condition(sort_column, descending, models.Movie.id, values))
+    order = [models.Movie.id] if sort_column is None else [sort_column, models.Movie.id]
+    if descending:
+        order = [column.desc() for column in order]
+    rows = db.execute(query.order_by(*order).limit(limit + 1)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [{field: getattr(row, field) for field in columns} for row in rows]
+    for relation in MOVIE_RELATIONS:
+        if relation in selected:
+            names = _relation_names(db, relation, [item["id"] for item in items])
+            for item in items:
+                item[relation] = names.get(item["id"], [])
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor([last.id] if sort_column is None else [last._sort, last.id])
+    return {"items": items, "next_cursor": next_cursor}
+
+def _relation_names(db: Session, relation: str, movie_ids: list) -> dict:
+    '''
+    페이지에 포함된 영화들의 장르/배우 이름을 한 번의 쿼리로 조회
+    '''
+    if not movie_ids:
+        return {}
+    association, model, foreign_key = MOVIE_RELATIONS[relation]
+    rows = db.execute(
+        select(association.movie_id, model.name)
+        .join(model, model.id == foreign_key)
+        .where(association.movie_id.in_(movie_ids))
+        .order_by(association.movie_id, model.name)
+    )
+    names = {}
+    for movie_id, name in rows:
+        names.setdefault(movie_id, []).append(name)
+    return names
+
+def list_names(db: Session, model, cursor: str = None, limit: int = 100) -> dict:
+    '''
+    국가/장르/배우 목록을 이름 순으로 페이지 조회 (이름에 유니크 인덱스가 있어 이름 자체를 커서로 사용)
+    '''
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = select(model.id, model.name)
+    if cursor:
+        query = query.where(model.name > decode_cursor(cursor, (str,))[0])
+    rows = db.execute(query.order_by(model.name).limit(limit + 1)).all()
+    items = [{"id": id_, "name": name} for id_, name in rows[:limit]]
+    next_cursor = encode_cursor([rows[limit - 1].name]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import select
+from app.models import models
+from app.Service.aggregates import delete_country_aggregates
+from app.Service.movie import JSON_PATH, bulk_insert_movies_from_json
+from app.Service.reader import file_sha256, plan_incremental
+from app.Service.search import search_index
+from app.utils.cache import dashboard_cache
+from app.utils.prerender import PRERENDER_OUTPUT_PATH, remove_dashboards
+
+
+logger = logging.getLogger(__name__)
+
+class IngestJob:
+    '''
+    크롤링 JSON 을 DB 에 적재하는 백그라운드 작업
+
+    요청 처리 경로와 분리되어 시작 시(lifespan), 파일 변경 감지, 관리자 엔드포인트로만 실행되며
+    적재가 끝나면 메모리의 국가 이름 인덱스를 갱신한다.
+    follow=True 면 크롤러가 스트리밍으로 쓰고 있는 JSONL 을 따라 읽으며 크롤링과 동시에 적재한다.
+    마지막으로 적재한 파일의 해시를 state_path 에 남겨, 다음 파일이 그 파일 기준의 크롤러 변경 목록을 가지고 있으면
+    바뀐 국가만 적재하고, 시작 시에는 수정 시각과 해시가 마지막 적재와 같으면 적재하지 않는다.
+    크롤링 결과에서 빠진 국가는 서빙에서 내린다 (retire_countries 참고).
+    '''
+    def __init__(self, session_factory, json_path: str = JSON_PATH, follow: bool = False,
+                 prerender_dir: str = PRERENDER_OUTPUT_PATH):
+        self.session_factory = session_factory
+        self.json_path = json_path
+        self.follow = follow
+        self.prerender_dir = prerender_dir
+        self.state_path = os.path.splitext(json_path)[0] + '.ingest.json'
+        self.country_index = {}  # {국가 이름: 국가 id}
+        self.status = {
+            "state": "idle", "started_at": None, "finished_at": None, "count": None, "error": None,
+            "countries": None, "removed": [],
+        }
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last_mtime = None
+
+    def refresh_index(self):
+        '''크롤링 결과에서 빠져 서빙에서 내린 국가를 제외한 국가 이름 인덱스를 다시 읽음'''
+        retired = set(self.load_state().get("removed") or [])
+        db = self.session_factory()
+        try:
+            rows = db.execute(select(models.Country.name, models.Country.id))
+            self.country_index = {name: id_ for name, id_ in rows if name not in retired}
+        finally:
+            db.close()
+
+    def get_country_id(self, country_name: str):
+        return self.country_index.get(country_name)
+
+    def start(self, skip_unchanged: bool = False) -> bool:
+        '''
+        백그라운드 스레드에서 적재 시작. 이미 실행 중이면 False 반환.
+
+        :param skip_unchanged: True면 마지막 적재 이후 파일이 바뀌지 않았을 때 적재와 캐시 무효화를 건너뜀 (시작 시 사용)
+        '''
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self.status = {
+                "state": "running", "started_at": datetime.utcnow().isoformat(),
+                "finished_at": None, "count": None, "error": None, "countries": None, "removed": []
+            }
+            self._thread = threading.Thread(target=self.run, args=(skip_unchanged,), name="ingest", daemon=True)
+            self._thread.start()
+            return True
+
+    def load_state(self) -> dict:
+        '''마지막으로 성공한 적재의 {"sha256", "mtime", "finished_at", "removed"} (없으면 빈 딕셔너리)'''
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, sha256: str, mtime: float, removed: set = frozenset()):
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "sha256": sha256, "mtime": mtime, "finished_at": datetime.utcnow().isoformat(),
+                "removed": sorted(removed),
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def retire_countries(self, db, country_names: set):
+        '''
+        크롤링 결과에서 빠진 국가를 서빙에서 내림: 시각화 집계, 대시보드 캐시, 사전 렌더링 파일을 지우고
+        (국가 인덱스에서는 state 의 removed 로 제외) 대시보드 요청은 404 가 된다.
+        국가가 한 번 크롤링에 실패해도 빠진 것으로 보이므로 영화/랭킹/추이 롤업은 이력으로 남겨 두며,
+        다음 크롤링 결과에 다시 나타나면 적재되면서 다시 서빙된다.
+        '''
+        if not country_names:
+            return
+        country_ids = db.scalars(select(models.Country.id).where(models.Country.name.in_(country_names))).all()
+        delete_country_aggregates(db, country_ids)
+        db.commit()
+        dashboard_cache.invalidate(country_names)
+        remove_dashboards(country_names, self.prerender_dir)
+        logger.info(f"Retired countries removed from the crawl result: {', '.join(sorted(country_names))}")
+
+    def is_unchanged(self) -> bool:
+        '''
+        파일의 수정 시각과 해시가 마지막으로 성공한 적재와 같고 DB 에 적재된 국가가 있으면 True
+        '''
+        state = self.load_state()
+        if not state or not os.path.exists(self.json_path) or os.path.getmtime(self.json_path) != state.get("mtime"):
+            return False
+        if file_sha256(self.json_path) != state.get("sha256"):
+            return False
+        self.refresh_index()
+        return bool(self.country_index)
+
+    def plan(self) -> dict:
+        '''
+        이번에 적재할 국가를 정함 (reader.plan_incremental 참고). 변경되지 않은 국가가 DB 에 없으면
+        (DB 를 새로 만든 경우 등) 전체를 적재한다.
+        '''
+        if self.follow or not os.path.exists(self.json_path):
+            return {"sha256": None, "countries": None, "unchanged": set(), "removed": set(), "crawled_at": None}
+        plan = plan_incremental(self.json_path, self.load_state().get("sha256"))
+        if plan["countries"] is not None:
+            self.refresh_index()
+            if not plan["unchanged"] <= set(self.country_index):
+                plan["countries"] = None
+        return plan
+
+    def run(self, skip_unchanged: bool = False):
+        if os.path.exists(self.json_path):
+            self._last_mtime = os.path.getmtime(self.json_path)
+        db = self.session_factory()
+        try:
+            if skip_unchanged and self.is_unchanged():
+                logger.info(f"{self.json_path} is unchanged since the last ingest. Skipping.")
+                self.status.update(state="skipped", count=0)
+                return
+            plan = self.plan()
+            countries = plan["countries"]
+            self.status.update(
+                countries=sorted(countries) if countries is not None else None, removed=sorted(plan["removed"])
+            )
+            ingested = set()
+            if countries is not None and not countries:
+                # 바뀐 국가 없이 빠진 국가만 있는 결과
+                self.status.update(state="done", count=0)
+            else:
+                result = bulk_insert_movies_from_json(
+                    db=db, json_path=self.json_path, follow=self.follow, countries=countries,
+                    crawled_at=plan["crawled_at"]
+                )
+                ingested = set(result["countries"])
+                self.status.update(state="done", count=result["count"])
+            # 다시 나타난 국가는 서빙을 재개하고, 새로 빠진 국가는 서빙에서 내림
+            retired = set(self.load_state().get("removed") or [])
+            self.retire_countries(db, plan["removed"] - retired - ingested)
+            if self.follow:
+                # 따라 읽는 동안 바뀐 수정 시각 때문에 watch 가 같은 파일을 다시 적재하지 않도록
+                self._last_mtime = os.path.getmtime(self.json_path)
+            self.save_state(
+                plan["sha256"] or file_sha256(self.json_path), self._last_mtime, (retired | plan["removed"]) - ingested
+            )
+        except Exception as e:
+            logger.error(f"Ingest failed: {e}")
+            self.status.update(state="failed", error=getattr(e, "detail", str(e)))
+        finally:
+            db.close()
+            self.status["finished_at"] = datetime.utcnow().isoformat()
+            self.refresh_index()
+            self.rebuild_search_index()
+
+    def rebuild_search_index(self):
+        db = self.session_factory()
+        try:
+            search_index.rebuild(db)
+        except Exception as e:
+            logger.error(f"Search index build failed: {e}")
+        finally:
+            db.close()
+
+    async def watch(self, interval: float = 30.0):
+        '''
+        JSON 파일의 수정 시각을 주기적으로 확인하여 바뀌면 적재를 다시 실행
+        '''
+        while True:
+            await asyncio.sleep(interval)
+            if not os.path.exists(self.json_path):
+                continue
+            mtime = os.path.getmtime(self.json_path)
+            if self._last_mtime is not None and mtime != self._last_mtime:
+                logger.info(f"{self.json_path} changed. Starting ingest.")
+                self.start()
@@ -1,15 +1,32 @@
 import os
 import json
+import time
 import logging
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import IntegrityError
 from app.schemas import movie
 from app.models import models
+from app.Service.aggregates import refresh_country_aggregates
+from app.Service.reader import iter_batches, iter_movie_records, read_crawled_at
+from app.Service.trends import update_snapshot_rollups
+from app.utils.cache import dashboard_cache
+from app.utils.constant import CRAWL_RESULT_PATH
+from app.utils.instrumentation import count_statements
+from app.utils.metrics import REGISTRY, stage_timer
 
 
 logger = logging.getLogger(__name__)
-JSON_PATH = os.path.join('app', 'data', 'crawl', 'raw', 'movies_data_country.json')
+JSON_PATH = CRAWL_RESULT_PATH
+INGEST_ROWS = REGISTRY.counter('ingest_rows_total', 'Movie records loaded by the ingest job')
+INGEST_STATEMENTS = REGISTRY.counter('ingest_statements_total', 'SQL statements executed by the ingest job')
+INGEST_FAILURES = REGISTRY.counter('ingest_failures_total', 'Failed ingest runs')
+INGEST_ROWS_PER_SECOND = REGISTRY.gauge('ingest_rows_per_second', 'Throughput of the last successful ingest')
 
 ############################ MOVIE ############################
 def get_movie(db: Session, movie_id: int):
@@ -21,83 +38,315 @@ def get_movies(db: Session, skip: int = 0, limit: int = 50):
 def get_movies_by_country_name(db: Session, country_name: str):
     country = db.query(models.Country).filter(models.Country.name == country_name).first()
     if not country:
-        bulk_insert_movies_from_json(db=db)
-        country = db.query(models.Country).filter(models.Country.name == country_name).first()
+        raise HTTPException(status_code=404, detail=f"Country {country_name} not found.")
     return country.movies[:5]
 
-def bulk_insert_movies_from_json(db: Session, json_path: str = JSON_PATH):
-    try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        logger.debug(f"Loaded JSON data: {data}")
+def get_top_movies_by_country_name(db: Session, country_name: str, limit: int = 5):
+    '''
+    국가의 최신 스냅샷 기준 상위 N개 영화를 (Movie, rank) 리스트로 반환.
+    LIMIT 은 SQL 에서 적용되고 장르/배우는 selectinload 로 한 번에 가져오므로
+    영화 수와 관계없이 고정된 수(4회)의 쿼리만 실행된다.
+    '''
+    country_id = db.scalar(select(models.Country.id).where(models.Country.name == country_name))
+    if country_id is None:
+        raise HTTPException(status_code=404, detail=f"Country {country_name} not found.")
+    latest_snapshot = (
+        select(func.max(models.Ranking.crawled_at))
+        .where(models.Ranking.country_id == country_id)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        select(models.Movie, models.Ranking.rank)
+        .join(models.Ranking, models.Ranking.movie_id == models.Movie.id)
+        .where(models.Ranking.country_id == country_id, models.Ranking.crawled_at == latest_snapshot)
+        .order_by(models.Ranking.rank)
+        .limit(limit)
+        .options(selectinload(models.Movie.genres), selectinload(models.Movie.actors))
+    ).all()
+    if not rows:
+        # 랭킹 스냅샷이 없는 경우 (이전 데이터) 적재 순서대로 반환
+        movies = db.scalars(
+            select(models.Movie)
+            .where(models.Movie.country_id == country_id)
+            .order_by(models.Movie.id)
+            .limit(limit)
+            .options(selectinload(models.Movie.genres), selectinload(models.Movie.actors))
+        ).all()
+        rows = [(movie, None) for movie in movies]
+    return [tuple(row) for row in rows]
+
+BULK_BATCH_SIZE = 500
+INGEST_BATCH_SIZE = 2000
+MOVIE_UPDATE_COLUMNS = ('score', 'summary', 'image_url')
+
+def _chunks(items: list, size: int = BULK_BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def _parse_score(score) -> float:
+    # score null 처리
+    if not score or score == 'null':
+        return 0.0
+    return float(score)
+
+def _insert_ignore(db: Session, model, rows: list):
+    '''
+    중복 키는 무시하고 여러 행을 한 번에 INSERT (MySQL: INSERT IGNORE, SQLite: ON CONFLICT DO NOTHING)
+    '''
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql_insert(model).prefix_with('IGNORE')
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(model).on_conflict_do_nothing()
+    else:
+        stmt = insert(model)
+    for chunk in _chunks(rows):
+        db.execute(stmt, chunk)
+
+def resolve_name_ids(db: Session, model, names: set) -> dict:
+    '''
+    이름 집합을 {name: id} 로 변환. 없는 이름은 일괄 INSERT 후 IN (...) 조회로 id를 가져온다.
+    '''
+    names = sorted(n for n in names if n)
+    if not names:
+        return {}
+    _insert_ignore(db, model, [{'name': name} for name in names])
+    ids = {}
+    for chunk in _chunks(names):
+        rows = db.execute(select(model.name, model.id).where(model.name.in_(chunk)))
+        ids.update({name: id_ for name, id_ in rows})
+    return ids
+
+def _upsert_movies(db: Session, rows: list) -> dict:
+    '''
+    자연 키(title, release_year, country_id) 기준으로 영화를 UPSERT 하고 {자연 키: id} 를 반환
+    '''
+    if not rows:
+        return {}
+    dialect = db.get_bind().dialect.name
+    if dialect == 'mysql':
+        stmt = mysql_insert(models.Movie)
+        stmt = stmt.on_duplicate_key_update({
+            column: stmt.inserted[column] for column in MOVIE_UPDATE_COLUMNS
+        })
+    elif dialect == 'sqlite':
+        stmt = sqlite_insert(models.Movie)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['title', 'release_year', 'country_id'],
+            set_={column: stmt.excluded[column] for column in MOVIE_UPDATE_COLUMNS}
+        )
+    else:
+        stmt = insert(models.Movie)
+    for chunk in _chunks(rows):
+        db.execute(stmt, chunk)
+
+    keys = [(row['title'], row['release_year'], row['country_id']) for row in rows]
+    natural_key = tuple_(models.Movie.title, models.Movie.release_year, models.Movie.country_id)
+    ids = {}
+    for chunk in _chunks(keys):
+        result = db.execute(select(
+            models.Movie.title, models.Movie.release_year, models.Movie.country_id, models.Movie.id
+        ).where(natural_key.in_(chunk)))
+        ids.update({(title, year, country_id): id_ for title, year, country_id, id_ in result})
+    return ids
+
+def _replace_associations(db: Session, model, column: str, targets: dict):
+    '''
+    영화별 연결 행({movie_id: {대상 id}})을 교체. 해당 영화의 기존 행을 먼저 지우고
+    새 집합을 INSERT 하므로, 크롤링 결과에서 빠진 장르/배우는 남지 않는다 (호출자의 트랜잭션 안에서 실행).
+    '''
+    for chunk in _chunks(sorted(targets)):
+        db.execute(delete(model).where(model.movie_id.in_(chunk)))
+    _insert_ignore(db, model, [
+        {'movie_id': movie_id, column: target_id}
+        for movie_id, target_ids in targets.items() for target_id in sorted(target_ids)
+    ])
+
+def get_latest_snapshot_at(db: Session, country_id: int):
+    '''
+    국가의 가장 최근 랭킹 스냅샷 시각 (ix_rankings_country_crawled_at 인덱스로 조회)
+    '''
+    return db.scalar(
+        select(func.max(models.Ranking.crawled_at)).where(models.Ranking.country_id == country_id)
+    )
+
+async def get_country_by_name_async(db: AsyncSession, country_name: str):
+    return await db.scalar(select(models.Country).where(models.Country.name == country_name))
+
+async def get_latest_snapshot_at_async(db: AsyncSession, country_id: int):
+    return await db.scalar(
+        select(func.max(models.Ranking.crawled_at)).where(models.Ranking.country_id == country_id)
+    )
 
-        movies = data.get('movies', [])
-        if not movies:
+def get_latest_rankings(db: Session, country_id: int):
+    '''
+    국가의 최신 스냅샷 랭킹 목록 (rank 오름차순)
+    '''
+    snapshot_at = get_latest_snapshot_at(db, country_id)
+    if snapshot_at is None:
+        return []
+    return db.scalars(
+        select(models.Ranking)
+        .where(models.Ranking.country_id == country_id, models.Ranking.crawled_at == snapshot_at)
+        .order_by(models.Ranking.rank)
+    ).all()
+
+def finalize_ranking_snapshots(db: Session, country_ids: set, crawled_at: datetime) -> set:
+    '''
+    배치 단위로 저장한 이번 스냅샷이 국가별 직전 스냅샷과 (rank, movie_id) 구성이 같으면 삭제하여
+    같은 데이터를 반복 적재해도 랭킹 테이블이 커지지 않게 한다.
+
+    :return: 이번 스냅샷이 새로 저장된 국가 id 집합
+    '''
+    kept = set()
+    for country_id in country_ids:
+        snapshots = {}
+        previous_at = db.scalar(
+            select(func.max(models.Ranking.crawled_at))
+            .where(models.Ranking.country_id == country_id, models.Ranking.crawled_at < crawled_at)
+        )
+        for snapshot_at in (previous_at, crawled_at):
+            snapshots[snapshot_at] = set(db.execute(
+                select(models.Ranking.movie_id, models.Ranking.rank)
+                .where(models.Ranking.country_id == country_id, models.Ranking.crawled_at == snapshot_at)
+            ).all()) if snapshot_at is not None else None
+        if not snapshots[crawled_at]:
+            continue
+        if snapshots[previous_at] == snapshots[crawled_at]:
+            db.execute(delete(models.Ranking).where(
+                models.Ranking.country_id == country_id, models.Ranking.crawled_at == crawled_at
+            ))
+        else:
+            kept.add(country_id)
+    return kept
+
+def _delete_snapshot(db: Session, crawled_at: datetime):
+    '''
+    같은 시각의 스냅샷(랭킹과 추이 롤업)을 삭제. 같은 크롤링을 다시 적재할 때 이전 적재 결과를 교체하기 위함.
+    '''
+    for model in (models.SnapshotGenreCount, models.SnapshotScoreStats, models.Ranking):
+        db.execute(delete(model).where(model.crawled_at == crawled_at))
+
+def bulk_insert_movies(db: Session, movies: list, crawled_at: datetime = None) -> int:
+    '''
+    영화 레코드 리스트를 집합 단위로 적재. 국가/장르/배우 이름을 먼저 모아 일괄 처리하고,
+    영화(자연 키 UPSERT)와 movie_genre/movie_actor 연결 행(기존 행은 교체), 랭킹 스냅샷을 하나의 트랜잭션에서 bulk INSERT 한다.
+    같은 파일을 여러 번 적재해도 결과가 달라지지 않는다.
+    큰 파일은 배치로 나누어 여러 번 호출한 뒤 finalize_ranking_snapshots 로 스냅샷을 마무리한다.
+    '''
+    crawled_at = crawled_at or datetime.utcnow()
+    country_names, genre_names, actor_names = set(), set(), set()
+    for movie_data in movies:
+        movie_info = movie_data.get("movie", {})
+        if not movie_info:
+            logger.error("Movie data is incomplete or missing")
+            raise HTTPException(status_code=400, detail="Movie data is incomplete or missing")
+        country_names.add(movie_data.get("country"))
+        genre_names.update(movie_info.get("genres", []))
+        actor_names.update(movie_info.get("actors", []))
+
+    country_ids = resolve_name_ids(db, models.Country, country_names)
+    genre_ids = resolve_name_ids(db, models.Genre, genre_names)
+    actor_ids = resolve_name_ids(db, models.Actor, actor_names)
+
+    movie_rows = {}
+    for movie_data in movies:
+        movie_info = movie_data["movie"]
+        row = {
+            'title': movie_info.get("title"),
+            'release_year': movie_info.get("release_year") or '',
+            'score': _parse_score(movie_info.get('score', 0.0)),
+            'summary': movie_info.get("summary"),
+            'image_url': movie_info.get("image_url"),
+            'country_id': country_ids.get(movie_data.get("country")),
+        }
+        movie_rows[(row['title'], row['release_year'], row['country_id'])] = row
+    movie_ids = _upsert_movies(db, list(movie_rows.values()))
+
+    # 영화별 장르/배우는 레코드의 값으로 교체 (같은 영화가 여러 번 나오면 마지막 레코드 기준)
+    new_genres, new_actors, ranking_rows = {}, {}, []
+    for movie_data in movies:
+        movie_info = movie_data["movie"]
+        country_id = country_ids.get(movie_data.get("country"))
+        movie_id = movie_ids[(movie_info.get("title"), movie_info.get("release_year") or '', country_id)]
+        new_genres[movie_id] = {genre_ids[name] for name in movie_info.get("genres", [])}
+        new_actors[movie_id] = {actor_ids[name] for name in movie_info.get("actors", [])}
+        if movie_data.get("rank") is not None:
+            ranking_rows.append({
+                'country_id': country_id, 'movie_id': movie_id, 'rank': int(movie_data["rank"]), 'crawled_at': crawled_at
+            })
+    _replace_associations(db, models.MovieGenre, 'genre_id', new_genres)
+    _replace_associations(db, models.MovieActor, 'actor_id', new_actors)
+    _insert_ignore(db, models.Ranking, ranking_rows)
+    return len(movie_ids)
+
+def bulk_insert_movies_from_json(db: Session, json_path: str = JSON_PATH, batch_size: int = INGEST_BATCH_SIZE,
+                                 follow: bool = False, countries: set = None, crawled_at: datetime = None):
+    '''
+    크롤링 결과 파일({"movies": [...]} JSON 또는 JSONL)을 스트리밍으로 읽어 batch_size 단위로 적재.
+    파일 크기와 관계없이 메모리 사용량이 일정하며, 전체 적재는 하나의 트랜잭션으로 처리된다.
+    follow=True 면 크롤러가 쓰고 있는 JSONL 을 따라 읽어 크롤링이 끝나기 전에 적재를 시작한다.
+    countries 를 주면 해당 국가의 레코드만 적재한다 (크롤러 변경 목록을 이용한 증분 적재).
+    스냅샷 시각은 crawled_at, 크롤러 변경 목록의 crawled_at, 현재 시각 순으로 정한다
+    (변경 목록의 시각을 쓰면 Parquet 내보내기와 같은 스냅샷이 되며, 같은 크롤링을 다시 적재하면 해당 스냅샷을 교체).
+    적재 행 수/처리량/실행된 SQL 문 수는 메트릭과 단계 로그로 남긴다.
+    '''
+    start = time.perf_counter()
+    with stage_timer('ingest', path=json_path) as record, count_statements() as statements:
+        try:
+            if crawled_at is None and not follow and os.path.exists(json_path):
+                crawled_at = read_crawled_at(json_path)
+            result = _load_movies_from_json(db, json_path, batch_size, follow, countries, crawled_at)
+        except HTTPException:
+            INGEST_FAILURES.inc()
+            raise
+        finally:
+            record['statements'] = statements[0]
+            INGEST_STATEMENTS.inc(statements[0])
+        elapsed = time.perf_counter() - start
+        record.update(rows=result["count"], rows_per_second=round(result["count"] / elapsed, 1))
+        INGEST_ROWS.inc(result["count"])
+        INGEST_ROWS_PER_SECOND.set(result["count"] / elapsed)
+    return result
+
+def _load_movies_from_json(db: Session, json_path: str, batch_size: int, follow: bool = False, countries: set = None,
+                           crawled_at: datetime = None):
+    try:
+        if crawled_at is None:
+            crawled_at = datetime.utcnow()
+        else:
+            _delete_snapshot(db, crawled_at)
+        count = 0
+        country_names = set()
+        records = iter_movie_records(json_path, follow=follow)
+        if countries is not None:
+            records = (record for record in records if record.get("country") in countries)
+        for batch in iter_batches(records, batch_size):
+            count += bulk_insert_movies(db, batch, crawled_at=crawled_at)
+            country_names.update(movie_data.get("country") for movie_data in batch)
+            db.flush()
+            db.expunge_all()  # 배치마다 identity map 을 비워 메모리 사용량 유지
+        if not count:
             logger.error('No movie data provided')
             raise HTTPException(status_code=400, detail="No movie data provided in JSON file")
+        logger.debug(f"Loaded {count} movies from {json_path}")
 
-        new_movies = []
-
-        for movie_data in movies:
-            movie_info = movie_data.get("movie", {})
-            if not movie_info:
-                logger.error("Movie data is incomplete or missing")
-                raise HTTPException(status_code=400, detail="Movie data is incomplete or missing")
-
-            # Create or fetch country
-            country_name = movie_data.get("country")
-            country = db.query(models.Country).filter(models.Country.name == country_name).first()
-
-            # If country doesn't exist, add it to the DB
-            if not country:
-                country = models.Country(name=country_name)
-                db.add(country)
-                db.commit()  # Commit immediately to persist country
-                db.refresh(country)  # Ensure the country is fully committed
-
-            # Create or fetch genres
-            genres = []
-            for genre_name in movie_info.get("genres", []):
-                genre = db.query(models.Genre).filter(models.Genre.name == genre_name).first()
-                if not genre:
-                    genre = models.Genre(name=genre_name)
-                    db.add(genre)
-                    db.commit()  # Commit immediately to persist country
-                    db.refresh(genre)  # Ensure the country is fully committed
-
-                genres.append(genre)
-
-            # Create or fetch actors
-            actors = []
-            for actor_name in movie_info.get("actors", []):
-                actor = db.query(models.Actor).filter(models.Actor.name == actor_name).first()
-                if not actor:
-                    actor = models.Actor(name=actor_name)
-                    db.add(actor)
-                    db.commit()  # Commit immediately to persist country
-                    db.refresh(actor)  # Ensure the country is fully committed
-
-                actors.append(actor)
-            # score null 처리
-            score = movie_info.get('score', 0.0)
-            if not score or score == 'null':
-                score = 0
-            # Create movie
-            db_movie = models.Movie(
-                title=movie_info.get("title"),
-                release_year=movie_info.get("release_year"),
-                score=float(score),
-                summary=movie_info.get("summary"),
-                image_url=movie_info.get("image_url"),
-                country=country,
-                genres=genres,
-                actors=actors
+        country_ids = resolve_name_ids(db, models.Country, country_names)
+        new_snapshots = finalize_ranking_snapshots(db, set(country_ids.values()), crawled_at)
+        # 새 스냅샷에 대해서만 추이 롤업 계산 (메모리의 crawled_at 대신 DB 에 저장된 시각 기준)
+        if new_snapshots:
+            stored_at = db.scalar(
+                select(func.max(models.Ranking.crawled_at)).where(models.Ranking.country_id.in_(new_snapshots))
             )
-            db.add(db_movie)
-            new_movies.append(db_movie)
-
+            update_snapshot_rollups(db, new_snapshots, stored_at)
+        # 시각화 집계는 적재된 국가의 최신 스냅샷 기준으로 다시 계산 (영화 정보가 갱신됐을 수 있으므로 모든 국가)
+        refresh_country_aggregates(db, country_ids.values())
         db.commit()  # Commit all changes at once after all movies are added
-        return {"message": "Movies successfully inserted", "count": len(new_movies)}
+        # 새 데이터가 적재된 국가의 대시보드 캐시 무효화
+        dashboard_cache.invalidate(country_names)
+        return {"message": "Movies successfully upserted", "count": count, "countries": sorted(filter(None, country_names))}
 
     except FileNotFoundError:
         logger.error("JSON file not found.")
@@ -105,6 +354,9 @@ def bulk_insert_movies_from_json(db: Session, json_path: str = JSON_PATH):
     except json.JSONDecodeError:
         logger.error("Error decoding JSON file.")
         raise HTTPException(status_code=400, detail="Invalid JSON format")
+    except HTTPException:
+        db.rollback()
+        raise
     except IntegrityError as e:
         logger.error(f"IntegrityError: {e.orig}")
         db.rollback()  # Rollback on integrity error
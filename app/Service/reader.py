@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+from app.utils.constant import CHANGE_MANIFEST_SUFFIX, STREAM_DONE_SUFFIX
+
+
+MOVIES_ARRAY_PATTERN = re.compile(r'"movies"\s*:\s*\[')
+READ_CHUNK_SIZE = 1 << 16
+FOLLOW_POLL_INTERVAL = 0.5
+
+def iter_movie_records(path: str, chunk_size: int = READ_CHUNK_SIZE, follow: bool = False):
+    '''
+    크롤링 결과 파일에서 영화 레코드를 하나씩 읽어오는 제너레이터
+
+    .jsonl 파일은 한 줄에 레코드 하나, 그 외는 {"movies": [...]} 형식으로 보고
+    전체를 메모리에 올리지 않고 배열 원소 단위로 파싱한다.
+    follow=True 면 크롤링 중인 .jsonl 파일을 tail 하며 완료 표시 파일이 생길 때까지 읽는다.
+    '''
+    if path.endswith('.jsonl'):
+        yield from (_follow_jsonl(path) if follow else _iter_jsonl(path))
+    else:
+        yield from _iter_movies_array(path, chunk_size)
+
+def iter_batches(records, batch_size: int):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def file_sha256(path: str, chunk_size: int = READ_CHUNK_SIZE) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def read_change_manifest(path: str, sha256: str = None):
+    '''
+    크롤러가 결과 파일 옆에 남긴 변경 목록({결과 파일}.hashes.json)을 읽음.
+    없거나 기록된 source_sha256 이 지금 결과 파일과 다르면(다른 경로로 교체된 파일) None.
+    '''
+    manifest_path = os.path.splitext(path)[0] + CHANGE_MANIFEST_SUFFIX
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('source_sha256') != (sha256 or file_sha256(path)):
+        return None
+    return manifest
+
+def read_crawled_at(path: str, sha256: str = None):
+    '''
+    변경 목록에 기록된 크롤링 스냅샷 시각 (UTC). 변경 목록이 없거나 다른 파일의 것이면 None.
+    '''
+    manifest = read_change_manifest(path, sha256)
+    if manifest is None or not manifest.get('crawled_at'):
+        return None
+    return datetime.fromisoformat(manifest['crawled_at'])
+
+def plan_incremental(path: str, last_sha256: str = None) -> dict:
+    '''
+    마지막으로 처리한 결과 파일의 해시와 변경 목록을 비교해 이번에 다시 처리할 국가를 정함.
+    마지막으로 처리한 파일이 변경 목록의 previous_sha256 과 같을 때만 바뀐 국가로 좁힐 수 있다.
+
+    :return: {"sha256": 현재 파일 해시, "countries": 다시 처리할 국가 집합 (None이면 전체),
+              "unchanged": 다시 처리하지 않는 국가 집합, "removed": 결과에서 빠진 국가 집합,
+              "crawled_at": 변경 목록의 스냅샷 시각 (없으면 None)}
+    '''
+    sha256 = file_sha256(path)
+    manifest = read_change_manifest(path, sha256)
+    plan = {"sha256": sha256, "countries": None, "unchanged": set(), "removed": set(), "crawled_at": None}
+    if manifest is None:
+        return plan
+    if manifest.get('crawled_at'):
+        plan["crawled_at"] = datetime.fromisoformat(manifest['crawled_at'])
+    plan["removed"] = set(manifest.get('removed_countries') or [])
+    if last_sha256 and manifest.get('previous_sha256') == last_sha256:
+        plan["countries"] = set(manifest.get('changed_countries') or [])
+        plan["unchanged"] = set(manifest.get('hashes') or {}) - plan["countries"]
+    return plan
+
+def _iter_jsonl(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def _follow_jsonl(path: str, poll_interval: float = FOLLOW_POLL_INTERVAL):
+    '''
+    크롤러가 아직 쓰고 있는 JSONL 파일을 따라 읽는 제너레이터
+
+    줄바꿈으로 끝나지 않은 마지막 줄은 쓰는 중일 수 있으므로 다음 읽기까지 보류하고,
+    {path}.done 이 생긴 뒤 남은 줄을 모두 읽으면 종료한다.
+    '''
+    done_path = path + STREAM_DONE_SUFFIX
+    while not os.path.exists(path):
+        if os.path.exists(done_path):
+            return
+        time.sleep(poll_interval)
+    with open(path, 'r', encoding='utf-8') as f:
+        pending = ''
+        while True:
+            # 완료 표시를 먼저 확인해야 확인 직후 추가된 줄을 놓치지 않음
+            finished = os.path.exists(done_path)
+            chunk = f.read(READ_CHUNK_SIZE)
+            if chunk:
+                lines = (pending + chunk).split('\n')
+                pending = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        yield json.loads(line)
+                continue
+            if finished:
+                if pending.strip():
+                    yield json.loads(pending)
+                return
+            time.sleep(poll_interval)
+
+def _iter_movies_array(path: str, chunk_size: int):
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        eof = False
+
+        def read_more():
+            nonlocal buffer, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buffer += chunk
+
+        # "movies": [ 위치까지 이동
+        while True:
+            match = MOVIES_ARRAY_PATTERN.search(buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            if eof:
+                return
+            # 키가 청크 경계에 걸칠 수 있으므로 끝부분은 남겨 둠
+            buffer = buffer[-32:]
+            read_more()
+
+        position = 0
+        while True:
+            # 공백과 구분자(,) 건너뛰기
+            while True:
+                while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                    position += 1
+                if position < len(buffer) or eof:
+                    break
+                buffer, position = '', 0
+                read_more()
+            if position >= len(buffer) or buffer[position] == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # 레코드가 청크 경계에서 잘린 경우 더 읽고 재시도, 파일 끝이면 실제 형식 오류
+                if eof:
+                    raise
+                buffer, position = buffer[position:], 0
+                read_more()
+                continue
+            yield record
+            position = end
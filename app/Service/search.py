@@ -0,0 +1,212 @@
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import models
+
+
+logger = logging.getLogger(__name__)
+TOKEN_PATTERN = re.compile(r"\w+")
+# 필드별 가중치 (제목 > 배우 > 요약)
+FIELD_BOOSTS = {"title": 3.0, "actors": 2.0, "summary": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_RESULTS = 100
+
+def tokenize(text: str) -> list:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class SearchIndex:
+    '''
+    제목/요약/배우 이름에 대한 메모리 역색인 + 국가/장르/연도 패싯
+
+    적재가 끝날 때마다 DB 에서 새 인덱스를 만들어 교체하므로 조회 중에는 잠금이 필요 없다.
+    문서는 0..n-1 위치로 관리하고, 점수/필터/패싯 계산은 모두 numpy 배열 연산으로 처리한다.
+    '''
+    def __init__(self):
+        self._data = None
+        self._build_lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._data is not None
+
+    def rebuild(self, db: Session):
+        '''
+        DB 의 모든 영화로 인덱스를 새로 만들어 교체 (적재 작업 스레드에서 실행)
+        '''
+        with self._build_lock:
+            start = time.perf_counter()
+            self._data = build_index(load_documents(db))
+            logger.info(f"Search index built: {len(self._data['ids'])} movies, "
+                        f"{len(self._data['postings'])} terms, {time.perf_counter() - start:.2f}s")
+
+    def build(self, documents: list):
+        with self._build_lock:
+            self._data = build_index(documents)
+
+    def search(self, q: str = "", country: str = None, genre: str = None, year_from: int = None,
+               year_to: int = None, limit: int = 20, offset: int = 0) -> dict:
+        '''
+        검색어의 모든 단어를 포함하는 영화를 BM25 점수 순으로 반환 (검색어가 없으면 평점 순)
+
+        :return: {"total", "items", "facets": {"country", "genre", "year"}}
+        '''
+        data = self._data
+        if data is None:
+            return {"total": 0, "items": [], "facets": {"country": {}, "genre": {}, "year": {}}, "ready": False}
+        n_docs = len(data["ids"])
+        terms = list(dict.fromkeys(tokenize(q)))
+
+        if terms:
+            scores = np.zeros(n_docs, dtype=np.float32)
+            matched = np.zeros(n_docs, dtype=np.int16)
+            for term in terms:
+                posting = data["postings"].get(term)
+                if posting is None:
+                    scores = None
+                    break
+                docs, weights = posting
+                scores[docs] += weights * np.float32(np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5)))
+                matched[docs] += 1
+            mask = matched == len(terms) if scores is not None else np.zeros(n_docs, dtype=bool)
+        else:
+            scores = data["scores"]
+            mask = np.ones(n_docs, dtype=bool)
+
+        if country is not None:
+            mask &= data["countries"] == data["country_codes"].get(country, -1)
+        if genre is not None:
+            code = data["genre_codes"].get(genre)
+            mask &= data["genres"][:, code] if code is not None else False
+        if year_from is not None:
+            mask &= data["years"] >= year_from
+        if year_to is not None:
+            mask &= (data["years"] <= year_to) & (data["years"] >= 0)
+
+        hits = np.flatnonzero(mask)
+        limit = max(0, min(limit, MAX_RESULTS))
+        end = min(offset + limit, len(hits))
+        if offset < end:
+            hit_scores = scores[hits]
+            # 필요한 상위 end 개만 부분 정렬
+            top = np.argpartition(-hit_scores, end - 1)[:end] if end < len(hits) else np.arange(len(hits))
+            top = top[np.lexsort((data["ids"][hits[top]], -hit_scores[top]))][offset:end]
+            page = hits[top]
+        else:
+            page = np.empty(0, dtype=np.int64)
+
+        items = [{
+            "id": int(data["ids"][doc]),
+            "title": data["titles"][doc],
+            "release_year": data["release_years"][doc],
+            "score": round(float(data["scores"][doc]), 2),
+            "country": data["country_names"][data["countries"][doc]],
+            "relevance": round(float(scores[doc]), 4),
+        } for doc in page]
+        return {"total": len(hits), "items": items, "facets": _facets(data, hits)}
+
+
+def _facets(data: dict, hits: np.ndarray) -> dict:
+    country_counts = np.bincount(data["countries"][hits], minlength=len(data["country_names"]))
+    genre_counts = data["genres"][hits].sum(axis=0, dtype=np.int64)
+    years = data["years"][hits]
+    year_values, year_counts = np.unique(years[years >= 0], return_counts=True)
+    return {
+        "country": {data["country_names"][i]: int(country_counts[i]) for i in np.flatnonzero(country_counts)
+                    if data["country_names"][i] is not None},
+        "genre": {data["genre_names"][i]: int(genre_counts[i]) for i in np.flatnonzero(genre_counts)},
+        "year": {str(year): int(count) for year, count in zip(year_values, year_counts)},
+    }
+
+
+def load_documents(db: Session) -> list:
+    '''
+    인덱스에 필요한 컬럼만 3번의 쿼리로 조회
+    '''
+    genres, actors = defaultdict(list), defaultdict(list)
+    for movie_id, name in db.execute(
+        select(models.MovieGenre.movie_id, models.Genre.name)
+        .join(models.Genre, models.Genre.id == models.MovieGenre.genre_id)
+    ):
+        genres[movie_id].append(name)
+    for movie_id, name in db.execute(
+        select(models.MovieActor.movie_id, models.Actor.name)
+        .join(models.Actor, models.Actor.id == models.MovieActor.actor_id)
+    ):
+        actors[movie_id].append(name)
+    rows = db.execute(
+        select(models.Movie.id, models.Movie.title, models.Movie.summary, models.Movie.release_year,
+               models.Movie.score, models.Country.name)
+        .outerjoin(models.Country, models.Country.id == models.Movie.country_id)
+        .order_by(models.Movie.id)
+    )
+    return [{
+        "id": id_, "title": title, "summary": summary, "release_year": release_year, "score": score,
+        "country": country, "genres": genres.get(id_, []), "actors": actors.get(id_, []),
+    } for id_, title, summary, release_year, score, country in rows]
+
+
+def _parse_year(value) -> int:
+    match = re.match(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else -1
+
+
+def build_index(documents: list) -> dict:
+    '''
+    문서 목록으로 역색인(단어 -> (문서 위치 배열, BM25 단어 가중치 배열))과 패싯용 배열을 생성
+    '''
+    country_codes, genre_codes = {}, {}
+    term_docs, term_freqs = defaultdict(list), defaultdict(list)
+    lengths = np.zeros(len(documents), dtype=np.float32)
+    genre_rows = []
+    for doc, document in enumerate(documents):
+        frequencies = defaultdict(float)
+        length = 0
+        for field, boost in FIELD_BOOSTS.items():
+            value = document.get(field)
+            tokens = tokenize(" ".join(value) if isinstance(value, list) else value)
+            length += len(tokens)
+            for token in tokens:
+                frequencies[token] += boost
+        lengths[doc] = length
+        for term, frequency in frequencies.items():
+            term_docs[term].append(doc)
+            term_freqs[term].append(frequency)
+        country_codes.setdefault(document.get("country"), len(country_codes))
+        genre_rows.append([genre_codes.setdefault(name, len(genre_codes)) for name in document.get("genres", [])])
+
+    average_length = float(lengths.mean()) if len(documents) else 1.0
+    # 문서 길이 정규화 항은 문서마다 한 번만 계산
+    norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(average_length, 1.0))
+    postings = {}
+    for term, docs in term_docs.items():
+        docs = np.asarray(docs, dtype=np.int64)
+        frequencies = np.asarray(term_freqs[term], dtype=np.float32)
+        postings[term] = (docs, frequencies * (BM25_K1 + 1) / (frequencies + norms[docs]))
+
+    genre_matrix = np.zeros((len(documents), max(len(genre_codes), 1)), dtype=bool)
+    for doc, codes in enumerate(genre_rows):
+        genre_matrix[doc, codes] = True
+    return {
+        "ids": np.array([document["id"] for document in documents], dtype=np.int64),
+        "titles": [document.get("title") for document in documents],
+        "release_years": [document.get("release_year") for document in documents],
+        "scores": np.array([document.get("score") or 0.0 for document in documents], dtype=np.float32),
+        "years": np.array([_parse_year(document.get("release_year")) for document in documents], dtype=np.int32),
+        "countries": np.array([country_codes[document.get("country")] for document in documents], dtype=np.int32),
+        "country_codes": country_codes,
+        "country_names": list(country_codes),
+        "genres": genre_matrix,
+        "genre_codes": genre_codes,
+        "genre_names": list(genre_codes),
+        "postings": postings,
+    }
+
+
+search_index = SearchIndex()
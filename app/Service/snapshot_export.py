@@ -0,0 +1,226 @@
+'''
+크롤링 스냅샷을 분석용 컬럼 포맷(Parquet)으로 내보내고 조회하는 모듈
+
+파일 구조: {output_dir}/crawl_date=YYYY-MM-DD/country=.../{스냅샷 시각(마이크로초까지)}-*.parquet
+사용법: python -m app.Service.snapshot_export [--json app/data/crawl/raw/movies_data_country.json] [--output-dir ...]
+       (--json 을 생략하면 DB 의 모든 랭킹 스냅샷을 내보냄)
+스냅샷 시각은 두 경로 모두 크롤러 변경 목록의 crawled_at (DB 적재 시 랭킹에 저장되는 값)이며,
+같은 스냅샷을 다시 내보내면 어느 경로로 내보냈든 이전 파일을 지우고 새로 쓴다.
+'''
+import argparse
+import glob
+import os
+from datetime import datetime
+from typing import Final
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import models
+from app.Service.reader import iter_batches, iter_movie_records, read_crawled_at
+
+
+SNAPSHOT_EXPORT_PATH: Final = 'app/data/snapshots/'
+SNAPSHOT_SCHEMA: Final = pa.schema([
+    # 같은 초에 찍힌 스냅샷이 섞이지 않도록 DB/파일의 시각을 자르지 않고 그대로 저장
+    ('crawled_at', pa.timestamp('us')),
+    ('crawl_date', pa.string()),
+    ('country', pa.dictionary(pa.int16(), pa.string())),
+    ('rank', pa.int32()),
+    ('title', pa.string()),
+    ('release_year', pa.string()),
+    ('score', pa.float32()),
+    # 장르/배우는 값 종류가 적고 반복이 많아 사전(dictionary) 인코딩
+    ('genres', pa.list_(pa.dictionary(pa.int32(), pa.string()))),
+    ('actors', pa.list_(pa.dictionary(pa.int32(), pa.string()))),
+])
+PARTITIONING: Final = ds.partitioning(
+    pa.schema([('crawl_date', pa.string()), ('country', pa.string())]), flavor='hive'
+)
+
+def _score(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _basename(crawled_at: datetime, source) -> str:
+    return f"{crawled_at:%Y%m%dT%H%M%S%f}-{source}"
+
+def _remove_snapshot(output_dir: str, crawled_at: datetime):
+    for path in glob.glob(os.path.join(output_dir, '*', '*', f"{crawled_at:%Y%m%dT%H%M%S%f}-*.parquet")):
+        os.remove(path)
+
+def _write(rows: list, output_dir: str, basename: str):
+    table = pa.Table.from_pylist(rows, schema=SNAPSHOT_SCHEMA)
+    ds.write_dataset(
+        table,
+        output_dir,
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template=f'{basename}-{{i}}.parquet',
+        # 같은 스냅샷을 다시 내보내면 해당 파티션 파일만 덮어씀
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+def export_crawl_file(json_path: str, crawled_at: datetime = None, output_dir: str = SNAPSHOT_EXPORT_PATH,
+                      batch_size: int = 50000) -> int:
+    '''
+    크롤링 결과 파일 하나를 스냅샷으로 내보냄
+
+    :param crawled_at: 스냅샷 시각 (기본값: 크롤러 변경 목록의 crawled_at)
+    :return: 내보낸 행 수
+    '''
+    crawled_at = crawled_at or read_crawled_at(json_path)
+    if crawled_at is None:
+        raise ValueError(f"{json_path} has no change manifest with crawled_at; pass the snapshot time explicitly")
+    _remove_snapshot(output_dir, crawled_at)
+    count = 0
+    for index, batch in enumerate(iter_batches(iter_movie_records(json_path), batch_size)):
+        rows = [{
+            'crawled_at': crawled_at,
+            'crawl_date': crawled_at.strftime('%Y-%m-%d'),
+            'country': record.get('country'),
+            'rank': record.get('rank'),
+            'title': record['movie'].get('title'),
+            'release_year': record['movie'].get('release_year'),
+            'score': _score(record['movie'].get('score')),
+            'genres': record['movie'].get('genres', []),
+            'actors': record['movie'].get('actors', []),
+        } for record in batch]
+        _write(rows, output_dir, _basename(crawled_at, index))
+        count += len(rows)
+    return count
+
+def export_snapshots(db: Session, output_dir: str = SNAPSHOT_EXPORT_PATH, since: datetime = None,
+                     batch_size: int = 5000) -> int:
+    '''
+    DB 에 저장된 랭킹 스냅샷(since 이후)을 스냅샷 단위로 내보냄.
+    스냅샷 하나의 랭킹도 yield_per 로 batch_size 행씩 읽어 바로 쓰므로 메모리 사용량은 batch_size 에 비례한다.
+
+    :return: 내보낸 행 수
+    '''
+    snapshots = select(models.Ranking.crawled_at).distinct().order_by(models.Ranking.crawled_at)
+    if since is not None:
+        snapshots = snapshots.where(models.Ranking.crawled_at > since)
+    # 서버 사이드 커서(MySQL)로 읽는 동안 같은 커넥션에서 다른 쿼리를 실행할 수 없으므로 장르/배우는 별도 세션에서 조회
+    lookup = Session(bind=db.get_bind())
+    count = 0
+    try:
+        for crawled_at in db.scalars(snapshots).all():
+            _remove_snapshot(output_dir, crawled_at)
+            query = (
+                select(
+                    models.Ranking.rank, models.Country.name.label('country'), models.Movie.id.label('movie_id'),
+                    models.Movie.title, models.Movie.release_year, models.Movie.score,
+                )
+                .join(models.Movie, models.Movie.id == models.Ranking.movie_id)
+                .join(models.Country, models.Country.id == models.Ranking.country_id)
+                .where(models.Ranking.crawled_at == crawled_at)
+                .order_by(models.Ranking.country_id, models.Ranking.rank)
+                .execution_options(yield_per=batch_size)
+            )
+            for index, rankings in enumerate(db.execute(query).partitions()):
+                movie_ids = sorted({ranking.movie_id for ranking in rankings})
+                genres = _names_by_movie(lookup, models.MovieGenre, models.Genre, models.MovieGenre.genre_id, movie_ids)
+                actors = _names_by_movie(lookup, models.MovieActor, models.Actor, models.MovieActor.actor_id, movie_ids)
+                rows = [{
+                    'crawled_at': crawled_at,
+                    'crawl_date': crawled_at.strftime('%Y-%m-%d'),
+                    'country': ranking.country,
+                    'rank': ranking.rank,
+                    'title': ranking.title,
+                    'release_year': ranking.release_year,
+                    'score': ranking.score or 0.0,
+                    'genres': genres.get(ranking.movie_id, []),
+                    'actors': actors.get(ranking.movie_id, []),
+                } for ranking in rankings]
+                _write(rows, output_dir, _basename(crawled_at, index))
+                count += len(rows)
+    finally:
+        lookup.close()
+    return count
+
+def _names_by_movie(db: Session, association, model, foreign_key, movie_ids: list) -> dict:
+    names = {}
+    for i in range(0, len(movie_ids), 500):
+        rows = db.execute(
+            select(association.movie_id, model.name)
+            .join(model, model.id == foreign_key)
+            .where(association.movie_id.in_(movie_ids[i:i + 500]))
+            .order_by(association.movie_id, model.name)
+        )
+        for movie_id, name in rows:
+            names.setdefault(movie_id, []).append(name)
+    return names
+
+
+class SnapshotStore:
+    '''
+    내보낸 스냅샷에 대한 조회 도우미. 파티션/컬럼 단위로 필요한 부분만 읽고 pandas 벡터 연산으로 집계한다.
+    '''
+    def __init__(self, path: str = SNAPSHOT_EXPORT_PATH):
+        self.dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+
+    def load(self, columns: list = None, country: str = None, since: str = None) -> pd.DataFrame:
+        '''
+        :param since: 'YYYY-MM-DD' 이후 파티션만 읽음
+        '''
+        condition = None
+        if country is not None:
+            condition = ds.field('country') == country
+        if since is not None:
+            date_condition = ds.field('crawl_date') >= since
+            condition = date_condition if condition is None else condition & date_condition
+        return self.dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+    def rank_history(self, title: str, country: str = None) -> pd.DataFrame:
+        '''
+        영화의 스냅샷별 순위 변화 (country, crawled_at, rank)
+        '''
+        frame = self.load(['crawled_at', 'country', 'title', 'rank'], country=country)
+        frame = frame[frame['title'].to_numpy() == title]
+        return frame.sort_values(['country', 'crawled_at'])[['country', 'crawled_at', 'rank']].reset_index(drop=True)
+
+    def genre_trend(self, country: str = None) -> pd.DataFrame:
+        '''
+        스냅샷별 장르 비율 (행: crawled_at, 열: 장르)
+        '''
+        frame = self.load(['crawled_at', 'genres'], country=country).explode('genres', ignore_index=True).dropna()
+        counts = frame.groupby(['crawled_at', frame['genres'].astype(str)]).size().unstack(fill_value=0)
+        return counts.div(counts.sum(axis=1), axis=0)
+
+    def average_score_trend(self, country: str = None) -> pd.DataFrame:
+        '''
+        스냅샷/국가별 평균 평점
+        '''
+        frame = self.load(['crawled_at', 'country', 'score'], country=country)
+        frame['country'] = frame['country'].astype(str)
+        return frame.groupby(['crawled_at', 'country'], observed=True)['score'].mean().unstack('country')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export crawl snapshots to Parquet")
+    parser.add_argument('--json', default=None, help="내보낼 크롤링 결과 파일 (생략하면 DB 스냅샷)")
+    parser.add_argument('--crawled-at', type=datetime.fromisoformat, default=None,
+                        help="--json 파일의 스냅샷 시각 (UTC, ISO 형식). 생략하면 크롤러 변경 목록의 시각")
+    parser.add_argument('--output-dir', default=SNAPSHOT_EXPORT_PATH)
+    args = parser.parse_args()
+
+    if args.json:
+        count = export_crawl_file(args.json, crawled_at=args.crawled_at, output_dir=args.output_dir)
+    else:
+        from app.database import EngineConn
+        db = EngineConn().get_session()
+        try:
+            count = export_snapshots(db, output_dir=args.output_dir)
+        finally:
+            db.close()
+    print(f"{count} rows exported to {args.output_dir}")
+
+
+if __name__ == '__main__':
+    main()
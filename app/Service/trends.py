@@ -0,0 +1,192 @@
+import argparse
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from app.models import models
+
+
+MAX_PAGE_SIZE = 500
+
+def update_snapshot_rollups(db: Session, country_ids: set, crawled_at: datetime):
+    '''
+    새로 저장된 국가별 랭킹 스냅샷의 장르 수/평점 통계를 INSERT ... SELECT 로 한 번에 계산
+    (이전 스냅샷은 다시 계산하지 않음)
+    crawled_at 은 DB 에 저장된 스냅샷 시각이어야 하며, 롤업 PK 에도 랭킹 행의 값을 그대로 사용한다.
+    '''
+    if not country_ids:
+        return
+    ranking = models.Ranking
+    in_snapshot = (ranking.country_id.in_(country_ids), ranking.crawled_at == crawled_at)
+    genre_counts = (
+        select(ranking.country_id, ranking.crawled_at, models.MovieGenre.genre_id, func.count())
+        .join(models.MovieGenre, models.MovieGenre.movie_id == ranking.movie_id)
+        .where(*in_snapshot)
+        .group_by(ranking.country_id, ranking.crawled_at, models.MovieGenre.genre_id)
+    )
+    db.execute(insert(models.SnapshotGenreCount).from_select(
+        ['country_id', 'crawled_at', 'genre_id', 'count'], genre_counts
+    ))
+    score_stats = (
+        select(ranking.country_id, ranking.crawled_at, func.count(), func.coalesce(func.sum(models.Movie.score), 0.0))
+        .join(models.Movie, models.Movie.id == ranking.movie_id)
+        .where(*in_snapshot)
+        .group_by(ranking.country_id, ranking.crawled_at)
+    )
+    db.execute(insert(models.SnapshotScoreStats).from_select(
+        ['country_id', 'crawled_at', 'movie_count', 'score_sum'], score_stats
+    ))
+
+def backfill_snapshot_rollups(db: Session, rebuild: bool = False) -> int:
+    '''
+    롤업 테이블이 생기기 전에 적재된 랭킹 스냅샷의 장르 수/평점 통계를 채워 넣는 일회성 작업
+    (rebuild=True 면 기존 롤업을 지우고 모든 스냅샷을 다시 계산)
+
+    :return: 롤업을 계산한 (국가, 스냅샷) 수
+    '''
+    if rebuild:
+        db.execute(delete(models.SnapshotGenreCount))
+        db.execute(delete(models.SnapshotScoreStats))
+    ranking, stats = models.Ranking, models.SnapshotScoreStats
+    # 평점 통계 행은 랭킹이 있는 (국가, 스냅샷) 마다 하나씩 생기므로 없는 스냅샷이 곧 롤업이 빠진 스냅샷
+    missing = db.execute(
+        select(ranking.crawled_at, ranking.country_id).distinct()
+        .outerjoin(stats, (stats.country_id == ranking.country_id) & (stats.crawled_at == ranking.crawled_at))
+        .where(stats.country_id.is_(None))
+        .order_by(ranking.crawled_at)
+    ).all()
+    snapshots = {}
+    for crawled_at, country_id in missing:
+        snapshots.setdefault(crawled_at, set()).add(country_id)
+    for crawled_at, country_ids in snapshots.items():
+        # 중간에 끊긴 이전 실행이 남긴 장르 수가 있으면 PK 가 충돌하므로 먼저 지움
+        db.execute(delete(models.SnapshotGenreCount).where(
+            models.SnapshotGenreCount.country_id.in_(country_ids),
+            models.SnapshotGenreCount.crawled_at == crawled_at,
+        ))
+        update_snapshot_rollups(db, country_ids, crawled_at)
+    db.commit()
+    return len(missing)
+
+def _page(items: list, limit: int, cursor_of):
+    '''
+    limit + 1 개를 조회한 결과에서 다음 페이지 커서를 계산
+    '''
+    next_cursor = cursor_of(items[limit - 1]) if len(items) > limit else None
+    return {"items": items[:limit], "next_cursor": next_cursor}
+
+def _snapshot_page(db: Session, model, country_id: int, before: datetime, limit: int) -> list:
+    '''
+    롤업 테이블에서 before 이전 스냅샷 시각을 최신순으로 limit + 1 개 조회 (PK 인덱스 범위 스캔)
+    '''
+    query = select(model.crawled_at).where(model.country_id == country_id).distinct()
+    if before is not None:
+        query = query.where(model.crawled_at < before)
+    return db.scalars(query.order_by(model.crawled_at.desc()).limit(limit + 1)).all()
+
+def get_movie_rank_history(db: Session, movie_id: int, before: datetime = None, limit: int = 100) -> dict:
+    '''
+    영화의 스냅샷별 순위 (최신순, ix_rankings_movie_crawled_at 인덱스 사용)
+    '''
+    limit = min(limit, MAX_PAGE_SIZE)
+    query = (
+        select(models.Ranking.crawled_at, models.Ranking.rank, models.Country.name)
+        .join(models.Country, models.Country.id == models.Ranking.country_id)
+        .where(models.Ranking.movie_id == movie_id)
+    )
+    if before is not None:
+        query = query.where(models.Ranking.crawled_at < before)
+    rows = db.execute(query.order_by(models.Ranking.crawled_at.desc()).limit(limit + 1)).all()
+    items = [{"crawled_at": crawled_at, "rank": rank, "country": country} for crawled_at, rank, country in rows]
+    return _page(items, limit, lambda item: item["crawled_at"])
+
+def get_country_rank_history(db: Session, country_id: int, before: datetime = None, limit: int = 20) -> dict:
+    '''
+    국가의 스냅샷별 순위표 (최신순, 페이지 단위는 스냅샷)
+    '''
+    limit = min(limit, MAX_PAGE_SIZE)
+    snapshots = _snapshot_page(db, models.SnapshotScoreStats, country_id, before, limit)
+    if not snapshots:
+        return {"items": [], "next_cursor": None}
+    rows = db.execute(
+        select(models.Ranking.crawled_at, models.Ranking.rank, models.Movie.id, models.Movie.title)
+        .join(models.Movie, models.Movie.id == models.Ranking.movie_id)
+        .where(models.Ranking.country_id == country_id, models.Ranking.crawled_at.in_(snapshots[:limit]))
+        .order_by(models.Ranking.crawled_at.desc(), models.Ranking.rank)
+    ).all()
+    by_snapshot = {}
+    for crawled_at, rank, movie_id, title in rows:
+        by_snapshot.setdefault(crawled_at, []).append({"rank": rank, "movie_id": movie_id, "title": title})
+    items = [{"crawled_at": crawled_at, "rankings": by_snapshot.get(crawled_at, [])} for crawled_at in snapshots]
+    return _page(items, limit, lambda item: item["crawled_at"])
+
+def get_genre_share_trend(db: Session, country_id: int, before: datetime = None, limit: int = 100) -> dict:
+    '''
+    스냅샷별 장르 비율 (롤업 테이블에서 조회)
+    '''
+    limit = min(limit, MAX_PAGE_SIZE)
+    snapshots = _snapshot_page(db, models.SnapshotGenreCount, country_id, before, limit)
+    if not snapshots:
+        return {"items": [], "next_cursor": None}
+    rows = db.execute(
+        select(models.SnapshotGenreCount.crawled_at, models.Genre.name, models.SnapshotGenreCount.count)
+        .join(models.Genre, models.Genre.id == models.SnapshotGenreCount.genre_id)
+        .where(
+            models.SnapshotGenreCount.country_id == country_id,
+            models.SnapshotGenreCount.crawled_at.in_(snapshots[:limit])
+        )
+    ).all()
+    counts = {}
+    for crawled_at, genre, count in rows:
+        counts.setdefault(crawled_at, {})[genre] = count
+    items = []
+    for crawled_at in snapshots:
+        genre_counts = counts.get(crawled_at, {})
+        total = sum(genre_counts.values()) or 1
+        items.append({
+            "crawled_at": crawled_at,
+            "shares": {genre: round(count / total, 4) for genre, count in sorted(genre_counts.items())}
+        })
+    return _page(items, limit, lambda item: item["crawled_at"])
+
+def get_score_trend(db: Session, country_id: int, before: datetime = None, limit: int = 100) -> dict:
+    '''
+    스냅샷별 평균 평점 (롤업 테이블에서 조회)
+    '''
+    limit = min(limit, MAX_PAGE_SIZE)
+    stats = models.SnapshotScoreStats
+    query = select(stats.crawled_at, stats.movie_count, stats.score_sum).where(stats.country_id == country_id)
+    if before is not None:
+        query = query.where(stats.crawled_at < before)
+    rows = db.execute(query.order_by(stats.crawled_at.desc()).limit(limit + 1)).all()
+    items = [
+        {
+            "crawled_at": crawled_at,
+            "movie_count": movie_count,
+            "average_score": round(score_sum / movie_count, 3) if movie_count else 0.0
+        }
+        for crawled_at, movie_count, score_sum in rows
+    ]
+    return _page(items, limit, lambda item: item["crawled_at"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill ranking snapshot rollups")
+    parser.add_argument('--rebuild', action='store_true', help="기존 롤업을 지우고 모든 스냅샷을 다시 계산")
+    args = parser.parse_args()
+
+    from app.database import EngineConn
+    conn = EngineConn()
+    # 롤업 테이블이 생기기 전의 DB 에서도 실행할 수 있도록 먼저 테이블 생성 (이미 있으면 건너뜀)
+    models.Base.metadata.create_all(
+        bind=conn.engine, tables=[models.SnapshotGenreCount.__table__, models.SnapshotScoreStats.__table__]
+    )
+    db = conn.get_session()
+    try:
+        count = backfill_snapshot_rollups(db, rebuild=args.rebuild)
+    finally:
+        db.close()
+    print(f"{count} snapshot rollups computed")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,15 @@
+import logging
 import os
+import random
+import threading
+import time
 from typing import Final
 from sqlalchemy import *
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -10,16 +18,191 @@ DB_PASSWD: Final = os.getenv('DB_PASSWD')
 DB_HOST: Final = os.getenv("DB_HOST")
 DB_PORT: Final = os.getenv('DB_PORT')
 DB_NAME: Final = os.getenv('DB_NAME')
+# DB_URL 을 지정하면 MySQL 대신 사용 (예: sqlite:///app/data/local.db 로 로컬 테스트)
+DB_URL: Final = os.getenv('DB_URL') or f'mysql+pymysql://{DB_USER}:{DB_PASSWD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8'
+
+# 커넥션 풀 / 쿼리 설정
+DB_POOL_SIZE: Final = int(os.getenv('DB_POOL_SIZE', 10))
+DB_MAX_OVERFLOW: Final = int(os.getenv('DB_MAX_OVERFLOW', 20))
+DB_POOL_TIMEOUT: Final = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE: Final = int(os.getenv('DB_POOL_RECYCLE', 1800))
+DB_STATEMENT_TIMEOUT_MS: Final = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+DB_ECHO: Final = os.getenv('DB_ECHO', '').lower() in ('1', 'true', 'yes')
+DB_SLOW_QUERY_MS: Final = float(os.getenv('DB_SLOW_QUERY_MS', 500))
+DB_SLOW_QUERY_SAMPLE_RATE: Final = float(os.getenv('DB_SLOW_QUERY_SAMPLE_RATE', 1.0))
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger('app.database.slow_query')
+
+
+class TimedQueuePool(QueuePool):
+    '''
+    커넥션을 얻기까지 기다린 시간을 기록하는 QueuePool
+    '''
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics_lock = threading.Lock()
+        self.wait_metrics = {"checkouts": 0, "timeouts": 0, "wait_total_ms": 0.0, "wait_max_ms": 0.0}
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self.metrics_lock:
+                self.wait_metrics["timeouts"] += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - start) * 1000
+            with self.metrics_lock:
+                self.wait_metrics["checkouts"] += 1
+                self.wait_metrics["wait_total_ms"] += waited
+                self.wait_metrics["wait_max_ms"] = max(self.wait_metrics["wait_max_ms"], waited)
+
+    def recreate(self):
+        # dispose() 후 새로 만든 풀도 같은 클래스/설정 유지
+        pool = super().recreate()
+        pool.wait_metrics = self.wait_metrics
+        pool.metrics_lock = self.metrics_lock
+        return pool
+
+
+def _engine_options(url: str, is_async: bool = False) -> dict:
+    '''
+    드라이버에 맞는 엔진 옵션 (풀 크기, pre-ping, recycle, 쿼리 타임아웃)
+
+    드라이버마다 connect() 인자가 다르므로 비동기 엔진(aiomysql / aiosqlite)은 is_async=True 로 만든다.
+    '''
+    options = {"echo": DB_ECHO, "pool_pre_ping": True, "pool_recycle": DB_POOL_RECYCLE}
+    backend = make_url(url).get_backend_name()
+    if backend == 'sqlite':
+        # 로컬 대체 DB: 메모리 DB 는 기본 풀 사용, 파일 DB 는 스레드 간 공유 허용
+        options["connect_args"] = {"timeout": DB_STATEMENT_TIMEOUT_MS / 1000}
+        if not is_async:
+            options["connect_args"]["check_same_thread"] = False
+        if make_url(url).database in (None, '', ':memory:'):
+            return options
+    elif backend == 'mysql' and DB_STATEMENT_TIMEOUT_MS and not is_async:
+        # aiomysql.connect() 에는 read_timeout 이 없으므로 동기(pymysql) 엔진에만 지정.
+        # 두 엔진 모두 connect 시 설정하는 MAX_EXECUTION_TIME 으로 서버 쪽 실행 시간이 제한된다.
+        options["connect_args"] = {"read_timeout": max(1, DB_STATEMENT_TIMEOUT_MS // 1000 + 5)}
+    options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+
+def _async_url(url: str) -> str:
+    url = make_url(url)
+    driver = {'mysql': 'mysql+aiomysql', 'sqlite': 'sqlite+aiosqlite'}[url.get_backend_name()]
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _install_listeners(engine):
+    '''
+    MySQL 세션 쿼리 타임아웃과 샘플링된 느린 쿼리 로깅 설정
+    '''
+    if engine.dialect.name == 'mysql' and DB_STATEMENT_TIMEOUT_MS:
+        @event.listens_for(engine, 'connect')
+        def set_statement_timeout(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f"SET SESSION MAX_EXECUTION_TIME={DB_STATEMENT_TIMEOUT_MS}")
+            cursor.close()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+        if context is not None:
+            context._query_timed = True
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - conn.info['query_start'].pop()) * 1000
+        if context is not None:
+            context._query_timed = False
+        if elapsed >= DB_SLOW_QUERY_MS and random.random() < DB_SLOW_QUERY_SAMPLE_RATE:
+            slow_query_logger.warning("slow query (%.0fms): %s", elapsed, ' '.join(statement.split())[:500])
+
+    @event.listens_for(engine, 'handle_error')
+    def discard_timer(context):
+        # 실행 중 오류가 나면 after_cursor_execute 가 호출되지 않으므로 여기서 시작 시각을 버림
+        execution_context = context.execution_context
+        if execution_context is not None and getattr(execution_context, '_query_timed', False):
+            execution_context._query_timed = False
+            context.connection.info['query_start'].pop()
+
 
 class EngineConn:
-    def __init__(self):
+    '''
+    프로세스 전체에서 하나의 엔진(커넥션 풀)을 공유하는 DB 연결 관리자
+
+    EngineConn() 은 같은 프로세스에서 항상 같은 인스턴스를 반환하며,
+    fork 된 워커 프로세스에서는 부모의 커넥션을 쓰지 않도록 새 인스턴스를 만든다.
+    '''
+    _instance = None
+    _instance_pid = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls, url: str = None):
+        if url is not None:
+            return super().__new__(cls)
+        with cls._instance_lock:
+            if cls._instance is None or cls._instance_pid != os.getpid():
+                cls._instance = super().__new__(cls)
+                cls._instance_pid = os.getpid()
+            return cls._instance
+
+    def __init__(self, url: str = None):
+        if getattr(self, 'engine', None) is not None:
+            return
         load_dotenv()
-        self.engine = create_engine(
-            f'mysql+pymysql://{DB_USER}:{DB_PASSWD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8',
-            echo=True
-        )
+        self.url = url or DB_URL
+        options = _engine_options(self.url)
+        if "pool_size" in options:
+            options["poolclass"] = TimedQueuePool
+        self.engine = create_engine(self.url, **options)
+        _install_listeners(self.engine)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self._async_engine = None
+        self._AsyncSessionLocal = None
 
     def get_session(self):
         return self.SessionLocal()
 
+    @property
+    def async_engine(self):
+        # 비동기 엔진은 실제로 필요할 때 생성 (aiomysql / aiosqlite 드라이버 사용)
+        if self._async_engine is None:
+            options = _engine_options(self.url, is_async=True)
+            self._async_engine = create_async_engine(_async_url(self.url), **options)
+            _install_listeners(self._async_engine.sync_engine)
+            self._AsyncSessionLocal = async_sessionmaker(
+                bind=self._async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        return self._async_engine
+
+    def get_async_session(self) -> AsyncSession:
+        self.async_engine
+        return self._AsyncSessionLocal()
+
+    def pool_status(self) -> dict:
+        '''
+        모니터링용 커넥션 풀 상태 (사용 중 커넥션 수, 대기 시간 등)
+        '''
+        status = {"sync": _pool_status(self.engine.pool)}
+        if self._async_engine is not None:
+            status["async"] = _pool_status(self._async_engine.sync_engine.pool)
+        return status
+
+
+def _pool_status(pool) -> dict:
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(), checked_out=pool.checkedout(), checked_in=pool.checkedin(),
+            overflow=pool.overflow(), max_overflow=pool._max_overflow
+        )
+    metrics = getattr(pool, 'wait_metrics', None)
+    if metrics is not None:
+        with pool.metrics_lock:
+            status.update(metrics)
+        status["wait_avg_ms"] = status["wait_total_ms"] / status["checkouts"] if status["checkouts"] else 0.0
+    return status
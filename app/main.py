@@ -1,30 +1,92 @@
+import asyncio
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 
 from app.database import EngineConn
 from app.models.models import Base
-from app.routers.routes import router
+from app.routers.routes import router, ingest_job
+from app.utils.instrumentation import count_statements
+from app.utils.metrics import REGISTRY
+from app.utils.profiling import RequestProfiler, profile_slot, should_profile
+from app.utils.render_executor import render_executor
 
 # 데이터베이스 연결 설정
 engine = EngineConn().engine
 
+# crawled_at 스냅샷 시각 컬럼이 있는 테이블 - 예전 스키마는 DATETIME(0) 이라 마이크로초가 반올림됨
+SNAPSHOT_TABLES = ('rankings', 'snapshot_genre_counts', 'snapshot_score_stats')
+
+def upgrade_snapshot_columns(engine):
+    '''
+    기존 MySQL 테이블의 crawled_at 을 DATETIME(6) 으로 변경 (이미 변경됐거나 다른 DB 면 아무것도 하지 않음)
+    '''
+    if engine.dialect.name != 'mysql':
+        return
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in SNAPSHOT_TABLES:
+            if not inspector.has_table(table):
+                continue
+            column = next(c for c in inspector.get_columns(table) if c['name'] == 'crawled_at')
+            if getattr(column['type'], 'fsp', None) != 6:
+                conn.execute(text(f"ALTER TABLE {table} MODIFY crawled_at DATETIME(6) NOT NULL"))
+
 # 비동기 컨텍스트 관리자 정의
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 애플리케이션 시작 시 실행할 코드
-    inspector = inspect(engine)
-    if not inspector.has_table('movies'):
-        Base.metadata.create_all(bind=engine)
+    # 없는 테이블만 만들므로 기존 DB 에도 나중에 추가된 집계/롤업 테이블이 생성됨
+    Base.metadata.create_all(bind=engine)
+    upgrade_snapshot_columns(engine)
+    # 국가 인덱스를 먼저 읽어 두고, 적재는 백그라운드에서 실행 (요청 처리 경로에서 분리)
+    # 마지막 적재 이후 파일이 그대로면 다시 적재하지 않아 캐시도 유지됨
+    ingest_job.refresh_index()
+    ingest_job.start(skip_unchanged=True)
+    watcher = asyncio.create_task(ingest_job.watch())
     yield
-    # 애플리케이션 종료 시 실행할 코드 (필요한 경우 추가)
-    pass
+    # 애플리케이션 종료 시 실행할 코드
+    watcher.cancel()
+    render_executor.shutdown()
 
 # FastAPI 애플리케이션 생성 및 router 등록
 app = FastAPI(lifespan=lifespan)
 app.include_router(router)
+
+REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route', 'status')
+)
+REQUEST_STATEMENTS = REGISTRY.histogram(
+    'http_request_sql_statements', 'SQL statements executed per request', ('method', 'route'),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+# 요청별 SQL 실행 횟수를 응답 헤더로 노출 (N+1 쿼리 감시용) + 라우트별 지연 시간 히스토그램
+@app.middleware("http")
+async def sql_statement_counter(request: Request, call_next):
+    start = time.perf_counter()
+    profiled = should_profile(request.headers) and profile_slot.acquire(blocking=False)
+    try:
+        with count_statements() as counter:
+            if profiled:
+                with RequestProfiler(f"{request.method} {request.url.path}"):
+                    response = await call_next(request)
+            else:
+                response = await call_next(request)
+    finally:
+        if profiled:
+            profile_slot.release()
+    # 경로 파라미터 대신 라우트 템플릿으로 집계 (라벨 종류가 무한히 늘어나지 않도록)
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    REQUEST_DURATION.observe(
+        time.perf_counter() - start, method=request.method, route=route, status=response.status_code
+    )
+    REQUEST_STATEMENTS.observe(counter[0], method=request.method, route=route)
+    response.headers["X-SQL-Statements"] = str(counter[0])
+    return response
 # 템플릿 디렉토리 설정
 templates = Jinja2Templates(directory='app/templates')
 
@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
 
+# 스냅샷 시각은 적재 중 == / < 비교의 키이므로 MySQL 에서도 마이크로초까지 저장 (기본 DATETIME 은 초 단위로 반올림)
+SnapshotDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql')
+
 class Country(Base):
     __tablename__ = 'countries'
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -23,6 +28,14 @@ class Actor(Base):
 
 class Movie(Base):
     __tablename__ = 'movies'
+    # 자연 키(제목 + 개봉년도 + 국가)로 같은 영화의 중복 적재를 막음
+    __table_args__ = (
+        UniqueConstraint('title', 'release_year', 'country_id', name='uq_movies_natural_key'),
+        # 목록 API 의 정렬 키 (정렬 값, id) 커서 조회용
+        Index('ix_movies_title_id', 'title', 'id'),
+        Index('ix_movies_score_id', 'score', 'id'),
+        Index('ix_movies_country_id_id', 'country_id', 'id'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String(255), nullable=False)
     release_year = Column(String(20))
@@ -47,13 +60,61 @@ class MovieActor(Base):
 
 class Ranking(Base):
     __tablename__ = 'rankings'
+    # 국가별 최신 스냅샷 조회(country_id, crawled_at)를 인덱스로 처리
+    __table_args__ = (
+        Index('ix_rankings_country_crawled_at', 'country_id', 'crawled_at', 'rank'),
+        Index('ix_rankings_movie_crawled_at', 'movie_id', 'crawled_at'),
+        UniqueConstraint('country_id', 'crawled_at', 'movie_id', name='uq_rankings_snapshot_movie'),
+    )
     id = Column(Integer, primary_key=True, index=True)
     country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'))
     movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'))
     rank = Column(Integer)
+    crawled_at = Column(SnapshotDateTime, nullable=False, default=datetime.utcnow)  # 크롤링 스냅샷 시각
 
     country = relationship('Country')
     movie = relationship('Movie', back_populates="rankings")  # Movie와의 관계 추가
 
     def __str__(self):
-        return f'{self.country.name} - {self.rank} - {self.movie.title}'
\ No newline at end of file
+        return f'{self.country.name} - {self.rank} - {self.movie.title}'
+
+# 적재 시점에 갱신되는 국가별 집계 (시각화에서 재계산하지 않도록)
+class CountryWordFrequency(Base):
+    __tablename__ = 'country_word_frequencies'
+    country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'), primary_key=True)
+    word = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class CountryGenreCount(Base):
+    __tablename__ = 'country_genre_counts'
+    country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'), primary_key=True)
+    genre_id = Column(Integer, ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    genre = relationship('Genre')
+
+class CountryStats(Base):
+    __tablename__ = 'country_stats'
+    country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'), primary_key=True)
+    movie_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+
+    @property
+    def average_score(self):
+        return self.score_sum / self.movie_count if self.movie_count else 0.0
+
+
+# 랭킹 스냅샷 단위 롤업 (스냅샷이 적재될 때 한 번 계산되어 추이 API 에서 그대로 사용)
+class SnapshotGenreCount(Base):
+    __tablename__ = 'snapshot_genre_counts'
+    country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'), primary_key=True)
+    crawled_at = Column(SnapshotDateTime, primary_key=True)
+    genre_id = Column(Integer, ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class SnapshotScoreStats(Base):
+    __tablename__ = 'snapshot_score_stats'
+    country_id = Column(Integer, ForeignKey('countries.id', ondelete='CASCADE'), primary_key=True)
+    crawled_at = Column(SnapshotDateTime, primary_key=True)
+    movie_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
@@ -1,13 +1,28 @@
 import logging
-from pathlib import Path
-from fastapi import Depends, APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, PlainTextResponse, Response
 from app.Service.movie import *
 from app.database import EngineConn
-from app.utils.visualizer import Visualizer
+from app.Service.ingest import IngestJob
+from app.Service.search import search_index
+from app.Service import catalog, trends
+from app.utils.cache import dashboard_cache
+from app.utils.metrics import REGISTRY, render_all
+from app.utils.constant import IMAGE_MIME_TYPES, IMAGE_PROFILES, IMAGE_STORE_PATH, POSTER_FORMAT, POSTER_STORE_PATH
+from app.utils.posters import poster_store
+from app.utils.prerender import dashboard_path
+from app.utils.render_executor import render_executor
 
 router = APIRouter()
 engine_conn = EngineConn()
+ingest_job = IngestJob(engine_conn.get_session)
+POOL_GAUGE = REGISTRY.gauge('db_pool_connections', 'DB connection pool state', ('engine', 'state'))
+POOL_WAIT_SECONDS = REGISTRY.gauge('db_pool_wait_seconds_total', 'Total time spent waiting for a pooled connection', ('engine',))
+DEFAULT_RENDER_PARAMS = {"topk_count": 5, "image_profile": "default", "image_base_url": None}
 logger = logging.getLogger(__name__)
 # Dependency for getting a database session
 
@@ -21,22 +36,180 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    '''
+    비동기 엔드포인트용 AsyncSession 의존성.
+    '''
+    async with engine_conn.get_async_session() as db:
+        yield db
+
+def load_dashboard(country_name: str, etag: str, snapshot_at, render_params: dict):
+    '''
+    메모리/디스크 캐시 또는 prerender 결과에서 대시보드를 찾음 (블로킹 I/O, 스레드풀에서 실행)
+    '''
+    html_content = dashboard_cache.get(country_name, etag)
+    # prerender 결과는 기본 렌더링 파라미터로 만들어진 것만 사용
+    if html_content is None and render_params == DEFAULT_RENDER_PARAMS:
+        html_content = read_prerendered(country_name, snapshot_at)
+        if html_content is not None:
+            dashboard_cache.put(country_name, etag, html_content)
+    return html_content
+
+def read_prerendered(country_name: str, snapshot_at):
+    '''
+    prerender 단계에서 만든 정적 대시보드가 최신 스냅샷, 마지막 적재(캐시 무효화), 포스터 manifest 이후에
+    생성되었다면 반환. 새 스냅샷 없이 영화 정보만 바뀐 재적재도 캐시 무효화 시각으로 걸러진다.
+    '''
+    path = dashboard_path(country_name)
+    if not os.path.exists(path):
+        return None
+    if snapshot_at is not None and datetime.utcfromtimestamp(os.path.getmtime(path)) < snapshot_at:
+        return None
+    if os.path.getmtime(path) < dashboard_cache.updated_at(country_name):
+        return None
+    poster_version = poster_store.version()
+    if poster_version is not None and os.path.getmtime(path) < poster_version:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
 # Endpoint to fetch movies by country name
-@router.get("/movies/{country_name}/", response_model=list[movie.MovieBase])
-def fetch_movies_by_country(country_name: str, db: Session = Depends(get_db)):
-    logger.debug(f"Looking for country: {country_name}")
-    country = db.query(models.Country).filter(models.Country.name == country_name).first()
-    if not country:
-        logger.warning(f"Country {country_name} not found. Attempting to bulk insert movies.")
-        bulk_insert_movies_from_json(db=db)
-        country = db.query(models.Country).filter(models.Country.name == country_name).first()
-        if not country:
-            logger.error(f"Country {country_name} still not found after bulk insert.")
-            raise HTTPException(status_code=404, detail=f"Country {country_name} not found.")
-    logger.debug(f"Found country: {country.name} with movies: {country.movies}")
-    # visualizer 호출 및 HTML 파일 생성
-    visualizer = Visualizer(db=db, country_name=country_name)
-    output_path = visualizer.create_combined_html()
-    # 생성된HTML 파일 읽기 및 반환
-    html_content = Path(output_path).read_text(encoding='utf-8')
-    return HTMLResponse(content=html_content, status_code=200)
+@router.get("/movies/{country_name}/", response_class=HTMLResponse)
+async def fetch_movies_by_country(country_name: str, request: Request, image_profile: str = "default",
+                                  inline_images: bool = True, db: AsyncSession = Depends(get_async_db)):
+    # 적재된 국가 이름 인덱스로 확인하여, 없는 국가는 DB 조회 없이 바로 404
+    country_id = ingest_job.get_country_id(country_name)
+    if country_id is None:
+        raise HTTPException(status_code=404, detail=f"Country {country_name} not found.")
+    if image_profile not in IMAGE_PROFILES:
+        raise HTTPException(status_code=400, detail=f"Unknown image profile: {image_profile}")
+    # (국가, 데이터 버전, 렌더링 파라미터)로 캐시 키(ETag) 구성
+    render_params = {
+        "topk_count": 5,
+        "image_profile": image_profile,
+        "image_base_url": None if inline_images else "/images/"
+    }
+    snapshot_at = await get_latest_snapshot_at_async(db, country_id)
+    # 포스터 썸네일이 추가되면 카드의 이미지 경로가 바뀌므로 manifest 버전도 포함
+    etag = dashboard_cache.make_etag(country_name, (snapshot_at, poster_store.version()), render_params)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") in (etag, f'"{etag}"'):
+        return Response(status_code=304, headers=headers)
+
+    html_content = await run_in_threadpool(load_dashboard, country_name, etag, snapshot_at, render_params)
+    if html_content is None:
+        # 렌더링은 프로세스 풀에서 실행되며, 같은 키의 동시 요청은 하나의 렌더링을 공유
+        html_content = await render_executor.render(etag, country_name, render_params)
+        await run_in_threadpool(dashboard_cache.put, country_name, etag, html_content)
+    return HTMLResponse(content=html_content, status_code=200, headers=headers)
+
+# JSON 목록 API (커서 기반 페이지, fields 로 필요한 필드만 선택)
+@router.get("/api/movies/", response_class=ORJSONResponse)
+def list_movies(cursor: Optional[str] = None, limit: int = 50, sort: str = "id", fields: Optional[str] = None,
+                country: Optional[str] = None, genre: Optional[str] = None, db: Session = Depends(get_db)):
+    page = catalog.list_movies(db, cursor=cursor, limit=limit, sort=sort, fields=fields, country=country, genre=genre)
+    return ORJSONResponse(page)
+
+@router.get("/api/countries/", response_class=ORJSONResponse)
+def list_countries(cursor: Optional[str] = None, limit: int = 100, db: Session = Depends(get_db)):
+    return ORJSONResponse(catalog.list_names(db, models.Country, cursor=cursor, limit=limit))
+
+@router.get("/api/genres/", response_class=ORJSONResponse)
+def list_genres(cursor: Optional[str] = None, limit: int = 100, db: Session = Depends(get_db)):
+    return ORJSONResponse(catalog.list_names(db, models.Genre, cursor=cursor, limit=limit))
+
+@router.get("/api/actors/", response_class=ORJSONResponse)
+def list_actors(cursor: Optional[str] = None, limit: int = 100, db: Session = Depends(get_db)):
+    return ORJSONResponse(catalog.list_names(db, models.Actor, cursor=cursor, limit=limit))
+
+# 제목/요약/배우 검색 (국가/장르/연도 패싯 포함)
+@router.get("/api/search/", response_class=ORJSONResponse)
+def search_movies(q: str = "", country: Optional[str] = None, genre: Optional[str] = None,
+                  year_from: Optional[int] = None, year_to: Optional[int] = None, limit: int = 20, offset: int = 0):
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must be >= 0")
+    result = search_index.search(q, country=country, genre=genre, year_from=year_from, year_to=year_to,
+                                 limit=limit, offset=offset)
+    return ORJSONResponse(result)
+
+# 대시보드 차트 이미지 (내용 해시 파일명이므로 영구 캐시)
+@router.get("/images/{filename}")
+def fetch_image(filename: str):
+    name, _, extension = filename.rpartition(".")
+    if not name.isalnum() or extension not in IMAGE_MIME_TYPES:
+        raise HTTPException(status_code=404, detail="Image not found.")
+    path = os.path.join(IMAGE_STORE_PATH, filename)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Image not found.")
+    return FileResponse(
+        path,
+        media_type=IMAGE_MIME_TYPES[extension],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+def require_country_id(country_name: str) -> int:
+    country_id = ingest_job.get_country_id(country_name)
+    if country_id is None:
+        raise HTTPException(status_code=404, detail=f"Country {country_name} not found.")
+    return country_id
+
+# 랭킹/장르/평점 추이 (롤업 테이블 기반, before 커서로 최신순 페이지 조회)
+@router.get("/movies/{movie_id}/rank-history/")
+def fetch_movie_rank_history(movie_id: int, before: Optional[datetime] = None, limit: int = 100,
+                             db: Session = Depends(get_db)):
+    return trends.get_movie_rank_history(db, movie_id, before=before, limit=limit)
+
+@router.get("/countries/{country_name}/rank-history/")
+def fetch_country_rank_history(country_name: str, before: Optional[datetime] = None, limit: int = 20,
+                               db: Session = Depends(get_db)):
+    return trends.get_country_rank_history(db, require_country_id(country_name), before=before, limit=limit)
+
+@router.get("/countries/{country_name}/genre-trend/")
+def fetch_genre_trend(country_name: str, before: Optional[datetime] = None, limit: int = 100,
+                      db: Session = Depends(get_db)):
+    return trends.get_genre_share_trend(db, require_country_id(country_name), before=before, limit=limit)
+
+@router.get("/countries/{country_name}/score-trend/")
+def fetch_score_trend(country_name: str, before: Optional[datetime] = None, limit: int = 100,
+                      db: Session = Depends(get_db)):
+    return trends.get_score_trend(db, require_country_id(country_name), before=before, limit=limit)
+
+# 포스터 썸네일 (원본 내용 해시 파일명이므로 영구 캐시)
+@router.get("/posters/{filename}")
+def fetch_poster(filename: str):
+    name, _, extension = filename.rpartition(".")
+    if not name.isalnum() or extension != POSTER_FORMAT:
+        raise HTTPException(status_code=404, detail="Poster not found.")
+    path = os.path.join(POSTER_STORE_PATH, filename)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Poster not found.")
+    return FileResponse(
+        path,
+        media_type=IMAGE_MIME_TYPES[POSTER_FORMAT],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+# 관리자용 적재 트리거 및 상태 확인
+@router.post("/admin/ingest/", status_code=202)
+def trigger_ingest():
+    started = ingest_job.start()
+    return {"started": started, "status": ingest_job.status}
+
+# Prometheus 텍스트 형식 메트릭 (배치 작업이 남긴 textfile 메트릭 포함)
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    for engine, status in engine_conn.pool_status().items():
+        for state in ("size", "checked_out", "overflow"):
+            if state in status:
+                POOL_GAUGE.set(status[state], engine=engine, state=state)
+        if "wait_total_ms" in status:
+            POOL_WAIT_SECONDS.set(status["wait_total_ms"] / 1000, engine=engine)
+    return PlainTextResponse(render_all(), media_type="text/plain; version=0.0.4")
+
+@router.get("/admin/db/pool/")
+def get_pool_status():
+    return engine_conn.pool_status()
+
+@router.get("/admin/ingest/status/")
+def get_ingest_status():
+    return {"status": ingest_job.status, "countries": len(ingest_job.country_index)}
@@ -1,3 +1,5 @@
+from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel
 
 class GenreBase(BaseModel):
@@ -28,6 +30,7 @@ class RankingBase(BaseModel):
     rank: int
     country_id: int
     movie_id: int
+    crawled_at: Optional[datetime] = None
 
 class RankingCreate(RankingBase):
     pass
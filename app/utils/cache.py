@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Final
+
+DASHBOARD_CACHE_DIR: Final = 'app/data/cache/dashboards/'
+GENERATION_FILENAME: Final = 'generation'
+
+
+class DashboardCache:
+    '''
+    렌더링된 대시보드 HTML 캐시 (메모리 LRU + 디스크 2단계)
+
+    키는 (국가, 데이터 버전, 렌더링 파라미터)로 구성되며, 키의 해시가 그대로 ETag 로 쓰인다.
+    '''
+    def __init__(self, maxsize: int = 32, cache_dir: str = DASHBOARD_CACHE_DIR):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # 세대(generation) 토큰: 전체 무효화마다 바뀌는 전역 토큰 + 국가별 무효화마다 바뀌는 국가 토큰.
+        # 같은 스냅샷이라도 재적재 후에는 해당 국가의 ETag 만 바뀌고 다른 국가의 ETag/디스크 캐시는 그대로 유지된다.
+        # cache_dir 에 저장되므로 재시작 후에도 이전 데이터의 ETag 와 겹치지 않고,
+        # 같은 cache_dir 을 쓰는 다른 프로세스의 invalidate 도 반영된다.
+        self._generations = None
+        self._generations_mtime = None
+
+    def _load_generations(self) -> dict:
+        '''
+        {"token": 전역 토큰, "updated_at": 전역 무효화 시각, "countries": {국가: {"token", "updated_at"}}}
+        '''
+        path = os.path.join(self.cache_dir, GENERATION_FILENAME)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            # 아직 무효화된 적 없음
+            return self._save_generations({"token": uuid.uuid4().hex, "updated_at": 0.0, "countries": {}})
+        if mtime != self._generations_mtime:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            try:
+                self._generations = json.loads(content)
+            except ValueError:
+                # 예전 형식 (전역 토큰만 기록)
+                self._generations = {"token": content, "updated_at": 0.0, "countries": {}}
+            self._generations_mtime = mtime
+        return self._generations
+
+    def _save_generations(self, generations: dict) -> dict:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, GENERATION_FILENAME)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(generations, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._generations, self._generations_mtime = generations, os.stat(path).st_mtime_ns
+        return generations
+
+    def generation(self, country_name: str) -> str:
+        generations = self._load_generations()
+        country = generations["countries"].get(country_name) or {}
+        return f"{generations['token']}:{country.get('token', '')}"
+
+    def updated_at(self, country_name: str) -> float:
+        '''
+        국가의 캐시가 마지막으로 무효화된 시각 (epoch 초). 이보다 먼저 만들어진 렌더링 결과는 오래된 데이터다.
+        '''
+        generations = self._load_generations()
+        country = generations["countries"].get(country_name) or {}
+        return max(generations.get("updated_at", 0.0), country.get("updated_at", 0.0))
+
+    def make_etag(self, country_name: str, version, params: dict) -> str:
+        key = json.dumps(
+            [country_name, str(version), self.generation(country_name), params], ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+    def _disk_path(self, country_name: str, etag: str) -> str:
+        safe_name = hashlib.md5(country_name.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{safe_name}_{etag}.html")
+
+    def get(self, country_name: str, etag: str):
+        '''
+        캐시된 HTML 반환. 메모리에 없으면 디스크에서 읽어 메모리로 승격한다.
+        '''
+        with self._lock:
+            entry = self._memory.get(etag)
+            if entry is not None:
+                self._memory.move_to_end(etag)
+                return entry[1]
+        path = self._disk_path(country_name, etag)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        self._remember(country_name, etag, html)
+        return html
+
+    def put(self, country_name: str, etag: str, html: str):
+        self._remember(country_name, etag, html)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._disk_path(country_name, etag)
+        # 부분적으로 쓰인 파일이 읽히지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    def _remember(self, country_name: str, etag: str, html: str):
+        with self._lock:
+            self._memory[etag] = (country_name, html)
+            self._memory.move_to_end(etag)
+            while len(self._memory) > self.maxsize:
+                self._memory.popitem(last=False)
+
+    def invalidate(self, country_names=None):
+        '''
+        새 크롤링 데이터가 적재되면 해당 국가(없으면 전체)의 세대를 바꾸고 캐시를 비운다.
+        다른 국가의 ETag 와 디스크 캐시는 그대로 쓸 수 있도록 남겨 둔다.
+        '''
+        names = set(country_names) if country_names is not None else None
+        now = time.time()
+        with self._lock:
+            generations = self._load_generations()
+            if names is None:
+                generations = {"token": uuid.uuid4().hex, "updated_at": now, "countries": {}}
+            else:
+                countries = dict(generations["countries"])
+                countries.update({name: {"token": uuid.uuid4().hex, "updated_at": now} for name in names})
+                generations = dict(generations, countries=countries)
+            self._save_generations(generations)
+            for etag, (country_name, _) in list(self._memory.items()):
+                if names is None or country_name in names:
+                    del self._memory[etag]
+        prefixes = None if names is None else tuple(
+            hashlib.md5(name.encode('utf-8')).hexdigest()[:12] + '_' for name in names
+        )
+        for filename in os.listdir(self.cache_dir):
+            if filename.startswith(GENERATION_FILENAME):
+                continue
+            if prefixes is None or filename.startswith(prefixes):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except FileNotFoundError:
+                    pass
+
+dashboard_cache = DashboardCache()
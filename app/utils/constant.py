@@ -2,6 +2,15 @@ from typing import Final
 
 # crawler.py
 CRAWLER_OUTPUT_FILE_PATH: Final = 'app/data/crawl/country_code.json'
+# 크롤링 결과 파일. 크롤러가 이 경로에 저장하고(변경 목록도 옆에 저장), DB 적재/사전 렌더링/포스터 수집이 같은 경로를 읽음
+CRAWL_RESULT_PATH: Final = 'app/data/crawl/raw/movies_data_country.json'
+# 분산 크롤링 작업 큐(SQLite)와 작업별 결과 파일 저장 경로
+CRAWL_QUEUE_PATH: Final = 'app/data/crawl/queue.db'
+CRAWL_RESULTS_PATH: Final = 'app/data/crawl/jobs/'
+# 스트리밍 크롤링(JSONL) 출력이 끝났음을 알리는 완료 표시 파일 접미사 (적재 쪽 follow 모드가 확인)
+STREAM_DONE_SUFFIX: Final = '.done'
+# 결과 파일 옆에 저장하는 변경 목록(국가별 해시, 바뀐/빠진 국가) 파일 접미사 ({결과 파일 확장자 제외 경로}.hashes.json)
+CHANGE_MANIFEST_SUFFIX: Final = '.hashes.json'
 
 # visualizer.py
 TEMPLATE_OUTPUT_PATH: Final = 'app/templates/'
@@ -13,8 +22,43 @@ half_star_svg: Final = \
 empty_star_svg: Final = \
     '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 576 512" width="30" style="fill:lightgray;"><path d="M528.1 171.5l-146.4-21.3L316.7 17c-12.6-25.6-54.8-25.6-67.4 0l-65 132.9-146.4 21.3c-26.2 3.8-36.7 36-17.7 54.6l105.9 103-25 145.5c-4.5 26.2 23 46 46.4 33.7L288 439.6l130.6 68.6c23.4 12.3 50.9-7.4 46.4-33.7l-25-145.5 105.9-103c19-18.6 8.5-50.8-17.8-54.6z"/></svg>'
 
+# 차트 이미지 출력 프로필 (format, dpi, quality)
+# - legacy: 기존과 동일한 300dpi PNG
+# - default: 파이 차트는 벡터(SVG), 워드클라우드는 WebP
+# - compact: 워드클라우드를 저해상도 JPEG로 출력
+IMAGE_PROFILES: Final = {
+    'legacy': {
+        'wordcloud': {'format': 'png', 'dpi': 300},
+        'piechart': {'format': 'png', 'dpi': 300},
+    },
+    'default': {
+        'wordcloud': {'format': 'webp', 'dpi': 100, 'quality': 80},
+        'piechart': {'format': 'svg', 'dpi': 72},
+    },
+    'compact': {
+        'wordcloud': {'format': 'jpeg', 'dpi': 72, 'quality': 70},
+        'piechart': {'format': 'svg', 'dpi': 72},
+    },
+}
+IMAGE_MIME_TYPES: Final = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+    'webp': 'image/webp',
+    'jpeg': 'image/jpeg',
+}
+# 이미지를 base64 인라인 대신 별도 URL로 서빙할 때의 저장 경로
+IMAGE_STORE_PATH: Final = 'app/data/cache/images/'
+# 포스터 썸네일 저장소 (원본 내용 해시로 파일 이름 결정, 영화 카드 크기와 같은 150x200)
+POSTER_STORE_PATH: Final = 'app/data/cache/posters/'
+POSTER_BASE_URL: Final = '/posters/'
+POSTER_SIZE: Final = (150, 200)
+POSTER_FORMAT: Final = 'webp'
+POSTER_QUALITY: Final = 80
+
 # wordcloud용 mask의 경로
 MASK_PATH: Final = 'app/data/visualize/film_camera_mask.png'
+# 단어 배치는 1/2 크기 mask 에서 계산하고 그릴 때 2배로 확대 (출력 해상도는 동일)
+WORDCLOUD_SCALE: Final = 2
 HTML_PATH: Final = 'app/templates/' # html path
 
 # 불용어
@@ -0,0 +1,385 @@
+import json
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Final, NamedTuple, Optional
+
+# 작업 상태: pending(대기/재시도 대기) -> leased(워커가 처리 중) -> done / failed(재시도 한도 초과)
+PENDING: Final = 'pending'
+LEASED: Final = 'leased'
+DONE: Final = 'done'
+FAILED: Final = 'failed'
+
+SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    country_code TEXT NOT NULL,
+    country TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    last_error TEXT,
+    result_path TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, country_code, page)
+);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_available ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_run_status ON jobs (run_id, status);
+"""
+
+
+class CrawlJob(NamedTuple):
+    id: int
+    run_id: str
+    country_code: str
+    country: str
+    page: int
+    attempts: int
+    max_attempts: int
+
+
+def default_worker_id() -> str:
+    """호스트 이름 + pid + 임의 값 (같은 호스트에서 재시작한 워커도 구분)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class CrawlQueue:
+    """
+    SQLite 파일에 저장되는 (국가, 페이지) 크롤링 작업 큐
+
+    워커는 lease 로 작업을 일정 시간 동안 점유하고 heartbeat 로 연장한다.
+    워커가 죽어 lease 가 만료되면 다른 워커가 작업을 다시 가져가며,
+    실패한 작업은 지수 백오프 후 재시도되고 max_attempts 를 넘으면 failed 로 남는다.
+
+    여러 프로세스는 같은 파일을 열어 조율한다 (BEGIN IMMEDIATE 로 lease 를 직렬화).
+    여러 노드에서 쓰려면 파일 잠금이 올바르게 동작하는 공유 스토리지가 필요하며,
+    lease 만료 판단에 각 노드의 시계를 사용하므로 노드 간 시계가 동기화되어 있어야 한다.
+    """
+    def __init__(self, path: str, busy_timeout: float = 30):
+        """
+        :param path: 큐 DB 파일 경로
+        :param busy_timeout: 다른 프로세스가 쓰기 잠금을 잡고 있을 때 기다릴 최대 시간(초)
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        # sqlite3 연결은 스레드/프로세스 간에 공유할 수 없으므로 (pid, 스레드)마다 따로 연결
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (lease 경쟁 시 두 워커가 같은 작업을 가져가지 않도록)"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def enqueue(self, run_id: str, jobs, max_attempts: int = 5) -> int:
+        """
+        작업을 큐에 넣는 함수 (같은 run_id 의 같은 (국가 코드, 페이지)는 한 번만 들어감)
+
+        :param run_id: 크롤링 실행 식별자
+        :param jobs: (국가 코드, 국가 이름, 페이지) 튜플 iterable
+        :param max_attempts: 작업당 최대 시도 횟수
+        :return: 새로 추가된 작업 수
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, country_code, country, page, max_attempts,"
+                " available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, code, country, page, max_attempts, now, now, now) for code, country, page in jobs]
+            )
+            return conn.total_changes - before
+
+    def lease(self, worker_id: str, lease_seconds: float = 120, run_id: Optional[str] = None) -> Optional[CrawlJob]:
+        """
+        처리할 작업 하나를 점유하는 함수
+
+        재시도 시각이 지난 pending 작업과 lease 가 만료된 작업(워커가 죽은 경우)이 대상이다.
+
+        :param worker_id: 점유하는 워커 식별자
+        :param lease_seconds: heartbeat 없이 점유가 유지되는 시간(초)
+        :param run_id: 지정하면 해당 실행의 작업만 가져옴
+        :return: CrawlJob 또는 처리할 작업이 없으면 None
+        """
+        now = time.time()
+        run_filter, params = ("AND run_id = ?", (run_id,)) if run_id else ("", ())
+        with self._transaction() as conn:
+            # lease 가 만료된 작업은 원인을 남기고, 그중 시도 횟수를 다 쓴 것은 다시 나눠주지 않고 실패 처리
+            conn.execute(
+                f"UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN '{FAILED}' ELSE status END,"
+                " last_error = 'lease expired (' || COALESCE(lease_owner, '?') || ')',"
+                " lease_owner = CASE WHEN attempts >= max_attempts THEN NULL ELSE lease_owner END, updated_at = ?"
+                f" WHERE status = '{LEASED}' AND lease_expires_at < ? {run_filter}",
+                (now, now, *params)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs"
+                f" WHERE ((status = '{PENDING}' AND available_at <= ?) OR (status = '{LEASED}' AND lease_expires_at < ?))"
+                f" {run_filter} ORDER BY available_at, id LIMIT 1",
+                (now, now, *params)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                f"UPDATE jobs SET status = '{LEASED}', lease_owner = ?, lease_expires_at = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row['id'])
+            )
+        return CrawlJob(row['id'], row['run_id'], row['country_code'], row['country'], row['page'],
+                        row['attempts'] + 1, row['max_attempts'])
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: float = 120) -> bool:
+        """
+        점유 시간을 연장하는 함수
+
+        :return: 아직 이 워커가 점유 중이면 True (lease 가 만료되어 다른 워커가 가져갔으면 False)
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE jobs SET lease_expires_at = ?, updated_at = ?"
+            f" WHERE id = ? AND lease_owner = ? AND status = '{LEASED}'",
+            (now + lease_seconds, now, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str, result_path: str) -> bool:
+        """
+        작업을 완료 처리하는 함수 (현재 점유자만 완료할 수 있음)
+
+        :return: 완료 처리되었으면 True
+        """
+        cursor = self._connection().execute(
+            f"UPDATE jobs SET status = '{DONE}', result_path = ?, lease_owner = NULL, last_error = NULL,"
+            f" updated_at = ? WHERE id = ? AND lease_owner = ? AND status = '{LEASED}'",
+            (result_path, time.time(), job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker_id: str, error: str,
+             base_delay: float = 5, max_delay: float = 300) -> Optional[str]:
+        """
+        작업 실패를 기록하고 재시도를 예약하는 함수
+
+        재시도 대기 시간은 base_delay * 2^(시도 횟수 - 1) (최대 max_delay) 에 지터를 더해,
+        같은 원인으로 실패한 작업들이 동시에 다시 몰리지 않게 한다.
+
+        :return: 바뀐 상태 (pending 또는 failed), 점유를 이미 잃었으면 None
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT attempts, max_attempts FROM jobs WHERE id = ? AND lease_owner = ? AND status = '{LEASED}'",
+                (job_id, worker_id)
+            ).fetchone()
+            if row is None:
+                return None
+            if row['attempts'] >= row['max_attempts']:
+                status, available_at = FAILED, now
+            else:
+                delay = min(max_delay, base_delay * 2 ** (row['attempts'] - 1))
+                status, available_at = PENDING, now + delay / 2 + random.uniform(0, delay / 2)
+            conn.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_owner = NULL, lease_expires_at = NULL,"
+                " last_error = ?, updated_at = ? WHERE id = ?",
+                (status, available_at, error[:2000], now, job_id)
+            )
+        return status
+
+    def retry_failed(self, run_id: str) -> int:
+        """failed 작업을 시도 횟수를 초기화해 다시 대기열에 넣는 함수"""
+        now = time.time()
+        cursor = self._connection().execute(
+            f"UPDATE jobs SET status = '{PENDING}', attempts = 0, available_at = ?, updated_at = ?"
+            f" WHERE run_id = ? AND status = '{FAILED}'",
+            (now, now, run_id)
+        )
+        return cursor.rowcount
+
+    def outstanding(self, run_id: Optional[str] = None) -> int:
+        """아직 끝나지 않은 (pending + leased) 작업 수"""
+        run_filter, params = ("AND run_id = ?", (run_id,)) if run_id else ("", ())
+        return self._connection().execute(
+            f"SELECT COUNT(*) FROM jobs WHERE status IN ('{PENDING}', '{LEASED}') {run_filter}", params
+        ).fetchone()[0]
+
+    def stats(self, run_id: str) -> dict:
+        """상태별 작업 수 딕셔너리"""
+        rows = self._connection().execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,)
+        ).fetchall()
+        return {status: 0 for status in (PENDING, LEASED, DONE, FAILED)} | {row[0]: row[1] for row in rows}
+
+    def jobs(self, run_id: str, status: Optional[str] = None) -> list:
+        """실행의 작업 행을 enqueue 순서대로 반환"""
+        status_filter, params = ("AND status = ?", (status,)) if status else ("", ())
+        return [dict(row) for row in self._connection().execute(
+            f"SELECT * FROM jobs WHERE run_id = ? {status_filter} ORDER BY id", (run_id, *params)
+        )]
+
+
+def result_path(results_dir: str, job: CrawlJob) -> str:
+    """작업 결과 파일 경로 (같은 작업은 몇 번을 다시 실행해도 같은 파일)"""
+    return os.path.join(results_dir, job.run_id, f"{job.country_code}_p{job.page}.json")
+
+
+def write_result(results_dir: str, job: CrawlJob, records: list) -> str:
+    """
+    작업 결과를 임시 파일에 쓴 뒤 교체하는 함수
+
+    중간에 죽어도 반쯤 쓰인 파일이 남지 않고, lease 를 잃은 워커가 늦게 쓰더라도
+    같은 작업의 완전한 결과로 덮어쓸 뿐이므로 결과는 항상 한 벌만 남는다.
+
+    :return: 결과 파일 경로
+    """
+    path = result_path(results_dir, job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"country_code": job.country_code, "page": job.page, "movies": records}, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def collect_results(crawl_queue: CrawlQueue, run_id: str) -> dict:
+    """
+    완료된 작업 결과를 enqueue 순서대로 합치는 함수
+
+    :return: {"movies": [...]} 형태의 결과 (MovieCrawler.crawl_countries 와 같은 구조)
+    """
+    result = {"movies": []}
+    for job in crawl_queue.jobs(run_id, status=DONE):
+        with open(job['result_path'], 'r', encoding='utf-8') as f:
+            result["movies"].extend(json.load(f)["movies"])
+    return result
+
+
+class _Heartbeat(threading.Thread):
+    """작업 처리 중 주기적으로 lease 를 연장하는 스레드"""
+    def __init__(self, crawl_queue: CrawlQueue, job: CrawlJob, worker_id: str, lease_seconds: float):
+        super().__init__(name=f"heartbeat-{job.id}", daemon=True)
+        self.crawl_queue = crawl_queue
+        self.job = job
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = threading.Event()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.lease_seconds / 3):
+            try:
+                if not self.crawl_queue.heartbeat(self.job.id, self.worker_id, self.lease_seconds):
+                    self.lost.set()
+                    return
+            except sqlite3.Error as e:
+                # 일시적인 잠금 오류는 다음 주기에 다시 시도 (lease 가 끝나기 전에 두 번 더 기회가 있음)
+                print(f"Heartbeat failed for job {self.job.id}: {e}")
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class CrawlWorker:
+    """
+    큐에서 작업을 점유해 handler 로 처리하고 결과를 기록하는 워커
+
+    handler(job) 는 영화 레코드 리스트를 반환하거나, 재시도가 필요하면 예외를 던진다.
+    """
+    def __init__(self, crawl_queue: CrawlQueue, handler, results_dir: str, worker_id: Optional[str] = None,
+                 run_id: Optional[str] = None, lease_seconds: float = 120, poll_interval: float = 1,
+                 base_delay: float = 5, max_delay: float = 300):
+        """
+        :param crawl_queue: 작업 큐
+        :param handler: CrawlJob 을 받아 레코드 리스트를 반환하는 함수
+        :param results_dir: 작업 결과 파일을 저장할 디렉토리
+        :param worker_id: 워커 식별자 (기본값: 호스트:pid:임의값)
+        :param run_id: 지정하면 해당 실행의 작업만 처리
+        :param lease_seconds: lease 유지 시간(초), heartbeat 는 그 1/3 주기로 전송
+        :param poll_interval: 처리할 작업이 없을 때 다시 확인하기까지 대기 시간(초)
+        :param base_delay: 첫 재시도 대기 시간(초)
+        :param max_delay: 재시도 대기 시간 상한(초)
+        """
+        self.crawl_queue = crawl_queue
+        self.handler = handler
+        self.results_dir = results_dir
+        self.worker_id = worker_id or default_worker_id()
+        self.run_id = run_id
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.processed = {DONE: 0, PENDING: 0, FAILED: 0, 'lost': 0}
+
+    def run(self, max_jobs: Optional[int] = None, exit_when_idle: bool = True) -> dict:
+        """
+        작업 루프
+
+        :param max_jobs: 처리할 최대 작업 수 (None 이면 제한 없음)
+        :param exit_when_idle: True면 남은 작업(다른 워커가 처리 중인 것 포함)이 없을 때 종료
+        :return: 결과별 처리한 작업 수
+        """
+        handled = 0
+        while max_jobs is None or handled < max_jobs:
+            job = self.crawl_queue.lease(self.worker_id, self.lease_seconds, self.run_id)
+            if job is None:
+                if exit_when_idle and self.crawl_queue.outstanding(self.run_id) == 0:
+                    break
+                # 다른 워커가 처리 중이거나 백오프 대기 중인 작업이 있으면 lease 만료/재시도 시각까지 대기
+                time.sleep(self.poll_interval)
+                continue
+            self.process(job)
+            handled += 1
+        return self.processed
+
+    def process(self, job: CrawlJob) -> str:
+        """
+        작업 하나를 처리하는 함수
+
+        :return: 처리 결과 (done, pending(재시도 예약), failed, lost(lease 를 잃음))
+        """
+        heartbeat = _Heartbeat(self.crawl_queue, job, self.worker_id, self.lease_seconds)
+        heartbeat.start()
+        try:
+            records = self.handler(job)
+            path = write_result(self.results_dir, job, records)
+        except Exception as e:
+            heartbeat.stop()
+            print(f"Job {job.id} ({job.country_code} p{job.page}) attempt {job.attempts} failed: {e!r}")
+            outcome = self.crawl_queue.fail(job.id, self.worker_id, repr(e), self.base_delay, self.max_delay) or 'lost'
+        else:
+            heartbeat.stop()
+            outcome = DONE if self.crawl_queue.complete(job.id, self.worker_id, path) else 'lost'
+        self.processed[outcome] += 1
+        return outcome
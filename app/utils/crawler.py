@@ -1,10 +1,19 @@
+import argparse
+import asyncio
+import hashlib
 import json
+import multiprocessing
 import os
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
 from datetime import datetime
 from typing import Final
 
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -13,11 +22,253 @@ from selenium.webdriver.support.ui import WebDriverWait
 from tqdm import tqdm # type: ignore
 from webdriver_manager.chrome import ChromeDriverManager
 
-from constant import CRAWLER_OUTPUT_FILE_PATH
+from constant import (CHANGE_MANIFEST_SUFFIX, CRAWL_QUEUE_PATH, CRAWL_RESULT_PATH, CRAWL_RESULTS_PATH,
+                      CRAWLER_OUTPUT_FILE_PATH, STREAM_DONE_SUFFIX)
+from crawl_queue import CrawlJob, CrawlQueue, CrawlWorker, collect_results, result_path
+from http_backend import HttpBackend
+from metrics import Registry, write_textfile
 
 OUTPUT_FILE_PATH: Final = CRAWLER_OUTPUT_FILE_PATH
+# 크롤러는 서버와 별도 프로세스이므로 전용 레지스트리에 모아 textfile 로 남김 (서버 /metrics 에서 노출)
+CRAWLER_METRICS: Final = Registry()
+MOVIE_SCRAPE_SECONDS: Final = CRAWLER_METRICS.histogram(
+    'crawler_movie_scrape_seconds', 'Time to scrape one movie (open modal .. close modal)'
+)
+MOVIE_FAILURES: Final = CRAWLER_METRICS.counter(
+    'crawler_movie_failures_total', 'Movies that failed to scrape', ('country',)
+)
+STEP_SECONDS: Final = CRAWLER_METRICS.histogram(
+    'crawler_step_seconds', 'Time spent in each scrape step', ('step',)
+)
+STREAMED_MOVIES: Final = CRAWLER_METRICS.counter(
+    'crawler_streamed_movies_total', 'Movies written to the streaming JSONL output'
+)
+
+
+class StreamClosed(Exception):
+    """소비자가 스트림을 닫은 뒤 생산자가 레코드를 넣으려 할 때 발생"""
+
+
+def iter_produced(producers: list, workers: int = 1, maxsize: int = 1000):
+    """
+    producer(emit) 들을 workers 개의 스레드에서 실행하고 emit 된 레코드를 바로 yield 하는 제너레이터
+
+    큐가 maxsize 만큼 차면 producer 가 emit 에서 기다리므로 소비 속도와 관계없이 메모리 사용량이 일정하고,
+    소비자가 중간에 멈추면(제너레이터 close) producer 는 다음 emit 에서 StreamClosed 로 종료된다.
+    레코드는 완료 순서대로 나오며, producer 의 예외는 모든 레코드를 내보낸 뒤 다시 던진다.
+
+    :param producers: emit(record) 함수를 인자로 받는 함수 리스트
+    :param workers: 동시에 실행할 producer 수
+    :param maxsize: 생산자와 소비자 사이 큐의 최대 크기
+    """
+    records = queue.Queue(maxsize)
+    closed = threading.Event()
+    end = object()
+    errors = []
+
+    def emit(record):
+        while not closed.is_set():
+            try:
+                records.put(record, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise StreamClosed()
+
+    def run(producer):
+        if not closed.is_set():
+            producer(emit)
+
+    def run_all():
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawler") as executor:
+                for future in [executor.submit(run, producer) for producer in producers]:
+                    try:
+                        future.result()
+                    except StreamClosed:
+                        pass
+                    except Exception as e:
+                        errors.append(e)
+        finally:
+            try:
+                emit(end)
+            except StreamClosed:
+                pass
+
+    thread = threading.Thread(target=run_all, name="crawler-stream", daemon=True)
+    thread.start()
+    try:
+        while True:
+            record = records.get()
+            if record is end:
+                break
+            yield record
+    finally:
+        closed.set()
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+class DriverPool:
+    """
+    여러 워커가 공유하는 재사용 가능한 WebDriver 풀
+
+    드라이버는 필요할 때 최대 size 개까지 생성되며, 반납된 드라이버는 다음 국가 크롤링에 재사용된다.
+    폐기된 드라이버 자리는 idle 큐에 None 으로 표시되어, 기다리던 워커가 새 드라이버를 만든다.
+    """
+    def __init__(self, driver_factory, size: int = 1):
+        """
+        :param driver_factory: 새 WebDriver 인스턴스를 생성하는 함수
+        :param size: 풀이 유지할 최대 드라이버 수
+        """
+        self.driver_factory = driver_factory
+        self.size = size
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        """
+        풀에서 드라이버를 빌려오는 컨텍스트 매니저
+
+        정상 종료(또는 소비자가 제너레이터를 닫은 경우)에는 풀에 반납하고, 그 외 어떤 예외든
+        (WebDriverException, 죽은 chromedriver 의 연결 오류, 저널 쓰기 OSError 등) 드라이버를 폐기한다.
+        """
+        driver = self._get()
+        reusable = False
+        try:
+            yield driver
+            reusable = True
+        except GeneratorExit:
+            reusable = True
+            raise
+        finally:
+            if reusable:
+                self._idle.put(driver)
+            else:
+                self._discard(driver)
+
+    def _get(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if len(self._drivers) < self.size:
+                        return self._create()
+                driver = self._idle.get()
+            if driver is not None:
+                return driver
+            # 폐기된 드라이버 자리: 아직 다른 워커가 채우지 않았으면 새로 생성
+            with self._lock:
+                if len(self._drivers) < self.size:
+                    return self._create()
+
+    def _create(self):
+        """self._lock 을 잡은 상태에서 호출"""
+        try:
+            driver = self.driver_factory()
+        except BaseException:
+            # 생성 실패 시 자리를 돌려놓아 기다리는 워커가 다시 시도할 수 있게 함
+            self._idle.put(None)
+            raise
+        self._drivers.append(driver)
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self._idle.put(None)
+
+    def close(self):
+        """풀에 있는 모든 드라이버를 종료하는 함수"""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CrawlJournal:
+    """
+    완료된 영화 레코드를 한 줄씩 기록하는 JSONL 체크포인트
+
+    크롤링 도중 중단되더라도 재시작 시 (국가, 순위) 단위로 이어서 진행할 수 있다.
+    """
+    def __init__(self, path: str):
+        """
+        :param path: JSONL 저널 파일 경로
+        """
+        self.path = path
+        self.records = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """기존 저널을 읽어 (국가, 순위) -> 레코드 딕셔너리를 구성하는 함수"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 중단 시점에 잘린 마지막 줄은 무시
+                    continue
+                self.records[(record['country'], record['rank'])] = record
+
+    def get(self, country: str, rank: int):
+        return self.records.get((country, rank))
+
+    def append(self, record: dict):
+        """레코드를 저널에 추가하고 디스크에 즉시 반영하는 함수"""
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.records[(record['country'], record['rank'])] = record
+
+    def clear(self):
+        """크롤링이 끝까지 완료되면 저널을 삭제하는 함수"""
+        with self._lock:
+            self.records = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def hash_record(record: dict) -> str:
+    """
+    영화 레코드의 내용 해시를 계산하는 함수
+
+    :param record: transform_content_to_result 형식의 레코드
+    :return: SHA-256 hex 문자열
+    """
+    payload = json.dumps(record, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
 
 class MovieCrawler:
+    _driver_path = None
+    _driver_path_lock = threading.Lock()
+
     def initialize_driver(self):
         """
         Chrome WebDriver를 초기화하는 함수
@@ -25,7 +276,19 @@ class MovieCrawler:
         :return: 초기화된 WebDriver 인스턴스
         """
         options = self.configure_chrome_options()
-        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+        return webdriver.Chrome(service=Service(self.get_driver_path()), options=options)
+
+    @classmethod
+    def get_driver_path(cls) -> str:
+        """
+        ChromeDriver 설치 경로를 반환하는 함수 (프로세스당 한 번만 설치/확인)
+
+        :return: ChromeDriver 실행 파일 경로
+        """
+        with cls._driver_path_lock:
+            if cls._driver_path is None:
+                cls._driver_path = ChromeDriverManager().install()
+        return cls._driver_path
 
     def configure_chrome_options(self):
         """
@@ -34,7 +297,8 @@ class MovieCrawler:
         :return: 설정된 ChromeOptions 객체
         """
         options = webdriver.ChromeOptions()
-        # options.add_argument('--headless')  # 필요시 headless 모드 활성화
+        if self.headless:
+            options.add_argument('--headless=new')
         options.add_argument('--disable-gpu')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
@@ -73,14 +337,23 @@ class MovieCrawler:
             "rank": content["rank"]
         }
 
-    def __init__(self, country_codes_filepath=OUTPUT_FILE_PATH, top_n=10):
+    def __init__(self, country_codes_filepath=OUTPUT_FILE_PATH, top_n=10, workers=1, headless=False,
+                 base_url='https://www.imdb.com/search/title/?countries={}', backend='selenium',
+                 modal_timeout=5, wait_timeout=10, journal_path=None):
         """
         크롤러 초기화 함수
 
         :param country_codes_filepath: 국가 코드가 저장된 JSON 파일 경로
         :param top_n: 크롤링할 영화의 수
+        :param workers: 동시에 크롤링할 국가 수 (WebDriver 풀 크기)
+        :param headless: headless 모드로 Chrome 실행 여부
+        :param base_url: 국가 코드로 포맷되는 검색 페이지 URL (로컬 fixture의 file:// URL도 가능)
+        :param backend: 'selenium' (브라우저) 또는 'http' (브라우저 없이 HTML/JSON 파싱)
+        :param modal_timeout: 모달 열림/닫힘 상태를 기다리는 최대 시간(초)
+        :param wait_timeout: 버튼/요소를 기다리는 최대 시간(초)
+        :param journal_path: 체크포인트 저널(JSONL) 경로 (기본값: 결과 파일 옆 .journal.jsonl)
         """
-        self.BASE_URL = 'https://www.imdb.com/search/title/?countries={}'
+        self.BASE_URL = base_url
         self.BASE_XPATH = '/html/body/div[4]/div[2]/div/div[2]/div/div'
         self.RELATIVE_XPATHS = {
             'img': '/div[1]/div[1]/div/div/img',
@@ -90,17 +363,37 @@ class MovieCrawler:
             'summary': '/div[2]'
         }
         self.ELEMENTS_PATH = {
-            'genre': '/div[1]/div[2]/ul[2]/li[{}]',
-            'stars': '/div[3]/div/ul/li[{}]'
+            'genre': '/div[1]/div[2]/ul[2]/li',
+            'stars': '/div[3]/div/ul/li'
         }
         self.CLOSE_BUTTON_XPATH = '/html/body/div[4]/div[2]/div/div[1]/button'
-        self.BUTTON_XPATH_TEMPLATE = (
+        self.LIST_XPATH = (
             '//*[@id="__next"]/main/div[2]/div[3]/section/section/div/section/section/div[2]/div/section/'
-            'div[2]/div[2]/ul/li[{}]/div/div/div/div[1]/div[3]/button'
+            'div[2]/div[2]/ul'
         )
-        self.save_at:Final = 'app/data/crawl/movies_data_country.json'
+        self.BUTTON_XPATH_TEMPLATE = self.LIST_XPATH + '/li[{}]/div/div/div/div[1]/div[3]/button'
+        # 검색 결과 아래의 "50 more" 버튼 (누르면 같은 목록 뒤에 다음 항목들이 붙음)
+        self.LOAD_MORE_XPATH = '//button[contains(@class, "ipc-see-more__button")]'
+        self.save_at:Final = CRAWL_RESULT_PATH
+        self.journal_path = journal_path or os.path.splitext(self.save_at)[0] + '.journal.jsonl'
+        self.hashes_path = os.path.splitext(self.save_at)[0] + CHANGE_MANIFEST_SUFFIX
+        self.journal = None
+        self.changed_countries = []
+        self.removed_countries = []
         self.country_codes_filepath = country_codes_filepath
         self.top_n = top_n
+        self.workers = max(1, workers)
+        self.headless = headless
+        if backend not in ('selenium', 'http'):
+            raise ValueError(f"Unknown crawler backend: {backend}")
+        self.backend = backend
+        self.modal_timeout = modal_timeout
+        self.wait_timeout = wait_timeout
+        self.step_timings = {}
+        self._timings_lock = threading.Lock()
+        # 작업 큐 워커 모드에서 작업 사이에 재사용하는 드라이버 풀 / 결과 디렉토리
+        self._job_pool = None
+        self._job_results_dir = CRAWL_RESULTS_PATH
         
     def load_country_codes(self, filepath=OUTPUT_FILE_PATH):
         """국가 코드 로드"""
@@ -166,25 +459,88 @@ class MovieCrawler:
 
         :param driver: Selenium WebDriver 인스턴스
         :param base_xpath: 모든 요소에 공통으로 사용되는 XPATH
-        :param relative_xpaths: 각 요소별 상대적인 XPATH 템플릿이 담긴 딕셔너리
+        :param relative_xpaths: 각 요소별 목록 항목(li)의 상대 XPATH가 담긴 딕셔너리
         :return: 추출된 데이터(장르 리스트, 출연진 리스트) 가 담긴 딕셔너리
         """
         extracted_data = {}
-        # 상대 XPATH 템플릿을 기준으로 반복
-        for element_name, xpath_template in relative_xpaths.items():
-            values = []
-            index = 1
-            while True:
+        for element_name, relative_xpath in relative_xpaths.items():
+            # 목록 전체를 한 번의 find_elements 호출로 가져옴 (없으면 빈 리스트)
+            elements = driver.find_elements(By.XPATH, base_xpath + relative_xpath)
+            extracted_data[element_name] = [element.text for element in elements]
+        return extracted_data
+
+    @contextmanager
+    def timed(self, step: str):
+        """
+        단계별 소요 시간을 step_timings 에 누적하는 컨텍스트 매니저
+
+        :param step: 단계 이름 (예: 'open_modal', 'scrape_content')
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            STEP_SECONDS.observe(elapsed, step=step)
+            with self._timings_lock:
+                total, count = self.step_timings.get(step, (0.0, 0))
+                self.step_timings[step] = (total + elapsed, count + 1)
+
+    def wait_for_modal(self, driver, opened: bool):
+        """
+        고정 sleep 대신 모달의 실제 열림/닫힘 상태를 기다리는 함수
+
+        :param driver: Selenium WebDriver 인스턴스
+        :param opened: True면 모달이 보일 때까지, False면 사라질 때까지 대기
+        """
+        locator = (By.XPATH, self.BASE_XPATH)
+        condition = EC.visibility_of_element_located(locator) if opened else EC.invisibility_of_element_located(locator)
+        WebDriverWait(driver, self.modal_timeout, poll_frequency=0.05).until(condition)
+
+    def count_loaded(self, driver) -> int:
+        """검색 결과 목록에 현재 로드된 항목 수 (요소 목록을 전송받지 않도록 브라우저에서 계산)"""
+        return driver.execute_script(
+            "return document.evaluate(arguments[0], document, null,"
+            " XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;",
+            self.LIST_XPATH + '/li'
+        )
+
+    def load_more(self, driver, rank: int, strict: bool = False) -> int:
+        """
+        검색 결과 목록에 rank 번째 항목이 나타날 때까지 "더 보기" 버튼을 누르는 함수
+
+        :param driver: Selenium WebDriver 인스턴스
+        :param rank: 필요한 순위
+        :param strict: True면 목록이 늘어나지 않을 때(타임아웃) 결과의 끝으로 보지 않고 예외를 던짐
+        :return: 로드된 항목 수 (rank 보다 작으면 더 불러올 결과가 없음)
+        """
+        loaded = self.count_loaded(driver)
+        if not loaded:
+            # 페이지 로드 직후에는 목록이 아직 렌더링되지 않았을 수 있음
+            try:
+                WebDriverWait(driver, self.wait_timeout, poll_frequency=0.1).until(lambda d: self.count_loaded(d) > 0)
+            except TimeoutException:
+                if strict:
+                    raise
+                return 0
+            loaded = self.count_loaded(driver)
+        while loaded < rank:
+            buttons = driver.find_elements(By.XPATH, self.LOAD_MORE_XPATH)
+            if not buttons:
+                break
+            with self.timed('load_more'):
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", buttons[0])
+                ActionChains(driver).click(buttons[0]).perform()
                 try:
-                    full_xpath = f"{base_xpath}{xpath_template.format(index)}"
-                    element = driver.find_element(By.XPATH, full_xpath)
-                    values.append(element.text)
-                    index += 1
-                except Exception:
+                    WebDriverWait(driver, self.wait_timeout, poll_frequency=0.1).until(
+                        lambda d: self.count_loaded(d) > loaded
+                    )
+                except TimeoutException:
+                    if strict:
+                        raise
                     break
-            # 추출한 값들을 딕셔너리에 저장 (키는 element_name, 값은 values 리스트)
-            extracted_data[element_name] = values
-        return extracted_data
+            loaded = self.count_loaded(driver)
+        return loaded
 
     def process_movie(self, driver, wait, country, country_code, rank):
         """
@@ -198,27 +554,39 @@ class MovieCrawler:
         :return: 추출된 영화 정보가 담긴 딕셔너리
         """
         content = {}
+        start = time.perf_counter()
         try:
             print(f"Processing item {rank} for {country}({country_code})")
             # 버튼 클릭
             button_xpath = self.BUTTON_XPATH_TEMPLATE.format(rank)
-            self.click_button(driver, wait, button_xpath)
-            time.sleep(0.5)
+            with self.timed('open_modal'):
+                self.click_button(driver, wait, button_xpath)
+                self.wait_for_modal(driver, opened=True)
             # 콘텐츠 크롤링 -> img_url, 제목, 개봉년도, 평점, 요약
-            content = self.scrape_modal_content(wait, self.BASE_XPATH, self.RELATIVE_XPATHS)
+            with self.timed('scrape_content'):
+                content = self.scrape_modal_content(wait, self.BASE_XPATH, self.RELATIVE_XPATHS)
             # 국가 추가
             content['country'] = country
             # 추가 데이터 -> 장르, 출연진
-            content.update(self.scrape_modal_data(driver, self.BASE_XPATH, self.ELEMENTS_PATH))
+            with self.timed('scrape_lists'):
+                content.update(self.scrape_modal_data(driver, self.BASE_XPATH, self.ELEMENTS_PATH))
             # 순위 추가
             content['rank'] = rank
             # 모달 닫기
-            self.click_button(driver, wait, self.CLOSE_BUTTON_XPATH)
-            time.sleep(0.5)
+            with self.timed('close_modal'):
+                self.click_button(driver, wait, self.CLOSE_BUTTON_XPATH)
+                self.wait_for_modal(driver, opened=False)
+            MOVIE_SCRAPE_SECONDS.observe(time.perf_counter() - start)
         except Exception as e:
+            MOVIE_FAILURES.inc(country=country)
             self.log_error(country, rank, e)
         return content
     
+    def print_step_timings(self):
+        """단계별 평균 소요 시간을 출력하는 함수"""
+        for step, (total, count) in self.step_timings.items():
+            print(f"{step}: {total / count * 1000:.1f}ms avg over {count} calls")
+
     def log_error(self, country, rank, error):
         """
         에러 발생 시 로그를 기록하는 함수
@@ -243,17 +611,374 @@ class MovieCrawler:
         except Exception as e:
             print(f"An error occured:{e}")
     
-    def crawling(self):
-        """크롤링 메인 함수"""
+    def crawl_country(self, pool, country_code, country, progress=None, ranks=None, strict=False) -> list:
+        """
+        단일 국가의 영화 목록을 크롤링하는 함수
+
+        :param pool: 드라이버를 빌려올 DriverPool 인스턴스
+        :param country_code: 국가 코드
+        :param country: 국가 이름
+        :param progress: 영화 한 편 처리 후 호출할 콜백 (worker, country, rank)
+        :param ranks: 크롤링할 순위 목록 (기본값: 1..top_n)
+        :param strict: True면 드라이버 오류를 삼키지 않고 던짐 (작업 큐가 재시도하도록)
+        :return: transform_content_to_result 형식의 영화 리스트
+        """
+        movies = {
+            record["rank"]: record
+            for record in self.iter_country(pool, country_code, country, progress, ranks, strict)
+        }
+        return [movies[rank] for rank in sorted(movies)]
+
+    def iter_country(self, pool, country_code, country, progress=None, ranks=None, strict=False):
+        """
+        단일 국가의 영화 레코드를 크롤링하는 대로 하나씩 내보내는 제너레이터
+
+        첫 페이지에 없는 순위는 "더 보기" 버튼으로 목록을 늘려 가며 가져오고,
+        더 불러올 결과가 없으면 남은 순위는 건너뛴다. 인자는 crawl_country 와 같다.
+        """
+        worker = threading.current_thread().name
+        pending_ranks = []
+        for rank in ranks or range(1, self.top_n + 1):
+            record = self.journal.get(country, rank) if self.journal else None
+            if record:
+                # 이전 실행에서 이미 완료된 항목은 저널에서 복원
+                yield record
+                if progress:
+                    progress(worker, country, rank)
+            else:
+                pending_ranks.append(rank)
+        if not pending_ranks:
+            return
+        try:
+            with pool.acquire() as driver:
+                wait = WebDriverWait(driver, self.wait_timeout)
+                driver.get(self.BASE_URL.format(country_code))
+
+                loaded = 0
+                missing = []
+                for rank in pending_ranks:
+                    if rank > loaded:
+                        loaded = self.load_more(driver, rank, strict)
+                        if rank > loaded:
+                            print(f"Only {loaded} results available for {country} ({country_code})")
+                            break
+                    record = None
+                    try:
+                        content = self.process_movie(driver, wait, country, country_code, rank)
+                        if content:
+                            record = self.transform_content_to_result(content, country)
+                            if self.journal:
+                                self.journal.append(record)
+                        elif strict:
+                            # process_movie 는 오류를 삼키므로 브라우저가 죽었는지 직접 확인
+                            self.check_driver(driver)
+                            missing.append(rank)
+                    except Exception as e:
+                        if strict:
+                            raise
+                        self.log_error(country, rank, e)
+                    if progress:
+                        progress(worker, country, rank)
+                    if record:
+                        yield record
+                if missing:
+                    # 드라이버 안에서 던져야 acquire 가 이 드라이버를 풀에 돌려놓지 않고 폐기한다
+                    raise RuntimeError(f"Failed to scrape ranks {missing} for {country} ({country_code})")
+        except WebDriverException:
+            print(f"WebDriver error while processing country: {country} ({country_code})")
+            if strict:
+                raise
+        except Exception as e:
+            print(f"Unexpected error for country {country} ({country_code}): {e}")
+            if strict:
+                raise
+
+    def check_driver(self, driver):
+        """
+        드라이버(브라우저 세션)가 살아 있는지 확인하는 함수
+
+        :raises WebDriverException: 세션이 끊어졌거나 브라우저가 종료된 경우
+        """
+        try:
+            driver.current_url
+        except WebDriverException:
+            raise
+        except Exception as e:
+            # 브라우저 프로세스가 죽으면 WebDriverException 대신 urllib3 연결 오류가 올라온다
+            raise WebDriverException(f"Driver is unreachable: {e}") from e
+
+
+    def crawl_countries(self, country_code_dict: dict) -> dict:
+        """
+        여러 국가를 workers 개의 스레드로 병렬 크롤링하는 함수
+
+        결과는 완료 순서와 관계없이 country_code_dict 순서대로 병합된다.
+
+        :param country_code_dict: {국가 코드: 국가 이름} 딕셔너리
+        :return: {"movies": [...]} 형태의 결과
+        """
+        if self.backend == 'http':
+            return self.crawl_countries_http(country_code_dict)
+        result = {"movies": []}
+        workers = min(self.workers, len(country_code_dict)) or 1
+        progress_bar = tqdm(total=len(country_code_dict) * self.top_n, desc="crawling")
+        progress_lock = threading.Lock()
+
+        def on_progress(worker, country, rank):
+            with progress_lock:
+                progress_bar.set_postfix_str(f"{worker}: {country} #{rank}")
+                progress_bar.update(1)
+
+        with DriverPool(self.initialize_driver, size=workers) as pool, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawler") as executor:
+            futures = [
+                executor.submit(self.crawl_country, pool, country_code, country, on_progress)
+                for country_code, country in country_code_dict.items()
+            ]
+            for future in futures:
+                result["movies"].extend(future.result())
+        progress_bar.close()
+        return result
+
+    def crawl_countries_http(self, country_code_dict: dict) -> dict:
+        """
+        HTTP 백엔드로 여러 국가를 크롤링하는 함수
+
+        :param country_code_dict: {국가 코드: 국가 이름} 딕셔너리
+        :return: {"movies": [...]} 형태의 결과 (Selenium 경로와 동일한 구조)
+        """
+        result = {"movies": []}
+        journaled = {}
+        pending = {}
+        for country_code, country in country_code_dict.items():
+            records = [self.journal.get(country, rank) for rank in range(1, self.top_n + 1)] if self.journal else []
+            if records and all(records):
+                journaled[country_code] = records
+            else:
+                pending[country_code] = country
+        backend = HttpBackend(self.BASE_URL, concurrency=max(self.workers, len(pending)))
+        contents = backend.crawl(pending, self.top_n) if pending else {}
+        for country_code, country in country_code_dict.items():
+            if country_code in journaled:
+                result["movies"].extend(journaled[country_code])
+                continue
+            for content in contents.get(country_code, []):
+                record = self.transform_content_to_result(content, country)
+                if self.journal:
+                    self.journal.append(record)
+                result["movies"].append(record)
+        return result
+
+    def stream(self, country_code_dict: dict, skip=frozenset(), maxsize: int = 1000):
+        """
+        여러 국가의 영화 레코드를 크롤링하는 대로 내보내는 제너레이터
+
+        결과를 모아 두지 않으므로 top_n 이 수천이어도 메모리 사용량이 일정하다 (레코드는 완료 순서로 나옴).
+
+        :param country_code_dict: {국가 코드: 국가 이름} 딕셔너리
+        :param skip: 건너뛸 (국가 이름, 순위) 집합 (이어서 크롤링할 때)
+        :param maxsize: 크롤링과 소비 사이에 버퍼링할 최대 레코드 수
+        """
+        if self.backend == 'http':
+            backend = HttpBackend(self.BASE_URL, concurrency=max(self.workers, len(country_code_dict)))
+
+            def produce(emit):
+                def on_page(country_code, contents):
+                    for content in contents:
+                        record = self.transform_content_to_result(content, country_code_dict[country_code])
+                        if (record["country"], record["rank"]) not in skip:
+                            emit(record)
+                backend.crawl_pages(country_code_dict, self.top_n, on_page)
+
+            yield from iter_produced([produce], maxsize=maxsize)
+            return
+
+        def producer(pool, country_code, country):
+            ranks = [rank for rank in range(1, self.top_n + 1) if (country, rank) not in skip]
+
+            def produce(emit):
+                if ranks:
+                    # 소비자가 멈춰 emit 이 StreamClosed 를 던지면 제너레이터를 바로 닫아 드라이버를 풀에 반납
+                    with closing(self.iter_country(pool, country_code, country, ranks=ranks)) as records:
+                        for record in records:
+                            emit(record)
+            return produce
+
+        workers = min(self.workers, len(country_code_dict)) or 1
+        with DriverPool(self.initialize_driver, size=workers) as pool:
+            yield from iter_produced(
+                [producer(pool, country_code, country) for country_code, country in country_code_dict.items()],
+                workers=workers, maxsize=maxsize
+            )
+
+    def stream_to_jsonl(self, path: str, resume: bool = True) -> int:
+        """
+        크롤링 결과를 한 줄에 레코드 하나씩 JSONL 로 바로 기록하는 함수
+
+        레코드마다 flush 하므로 적재 쪽은 follow 모드(iter_movie_records(path, follow=True))로
+        크롤링이 끝나기 전에 읽기 시작할 수 있고, 끝나면 {path}.done 을 만들어 완료를 알린다.
+        전체 결과를 메모리에 두지 않으므로 변경 감지(detect_changes)는 하지 않는다.
+
+        :param path: 출력 JSONL 경로
+        :param resume: True면 완료 표시가 없는 기존 파일에 이어 쓰며 이미 기록된 (국가, 순위)는 건너뜀
+        :return: 이번 실행에서 기록한 레코드 수
+        """
+        country_code_dict = self.load_country_codes(self.country_codes_filepath)
+        done_path = path + STREAM_DONE_SUFFIX
+        resuming = resume and os.path.exists(path) and not os.path.exists(done_path)
+        skip = self.streamed_keys(path) if resuming else set()
+        if os.path.exists(done_path):
+            os.remove(done_path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # 스트리밍 출력 파일 자체가 체크포인트이므로 레코드를 메모리에 쌓는 저널은 사용하지 않음
+        self.journal = None
+
+        count = 0
+        start = time.perf_counter()
+        with open(path, 'a' if resuming else 'w', encoding='utf-8') as f:
+            for record in self.stream(country_code_dict, skip):
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                count += 1
+                STREAMED_MOVIES.inc()
+            os.fsync(f.fileno())
+        open(done_path, 'w').close()
+
+        elapsed = time.perf_counter() - start
+        print(f"{count} movies ({len(skip)} resumed) in {elapsed:.1f}s, {count / (elapsed / 60):.0f} movies/minute")
+        self.print_step_timings()
+        self.write_metrics()
+        return count
+
+    def streamed_keys(self, path: str) -> set:
+        """
+        이어 쓸 JSONL 파일에 이미 기록된 (국가, 순위) 집합을 읽는 함수
+
+        중단 시점에 잘린 마지막 줄은 파일에서 잘라내 다음 레코드와 섞이지 않게 한다.
+        """
+        keys, valid = set(), 0
+        with open(path, 'rb+') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                keys.add((record["country"], record["rank"]))
+                valid += len(line)
+            f.truncate(valid)
+        return keys
+
+    def detect_changes(self, result: dict) -> tuple:
+        """
+        이전 크롤링과 비교해 내용이 바뀐 국가와 결과에서 빠진 국가 목록을 계산하는 함수
+
+        국가별 (순위 -> 내용 해시) 매핑은 save_hashes 로 hashes_path 에 저장되어 다음 실행과 비교된다.
+
+        :param result: {"movies": [...]} 형태의 크롤링 결과
+        :return: (변경되거나 새로 생긴 국가 이름 리스트, 이전 결과에는 있었지만 빠진 국가 이름 리스트)
+        """
+        previous = self.load_hashes().get('hashes', {})
+        current = self.compute_hashes(result)
+        changed = [country for country in current if previous.get(country) != current[country]]
+        removed = [country for country in previous if country not in current]
+        return changed, removed
+
+    def load_hashes(self) -> dict:
+        """이전 실행이 저장한 해시 파일 내용 (없으면 빈 딕셔너리)"""
+        if not os.path.exists(self.hashes_path):
+            return {}
+        with open(self.hashes_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def compute_hashes(self, result: dict) -> dict:
+        """국가별 {순위: 내용 해시} 딕셔너리를 만드는 함수"""
+        hashes = {}
+        for record in result["movies"]:
+            hashes.setdefault(record["country"], {})[str(record["rank"])] = hash_record(record)
+        return hashes
+
+    def save_hashes(self, result: dict, changed: list, removed: list):
+        """
+        현재 결과의 해시와 변경/삭제된 국가 목록을 저장하는 함수
+
+        source_sha256 은 방금 저장한 결과 파일, previous_sha256 은 직전에 저장했던 결과 파일의 해시다.
+        다운스트림(DB 적재, 대시보드 사전 렌더링)은 마지막으로 처리한 파일이 previous_sha256 과 같을 때만
+        changed_countries 만 다시 처리하고, 그렇지 않으면 전체를 처리한다.
+        """
+        previous_sha256 = self.load_hashes().get('source_sha256')
+        with open(self.save_at, 'rb') as f:
+            source_sha256 = hashlib.sha256(f.read()).hexdigest()
+        with open(self.hashes_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "updated_at": datetime.now().isoformat(),
+                # 스냅샷 시각 (UTC) - DB 적재와 Parquet 내보내기가 같은 크롤링을 같은 시각으로 기록하도록 공유
+                "crawled_at": datetime.utcnow().isoformat(),
+                "source_sha256": source_sha256,
+                "previous_sha256": previous_sha256,
+                "changed_countries": changed,
+                "removed_countries": removed,
+                "hashes": self.compute_hashes(result)
+            }, f, ensure_ascii=False, indent=4)
+
+    def benchmark_backends(self) -> dict:
+        """
+        Selenium/HTTP 백엔드의 국가당 지연 시간(초)을 비교하는 함수
+
+        :return: {백엔드 이름: 국가당 평균 소요 시간} 딕셔너리
+        """
+        country_code_dict = self.load_country_codes(self.country_codes_filepath)
+        original_backend = self.backend
+        report = {}
+        try:
+            for backend in ('selenium', 'http'):
+                self.backend = backend
+                start = time.perf_counter()
+                self.crawl_countries(country_code_dict)
+                report[backend] = (time.perf_counter() - start) / max(len(country_code_dict), 1)
+                print(f"backend={backend}: {report[backend]:.2f}s per country")
+        finally:
+            self.backend = original_backend
+        return report
+
+    def benchmark(self, workers_list=(1, 4)) -> dict:
+        """
+        직렬/병렬 크롤링의 처리량(countries/minute)을 비교하는 함수
+
+        :param workers_list: 측정할 워커 수 목록 (1은 직렬 경로)
+        :return: {워커 수: countries/minute} 딕셔너리
+        """
+        country_code_dict = self.load_country_codes(self.country_codes_filepath)
+        original_workers = self.workers
+        report = {}
+        try:
+            for workers in workers_list:
+                self.workers = workers
+                start = time.perf_counter()
+                self.crawl_countries(country_code_dict)
+                elapsed = time.perf_counter() - start
+                report[workers] = len(country_code_dict) / (elapsed / 60) if elapsed else 0.0
+                print(f"workers={workers}: {elapsed:.1f}s, {report[workers]:.2f} countries/minute")
+        finally:
+            self.workers = original_workers
+        return report
+
+    def crawling(self, resume=True):
+        """
+        크롤링 메인 함수
+
+        :param resume: True면 저널에 기록된 (국가, 순위)는 건너뛰고 이어서 크롤링
+        """
         result = {"movies": []}
 
         try:
             # 국가 코드 로드
-            country_code_dict = self.load_country_codes()
+            country_code_dict = self.load_country_codes(self.country_codes_filepath)
         except FileNotFoundError:
             print("Country code file not found. Creating default file.")
             self.create_default_country_code_file(self.country_codes_filepath)
-            country_code_dict = self.load_country_codes()
+            country_code_dict = self.load_country_codes(self.country_codes_filepath)
         except json.JSONDecodeError:
             print("Error decoding the country code file. Please check the file format.")
             return result
@@ -261,29 +986,236 @@ class MovieCrawler:
             print(f"Unexpected error while loading country codes: {e}")
             return result
 
-        for country_code, country in country_code_dict.items():
-            try:
-                with self.initialize_driver() as driver:
-                    wait = WebDriverWait(driver, 10)
-                    driver.get(self.BASE_URL.format(country_code))
-
-                    for rank in range(1, self.top_n + 1):
-                        try:
-                            content = self.process_movie(driver, wait, country, country_code, rank)
-                            if content:
-                                result["movies"].append(self.transform_content_to_result(content, country))
-                        except Exception as e:
-                            self.log_error(country, rank, e)
-            except webdriver.WebDriverException:
-                print(f"WebDriver error while processing country: {country} ({country_code})")
-            except Exception as e:
-                print(f"Unexpected error for country {country} ({country_code}): {e}")
+        if not resume and os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal = CrawlJournal(self.journal_path)
+        result = self.crawl_countries(country_code_dict)
 
+        if self.save_result(result):
+            self.journal.clear()
+        self.print_step_timings()
+        self.write_metrics()
+        return result
+
+    def save_result(self, result: dict) -> bool:
+        """
+        이전 결과와 비교해 바뀐 국가가 있을 때만 결과와 해시를 저장하는 함수
+
+        :param result: {"movies": [...]} 형태의 크롤링 결과
+        :return: 저장 과정에서 오류가 없었으면 True
+        """
         try:
-            self.save_dict_as_json(result, self.save_at)
+            self.changed_countries, self.removed_countries = self.detect_changes(result)
+            if self.changed_countries or self.removed_countries or not os.path.exists(self.save_at):
+                self.save_dict_as_json(result, self.save_at)
+                self.save_hashes(result, self.changed_countries, self.removed_countries)
+                print(f"Changed countries: {', '.join(self.changed_countries)}")
+                if self.removed_countries:
+                    print(f"Removed countries: {', '.join(self.removed_countries)}")
+            else:
+                print("No changes detected. Skipping save.")
+            return True
         except IOError:
             print("Failed to save results due to file I/O error.")
         except Exception as e:
             print(f"Unexpected error while saving results: {e}")
+        return False
+
+    def write_metrics(self):
+        try:
+            write_textfile('crawler', CRAWLER_METRICS)
+        except OSError as e:
+            print(f"Failed to write crawler metrics: {e}")
+
+    def config(self) -> dict:
+        """워커 프로세스에서 같은 설정의 크롤러를 만들기 위한 생성자 인자"""
+        return {
+            "country_codes_filepath": self.country_codes_filepath, "top_n": self.top_n, "headless": self.headless,
+            "base_url": self.BASE_URL, "backend": self.backend,
+            "modal_timeout": self.modal_timeout, "wait_timeout": self.wait_timeout,
+        }
+
+    def enqueue_run(self, crawl_queue: CrawlQueue, run_id: str, pages: int = 1, max_attempts: int = 5) -> int:
+        """
+        국가 코드 파일의 모든 국가에 대해 (국가, 페이지) 작업을 큐에 넣는 함수
+
+        페이지 p 는 검색 결과의 (p-1)*top_n+1 .. p*top_n 순위를 뜻한다.
+
+        :param crawl_queue: 작업 큐
+        :param run_id: 크롤링 실행 식별자 (같은 run_id 로 다시 넣으면 빠진 작업만 추가)
+        :param pages: 국가당 페이지 수
+        :param max_attempts: 작업당 최대 시도 횟수
+        :return: 새로 추가된 작업 수
+        """
+        country_code_dict = self.load_country_codes(self.country_codes_filepath)
+        return crawl_queue.enqueue(run_id, (
+            (country_code, country, page)
+            for country_code, country in country_code_dict.items()
+            for page in range(1, pages + 1)
+        ), max_attempts=max_attempts)
+
+    def crawl_job(self, job: CrawlJob) -> list:
+        """
+        큐 작업 하나(국가의 한 페이지)를 크롤링하는 함수
+
+        기존 경로와 달리 드라이버 오류, 빈 결과, 결과가 끝나지 않았는데 빠진 순위는 예외로 던져
+        큐가 백오프 후 재시도하게 하고, 실패한 드라이버는 버리고 다음 작업에서 새로 만든다.
+        Selenium 백엔드는 작업별 저널을 남겨, 재시도 시 이미 끝난 순위는 다시 크롤링하지 않는다.
+
+        :param job: CrawlJob
+        :return: transform_content_to_result 형식의 영화 리스트
+        """
+        ranks = range((job.page - 1) * self.top_n + 1, job.page * self.top_n + 1)
+        if self.backend == 'http':
+            records = [
+                self.transform_content_to_result(content, job.country)
+                for content in asyncio.run(self._collect_job_http(job, ranks.stop - 1)) if content["rank"] in ranks
+            ]
+        else:
+            if self._job_pool is None:
+                self._job_pool = DriverPool(self.initialize_driver, size=1)
+            self.journal = CrawlJournal(result_path(self._job_results_dir, job) + '.journal.jsonl')
+            try:
+                records = self.crawl_country(self._job_pool, job.country_code, job.country, ranks=ranks, strict=True)
+            except BaseException:
+                # 실패한 작업의 브라우저는 상태를 믿을 수 없으므로 다음 작업은 새 드라이버로 시작
+                self._job_pool.close()
+                self._job_pool = None
+                raise
+        if not records:
+            raise RuntimeError(f"No movies scraped for {job.country} ({job.country_code}) page {job.page}")
+        if self.journal:
+            self.journal.clear()
+            self.journal = None
+        return records
+
+    async def _collect_job_http(self, job: CrawlJob, top_n: int) -> list:
+        # HttpBackend.crawl 은 국가별 오류를 출력하고 빈 결과로 바꾸므로, 작업 경로에서는 예외가 그대로 올라오게 직접 수집
+        backend = HttpBackend(self.BASE_URL)
+        async with backend.session() as session:
+            return await backend.collect_country(session, job.country_code, job.country, top_n)
+
+    def work(self, queue_path: str = CRAWL_QUEUE_PATH, results_dir: str = CRAWL_RESULTS_PATH, run_id=None,
+             lease_seconds: float = 120, max_jobs=None) -> dict:
+        """
+        작업 큐 워커 (노드마다 원하는 수만큼 프로세스로 실행)
+
+        :param queue_path: 작업 큐 DB 경로 (여러 노드가 공유하는 스토리지에 둘 수 있음)
+        :param results_dir: 작업 결과 디렉토리
+        :param run_id: 지정하면 해당 실행의 작업만 처리
+        :param lease_seconds: lease 유지 시간(초)
+        :param max_jobs: 처리할 최대 작업 수
+        :return: 결과별 처리한 작업 수
+        """
+        self._job_results_dir = results_dir
+        worker = CrawlWorker(CrawlQueue(queue_path), self.crawl_job, results_dir,
+                             run_id=run_id, lease_seconds=lease_seconds)
+        try:
+            return worker.run(max_jobs=max_jobs)
+        finally:
+            if self._job_pool is not None:
+                self._job_pool.close()
+                self._job_pool = None
+            self.write_metrics()
+
+    def collect(self, queue_path: str = CRAWL_QUEUE_PATH, run_id: str = None) -> dict:
+        """
+        완료된 작업 결과를 합쳐 crawling() 과 같은 방식으로 저장하는 함수
+
+        :return: {"movies": [...]} 형태의 결과
+        """
+        crawl_queue = CrawlQueue(queue_path)
+        stats = crawl_queue.stats(run_id)
+        for job in crawl_queue.jobs(run_id, status='failed'):
+            print(f"Failed: {job['country']} ({job['country_code']}) page {job['page']}"
+                  f" after {job['attempts']} attempts: {job['last_error']}")
+        result = collect_results(crawl_queue, run_id)
+        print(f"run {run_id}: {stats}, {len(result['movies'])} movies")
+        self.save_result(result)
+        return result
+
+    def crawl_distributed(self, processes: int = 4, run_id: str = None, pages: int = 1,
+                          queue_path: str = CRAWL_QUEUE_PATH, results_dir: str = CRAWL_RESULTS_PATH) -> dict:
+        """
+        이 노드에서 작업을 넣고 processes 개의 워커 프로세스로 처리한 뒤 결과를 합치는 함수
+
+        다른 노드에서도 같은 큐에 대해 `python crawler.py work` 를 실행하면 함께 처리된다.
+
+        :return: {"movies": [...]} 형태의 결과
+        """
+        run_id = run_id or datetime.now().strftime('%Y%m%d')
+        added = self.enqueue_run(CrawlQueue(queue_path), run_id, pages=pages)
+        print(f"run {run_id}: {added} jobs enqueued")
+        run_workers(self.config(), processes, queue_path, results_dir, run_id)
+        return self.collect(queue_path, run_id)
+
+
+def run_worker(crawler_config: dict, queue_path: str, results_dir: str, run_id=None):
+    """워커 프로세스 진입점 (MovieCrawler 는 락을 가지고 있어 설정만 넘겨 새로 생성)"""
+    result = MovieCrawler(**crawler_config).work(queue_path, results_dir, run_id)
+    print(f"{multiprocessing.current_process().name}: {result}")
+
+
+def run_workers(crawler_config: dict, processes: int, queue_path: str, results_dir: str, run_id=None):
+    """
+    워커 프로세스 processes 개를 실행하고 큐가 빌 때까지 기다리는 함수
+
+    워커는 독립 프로세스이므로 하나가 (브라우저와 함께) 죽어도 나머지는 계속 진행하고,
+    죽은 워커의 작업은 lease 가 만료된 뒤 다른 워커가 가져간다.
+    """
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(crawler_config, queue_path, results_dir, run_id),
+                                name=f"crawl-worker-{index}")
+        for index in range(max(1, processes))
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IMDb movie crawler")
+    parser.add_argument('command', choices=(
+        'crawl', 'stream', 'enqueue', 'work', 'collect', 'status', 'retry', 'distributed'
+    ))
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--base-url', default=None,
+                        help="국가 코드({})와 페이지({page} 또는 {start})로 포맷되는 검색 URL")
+    parser.add_argument('--backend', choices=('selenium', 'http'), default='selenium')
+    parser.add_argument('--headless', action='store_true')
+    parser.add_argument('--workers', type=int, default=1, help="crawl: 드라이버 수 / work, distributed: 프로세스 수")
+    parser.add_argument('--queue', default=CRAWL_QUEUE_PATH)
+    parser.add_argument('--results-dir', default=CRAWL_RESULTS_PATH)
+    parser.add_argument('--run-id', default=None, help="기본값: 오늘 날짜 (YYYYMMDD)")
+    parser.add_argument('--pages', type=int, default=1)
+    parser.add_argument('--lease-seconds', type=float, default=120)
+    parser.add_argument('--output', default=None, help="stream: JSONL 출력 경로 (기본값: 결과 파일 옆 .jsonl)")
+    parser.add_argument('--no-resume', action='store_true')
+    args = parser.parse_args()
+
+    options = {"base_url": args.base_url} if args.base_url else {}
+    crawler = MovieCrawler(top_n=args.top_n, workers=args.workers, headless=args.headless, backend=args.backend,
+                           **options)
+    run_id = args.run_id or datetime.now().strftime('%Y%m%d')
+    if args.command == 'crawl':
+        crawler.crawling(resume=not args.no_resume)
+    elif args.command == 'stream':
+        output = args.output or os.path.splitext(crawler.save_at)[0] + '.jsonl'
+        crawler.stream_to_jsonl(output, resume=not args.no_resume)
+    elif args.command == 'enqueue':
+        print(f"run {run_id}: {crawler.enqueue_run(CrawlQueue(args.queue), run_id, pages=args.pages)} jobs enqueued")
+    elif args.command == 'work':
+        run_workers(crawler.config(), args.workers, args.queue, args.results_dir, args.run_id)
+    elif args.command == 'collect':
+        crawler.collect(args.queue, run_id)
+    elif args.command == 'status':
+        print(json.dumps(CrawlQueue(args.queue).stats(run_id)))
+    elif args.command == 'retry':
+        print(f"run {run_id}: {CrawlQueue(args.queue).retry_failed(run_id)} failed jobs re-queued")
+    else:
+        crawler.crawl_distributed(args.workers, run_id, args.pages, args.queue, args.results_dir)
+
 
-        return result
\ No newline at end of file
+if __name__ == '__main__':
+    main()
\ No newline at end of file
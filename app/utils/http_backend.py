@@ -0,0 +1,237 @@
+import asyncio
+import json
+import re
+from html.parser import HTMLParser
+
+import aiohttp
+
+NEXT_DATA_PATTERN = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+DEFAULT_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/120.0 Safari/537.36'
+    ),
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+class _ListItemParser(HTMLParser):
+    """
+    __NEXT_DATA__ 가 없는 페이지(로컬 fixture 등)를 위한 최소 HTML 파서
+
+    검색 결과의 각 항목은 data-testid 속성으로 구분된다고 가정한다.
+    """
+    FIELDS = {
+        'title-img': 'img',
+        'title': 'title',
+        'title-year': 'year',
+        'title-score': 'score',
+        'title-summary': 'summary',
+        'title-genre': 'genre',
+        'title-star': 'stars',
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.items = []
+        self._field = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        testid = attrs.get('data-testid')
+        if testid == 'title-item':
+            self.items.append({'genre': [], 'stars': []})
+            return
+        if not self.items or testid not in self.FIELDS:
+            return
+        field = self.FIELDS[testid]
+        if field == 'img':
+            self.items[-1]['img'] = attrs.get('src')
+        else:
+            self._field = field
+
+    def handle_endtag(self, tag):
+        self._field = None
+
+    def handle_data(self, data):
+        if self._field is None or not data.strip():
+            return
+        item = self.items[-1]
+        if self._field in ('genre', 'stars'):
+            item[self._field].append(data.strip())
+        else:
+            item[self._field] = item.get(self._field, '') + data.strip()
+
+
+class HttpBackend:
+    """
+    Selenium 없이 검색 결과 페이지를 HTTP로 가져와 파싱하는 크롤러 백엔드
+
+    모든 국가 요청은 하나의 aiohttp 세션(커넥션 풀)을 공유하며,
+    결과는 MovieCrawler.process_movie 와 같은 content 딕셔너리 형태로 반환된다.
+    base_url 에 {page} 또는 {start} 자리표시자가 있으면 top_n 개를 모을 때까지 다음 페이지를 요청한다.
+    """
+    def __init__(self, base_url: str, concurrency: int = 8, timeout: float = 30):
+        """
+        :param base_url: 국가 코드로 포맷되는 검색 페이지 URL
+            (예: '...?countries={}&page={page}' 또는 '...?countries={}&start={start}')
+        :param concurrency: 동시에 열어 둘 최대 커넥션 수
+        :param timeout: 요청당 타임아웃(초)
+        """
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.paginated = '{page}' in base_url or '{start}' in base_url
+
+    def session(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=DEFAULT_HEADERS)
+
+    def crawl(self, country_code_dict: dict, top_n: int) -> dict:
+        """
+        동기 코드에서 호출하기 위한 진입점
+
+        :return: {국가 코드: content 리스트} 딕셔너리
+        """
+        return asyncio.run(self.crawl_async(country_code_dict, top_n))
+
+    async def crawl_async(self, country_code_dict: dict, top_n: int) -> dict:
+        async with self.session() as session:
+            results = await asyncio.gather(
+                *(self.collect_country(session, country_code, country, top_n)
+                  for country_code, country in country_code_dict.items()),
+                return_exceptions=True
+            )
+        for (country_code, country), contents in zip(country_code_dict.items(), results):
+            if isinstance(contents, Exception):
+                print(f"HTTP error for country {country} ({country_code}): {contents}")
+        return {
+            country_code: [] if isinstance(contents, Exception) else contents
+            for country_code, contents in zip(country_code_dict, results)
+        }
+
+    async def collect_country(self, session, country_code: str, country: str, top_n: int) -> list:
+        return [content async for page in self.iter_pages(session, country_code, country, top_n) for content in page]
+
+    def crawl_pages(self, country_code_dict: dict, top_n: int, on_page):
+        """
+        페이지를 받을 때마다 on_page(국가 코드, content 리스트) 를 호출하는 동기 진입점
+
+        결과를 모아 두지 않으므로 top_n 이 커도 메모리 사용량은 동시에 처리 중인 페이지 수에만 비례한다.
+        on_page 는 이벤트 루프 밖의 스레드에서 호출되므로 블로킹(쓰기, 큐 대기)해도 되며,
+        on_page 에서 발생한 예외는 크롤링을 중단시킨다 (국가별 HTTP 오류는 출력 후 해당 국가만 중단).
+        """
+        asyncio.run(self.crawl_pages_async(country_code_dict, top_n, on_page))
+
+    async def crawl_pages_async(self, country_code_dict: dict, top_n: int, on_page):
+        async def crawl_country(session, country_code, country):
+            pages = self.iter_pages(session, country_code, country, top_n)
+            while True:
+                try:
+                    contents = await anext(pages)
+                except StopAsyncIteration:
+                    return
+                except Exception as e:
+                    print(f"HTTP error for country {country} ({country_code}): {e}")
+                    return
+                await asyncio.to_thread(on_page, country_code, contents)
+
+        async with self.session() as session:
+            await asyncio.gather(*(
+                crawl_country(session, country_code, country) for country_code, country in country_code_dict.items()
+            ))
+
+    async def iter_pages(self, session, country_code: str, country: str, top_n: int):
+        """
+        한 국가의 검색 결과를 페이지 단위 content 리스트로 내보내는 async 제너레이터
+
+        rank 는 페이지를 넘어 이어지며, 빈 페이지/없는 페이지(404)를 만나거나
+        서버가 페이지 인자를 무시해 같은 페이지를 다시 주면 종료한다.
+        """
+        collected, page, previous = 0, 1, None
+        while collected < top_n:
+            html = await self.fetch(session, country_code, page=page, start=collected + 1)
+            if html is None or html == previous:
+                return
+            contents = [
+                dict(content, rank=collected + content['rank'], country=country)
+                for content in self.parse(html, top_n - collected)
+            ]
+            if not contents:
+                return
+            yield contents
+            collected += len(contents)
+            if not self.paginated:
+                return
+            page, previous = page + 1, html
+
+    async def fetch(self, session, country_code: str, page: int = 1, start: int = 1):
+        """
+        :return: 페이지 HTML, 두 번째 이후 페이지가 없으면(404) None
+        """
+        url = self.base_url.format(country_code, page=page, start=start)
+        if url.startswith('file://'):
+            try:
+                with open(url[len('file://'):], 'r', encoding='utf-8') as f:
+                    return f.read()
+            except FileNotFoundError:
+                if page > 1:
+                    return None
+                raise
+        async with session.get(url) as response:
+            if response.status == 404 and page > 1:
+                return None
+            response.raise_for_status()
+            return await response.text()
+
+    def parse(self, html: str, top_n: int) -> list:
+        """
+        검색 결과 페이지에서 영화 정보를 추출하는 함수
+
+        임베디드 JSON(__NEXT_DATA__)을 우선 사용하고, 없으면 HTML을 직접 파싱한다.
+
+        :param html: 검색 결과 페이지 HTML
+        :param top_n: 추출할 영화의 수
+        :return: rank 가 포함된 content 딕셔너리 리스트
+        """
+        match = NEXT_DATA_PATTERN.search(html)
+        if match:
+            items = self.parse_next_data(json.loads(match.group(1)))
+        else:
+            parser = _ListItemParser()
+            parser.feed(html)
+            items = parser.items
+        return [dict(item, rank=rank) for rank, item in enumerate(items[:top_n], start=1)]
+
+    def parse_next_data(self, data: dict) -> list:
+        search_results = data.get('props', {}).get('pageProps', {}).get('searchResults', {})
+        list_items = search_results.get('titleResults', {}).get('titleListItems', [])
+        return [self.parse_list_item(item) for item in list_items]
+
+    def parse_list_item(self, item: dict) -> dict:
+        release_year = item.get('releaseYear') or {}
+        year = str(release_year.get('year') or '')
+        if release_year.get('endYear'):
+            year = f"{year}–{release_year['endYear']}"
+        rating = (item.get('ratingSummary') or {}).get('aggregateRating')
+        title = item.get('titleText')
+        if isinstance(title, dict):
+            title = title.get('text')
+        plot = item.get('plot')
+        if isinstance(plot, dict):
+            plot = (plot.get('plotText') or {}).get('plainText')
+        stars = []
+        for credit in item.get('principalCredits') or []:
+            stars.extend(c.get('name', {}).get('nameText', {}).get('text') for c in credit.get('credits', []))
+        return {
+            'img': (item.get('primaryImage') or {}).get('url'),
+            'title': title,
+            'year': year,
+            'score': str(rating) if rating is not None else None,
+            'summary': plot,
+            'genre': [g if isinstance(g, str) else g.get('genre', {}).get('text') for g in item.get('genres') or []],
+            'stars': [s for s in stars if s],
+        }
@@ -0,0 +1,32 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# 현재 요청(컨텍스트)에서 실행된 SQL 문 수. None이면 집계하지 않음
+_statement_count: ContextVar = ContextVar('statement_count', default=None)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@contextmanager
+def count_statements():
+    '''
+    블록 안에서 실행된 SQL 문 수를 세는 컨텍스트 매니저 (동기/비동기 엔진 모두 집계)
+
+    with count_statements() as counter:
+        ...
+    counter[0]  # 실행된 문장 수
+    '''
+    counter = [0]
+    token = _statement_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _statement_count.reset(token)
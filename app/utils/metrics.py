@@ -0,0 +1,184 @@
+'''
+Prometheus 텍스트 형식으로 노출하는 프로세스 내 메트릭 레지스트리와 단계별 타이머
+
+외부 의존성 없이 카운터/게이지/히스토그램만 지원한다.
+크롤러처럼 서버와 다른 프로세스에서 실행되는 배치 작업은 write_textfile() 로 METRICS_TEXTFILE_DIR 에
+결과를 남기고, 서버의 /metrics 가 이를 함께 노출한다 (node_exporter textfile collector 방식).
+'''
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Final
+
+METRICS_TEXTFILE_DIR: Final = os.getenv('METRICS_TEXTFILE_DIR', 'app/data/metrics/')
+DEFAULT_BUCKETS: Final = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+stage_logger = logging.getLogger('app.metrics.stage')
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}"]
+
+
+class Counter(_Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_value(self, key, value) -> list:
+        bucket_counts, total, count = value
+        lines = []
+        for bound, bucket_count in zip(list(self.buckets) + ['+Inf'], bucket_counts + [count]):
+            labels = _format_labels(self.labelnames, key, 'le="%s"' % bound)
+            lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        # 같은 이름은 하나의 메트릭으로 공유 (모듈을 여러 번 import 해도 중복 등록되지 않음)
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+REGISTRY = Registry()
+STAGE_DURATION = REGISTRY.histogram(
+    'stage_duration_seconds', 'Duration of pipeline stages (crawl, ingest, render, ...)', ('stage',)
+)
+RENDER_CHART_SECONDS = REGISTRY.histogram(
+    'render_chart_seconds', 'Dashboard render time per chart/section', ('chart',)
+)
+
+
+@contextmanager
+def stage_timer(stage: str, **fields):
+    '''
+    단계 소요 시간을 히스토그램에 기록하고 구조화된(JSON) 로그 한 줄을 남기는 컨텍스트 매니저
+
+    with stage_timer('ingest', path=json_path) as record:
+        ...
+        record['rows'] = count  # 로그에 함께 남길 값
+    '''
+    record = dict(fields)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, stage=stage)
+        stage_logger.info(json.dumps(
+            {"event": "stage", "stage": stage, "duration_ms": round(elapsed * 1000, 2), **record},
+            ensure_ascii=False, default=str
+        ))
+
+
+def write_textfile(name: str, registry: Registry = REGISTRY, directory: str = METRICS_TEXTFILE_DIR):
+    '''
+    배치 프로세스의 메트릭을 {directory}/{name}.prom 으로 저장 (임시 파일 후 교체)
+    '''
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.prom")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def render_all(registry: Registry = REGISTRY, directory: str = METRICS_TEXTFILE_DIR) -> str:
+    '''
+    현재 프로세스의 메트릭 + 배치 작업이 남긴 textfile 메트릭
+    '''
+    parts = [registry.render()]
+    for path in sorted(glob.glob(os.path.join(directory, '*.prom'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            parts.append(f"# source: {os.path.basename(path)}\n{f.read()}")
+    return ''.join(parts)
@@ -0,0 +1,177 @@
+'''
+크롤링 이후 실행하는 포스터 에셋 단계
+
+포스터를 한 번만 내려받아 원본 내용 해시로 중복을 제거하고, 영화 카드 크기(150x200)의
+WebP 썸네일로 변환하여 로컬 저장소에 보관한다. 영화 카드는 원격 CDN 대신 /posters/ 경로를 참조한다.
+
+사용법: python -m app.utils.posters [--json app/data/crawl/raw/movies_data_country.json] [--concurrency 16]
+'''
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+from app.utils.constant import (CRAWL_RESULT_PATH, POSTER_BASE_URL, POSTER_FORMAT, POSTER_QUALITY, POSTER_SIZE,
+                                POSTER_STORE_PATH)
+
+MANIFEST_FILENAME = 'manifest.json'
+JSON_PATH = CRAWL_RESULT_PATH
+
+
+class PosterStore:
+    '''
+    내용 주소 기반 포스터 썸네일 저장소
+
+    manifest.json 에 {원본 URL: 썸네일 파일 이름} 을 기록하며,
+    같은 이미지를 가리키는 여러 URL 은 같은 파일을 공유한다.
+    '''
+    def __init__(self, store_path: str = POSTER_STORE_PATH):
+        self.store_path = store_path
+        self.manifest_path = os.path.join(store_path, MANIFEST_FILENAME)
+        self._manifest = {}
+        self._manifest_mtime = None
+        self._lock = threading.Lock()
+        self._claimed = set()
+
+    def version(self):
+        '''
+        manifest 수정 시각 (대시보드 캐시 키에 포함하여 썸네일이 추가되면 다시 렌더링)
+        '''
+        return os.path.getmtime(self.manifest_path) if os.path.exists(self.manifest_path) else None
+
+    def manifest(self) -> dict:
+        # 다른 프로세스(에셋 단계)가 갱신했을 수 있으므로 수정 시각이 바뀌었을 때만 다시 읽음
+        mtime = self.version()
+        if mtime != self._manifest_mtime:
+            self._manifest = {}
+            if mtime is not None:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self._manifest = json.load(f)
+            self._manifest_mtime = mtime
+        return self._manifest
+
+    def src(self, url: str) -> str:
+        '''
+        로컬 썸네일이 있으면 그 URL, 없으면 원본 URL
+        '''
+        filename = self.manifest().get(url) if url else None
+        return f"{POSTER_BASE_URL}{filename}" if filename else url
+
+    def save(self, data: bytes):
+        '''
+        원본 이미지를 썸네일로 변환하여 저장
+
+        :return: (파일 이름, 새로 저장했는지 여부)
+        '''
+        filename = f"{hashlib.sha256(data).hexdigest()[:32]}.{POSTER_FORMAT}"
+        filepath = os.path.join(self.store_path, filename)
+        # 같은 내용의 포스터가 동시에 처리되는 경우 한 번만 저장
+        with self._lock:
+            if filename in self._claimed or os.path.exists(filepath):
+                return filename, False
+            self._claimed.add(filename)
+        try:
+            with Image.open(BytesIO(data)) as image:
+                # JPEG 는 디코딩 단계에서 바로 축소 (썸네일 크기의 2배 이상 유지)
+                image.draft('RGB', (POSTER_SIZE[0] * 2, POSTER_SIZE[1] * 2))
+                # object-fit: cover 와 같이 비율을 유지한 채 가운데를 잘라 맞춤
+                thumbnail = ImageOps.fit(image.convert('RGB'), POSTER_SIZE, Image.LANCZOS)
+            buffer = BytesIO()
+            thumbnail.save(buffer, format=POSTER_FORMAT, quality=POSTER_QUALITY, method=6)
+            os.makedirs(self.store_path, exist_ok=True)
+            tmp_path = f"{filepath}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(buffer.getvalue())
+            os.replace(tmp_path, filepath)
+        except Exception:
+            with self._lock:
+                self._claimed.discard(filename)
+            raise
+        return filename, True
+
+    def write_manifest(self, entries: dict):
+        manifest = {**self.manifest(), **entries}
+        os.makedirs(self.store_path, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    async def sync(self, urls, concurrency: int = 16, timeout: float = 30) -> dict:
+        '''
+        manifest 에 없는 포스터만 내려받아 저장
+
+        :return: {"downloaded", "stored", "deduplicated", "skipped", "failed", "bytes_in", "bytes_out"}
+        '''
+        import aiohttp
+        from app.utils.http_backend import DEFAULT_HEADERS
+
+        manifest = self.manifest()
+        pending = sorted({url for url in urls if url and url not in manifest})
+        report = {
+            "downloaded": 0, "stored": 0, "deduplicated": 0, "failed": 0,
+            "skipped": len({url for url in urls if url}) - len(pending), "bytes_in": 0, "bytes_out": 0
+        }
+        entries = {}
+        semaphore = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def fetch(session, url):
+            async with semaphore:
+                try:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        data = await response.read()
+                    # 디코딩/리사이즈는 CPU 작업이므로 이벤트 루프 밖에서 실행
+                    filename, stored = await loop.run_in_executor(None, self.save, data)
+                except Exception:
+                    report["failed"] += 1
+                    return
+            entries[url] = filename
+            report["downloaded"] += 1
+            report["bytes_in"] += len(data)
+            if stored:
+                report["stored"] += 1
+                report["bytes_out"] += os.path.getsize(os.path.join(self.store_path, filename))
+            else:
+                report["deduplicated"] += 1
+
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=timeout), headers=DEFAULT_HEADERS
+        ) as session:
+            await asyncio.gather(*(fetch(session, url) for url in pending))
+        if entries:
+            self.write_manifest(entries)
+        return report
+
+
+def poster_urls(json_path: str = JSON_PATH) -> list:
+    from app.Service.reader import iter_movie_records
+    return [record["movie"].get("image_url") for record in iter_movie_records(json_path)]
+
+
+poster_store = PosterStore()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download and thumbnail movie posters")
+    parser.add_argument('--json', default=JSON_PATH)
+    parser.add_argument('--store', default=POSTER_STORE_PATH)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = asyncio.run(PosterStore(args.store).sync(poster_urls(args.json), concurrency=args.concurrency))
+    report["elapsed"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(report))
+
+
+if __name__ == '__main__':
+    main()
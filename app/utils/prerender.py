@@ -0,0 +1,154 @@
+'''
+크롤링 + DB 적재 이후 실행하는 대시보드 일괄 렌더링 단계
+
+사용법: python -m app.utils.prerender [--workers 4] [--output-dir app/data/dashboards/] [--compare-serial]
+                                     [--changed-only [--source app/data/crawl/raw/movies_data_country.json]]
+'''
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Final
+
+from app.Service.reader import plan_incremental
+from app.utils.constant import CRAWL_RESULT_PATH
+
+PRERENDER_OUTPUT_PATH: Final = 'app/data/dashboards/'
+COUNTRY_CODE_PATH: Final = os.path.join('app', 'data', 'crawl', 'raw', 'country_code.json')
+SOURCE_PATH: Final = CRAWL_RESULT_PATH
+# 마지막으로 렌더링한 크롤링 결과 파일의 해시 (--changed-only 가 바뀐 국가를 고를 때 사용)
+STATE_FILENAME: Final = '.prerender.json'
+
+
+def dashboard_path(country_name: str, output_dir: str = PRERENDER_OUTPUT_PATH) -> str:
+    return os.path.join(output_dir, f"{country_name}_combined_visualization.html")
+
+
+def write_atomic(content: str, filepath: str):
+    '''
+    임시 파일에 쓴 뒤 교체하여, 서빙 중인 파일이 절반만 쓰인 상태로 보이지 않게 한다.
+    '''
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, filepath)
+
+
+def render_country(country_name: str, output_dir: str = PRERENDER_OUTPUT_PATH):
+    '''
+    단일 국가 대시보드를 렌더링하여 파일로 저장 (워커 프로세스에서 실행)
+
+    :return: (국가 이름, 렌더링 소요 시간(초), 오류 메시지 또는 None)
+    '''
+    # 엔진/커넥션은 프로세스 간에 공유할 수 없으므로 워커 프로세스마다 하나의 엔진을 만들어 재사용
+    from app.database import EngineConn
+    from app.utils.visualizer import Visualizer
+
+    start = time.perf_counter()
+    db = EngineConn().get_session()
+    try:
+        html = Visualizer(db=db, country_name=country_name).render_combined_html()
+        write_atomic(html, dashboard_path(country_name, output_dir))
+        return country_name, time.perf_counter() - start, None
+    except Exception as e:
+        return country_name, time.perf_counter() - start, str(e)
+    finally:
+        db.close()
+
+
+def prerender_all(country_names: list, output_dir: str = PRERENDER_OUTPUT_PATH, workers: int = None) -> dict:
+    '''
+    모든 국가의 대시보드를 프로세스 풀에서 병렬 렌더링
+
+    matplotlib/wordcloud 렌더링은 CPU 바운드이고 GIL 을 잡고 있어 스레드 대신 프로세스를 사용한다.
+
+    :param workers: 프로세스 수 (None이면 CPU 코어 수, 1이면 직렬 실행)
+    :return: {"countries": {국가: 소요 시간}, "errors": {국가: 오류}, "wall_clock": 전체 소요 시간}
+    '''
+    start = time.perf_counter()
+    if workers == 1:
+        results = [render_country(name, output_dir) for name in country_names]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(render_country, country_names, [output_dir] * len(country_names)))
+    report = {"countries": {}, "errors": {}, "wall_clock": time.perf_counter() - start}
+    for country_name, elapsed, error in results:
+        report["countries"][country_name] = elapsed
+        if error:
+            report["errors"][country_name] = error
+    return report
+
+
+def plan_changed(country_names: list, source_path: str, output_dir: str = PRERENDER_OUTPUT_PATH) -> dict:
+    '''
+    크롤러 변경 목록으로 다시 렌더링할 국가를 고름. 마지막 렌더링 이후의 변경 목록이 아니거나
+    바뀌지 않은 국가의 렌더링 결과가 없으면 전체를 렌더링한다.
+
+    :return: {"countries": 렌더링할 국가 리스트, "removed": 결과에서 빠진 국가 집합, "sha256": 결과 파일 해시}
+    '''
+    state_path = os.path.join(output_dir, STATE_FILENAME)
+    last_sha256 = None
+    if os.path.exists(state_path):
+        with open(state_path, 'r', encoding='utf-8') as f:
+            last_sha256 = json.load(f).get('sha256')
+    plan = plan_incremental(source_path, last_sha256)
+    countries = country_names
+    unchanged_rendered = all(os.path.exists(dashboard_path(name, output_dir)) for name in plan["unchanged"])
+    if plan["countries"] is not None and unchanged_rendered:
+        countries = [name for name in country_names if name in plan["countries"]]
+    return {"countries": countries, "removed": plan["removed"], "sha256": plan["sha256"]}
+
+
+def remove_dashboards(country_names, output_dir: str = PRERENDER_OUTPUT_PATH):
+    '''크롤링 결과에서 빠진 국가의 사전 렌더링 파일 삭제 (요청 시 DB 에서 다시 렌더링됨)'''
+    for country_name in country_names:
+        path = dashboard_path(country_name, output_dir)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def save_state(sha256: str, output_dir: str = PRERENDER_OUTPUT_PATH):
+    write_atomic(json.dumps({"sha256": sha256}), os.path.join(output_dir, STATE_FILENAME))
+
+
+def print_report(label: str, report: dict):
+    for country_name, elapsed in report["countries"].items():
+        status = f"FAILED ({report['errors'][country_name]})" if country_name in report["errors"] else "ok"
+        print(f"[{label}] {country_name}: {elapsed:.2f}s {status}")
+    print(f"[{label}] wall-clock: {report['wall_clock']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render country dashboards")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output-dir', default=PRERENDER_OUTPUT_PATH)
+    parser.add_argument('--country-codes', default=COUNTRY_CODE_PATH)
+    parser.add_argument('--compare-serial', action='store_true', help="serial 렌더링 시간도 함께 측정")
+    parser.add_argument('--changed-only', action='store_true', help="크롤러 변경 목록의 바뀐 국가만 렌더링")
+    parser.add_argument('--source', default=SOURCE_PATH, help="--changed-only 가 비교할 크롤링 결과 파일")
+    args = parser.parse_args()
+
+    with open(args.country_codes, 'r', encoding='utf-8') as f:
+        country_names = list(json.load(f).values())
+
+    plan = None
+    if args.changed_only:
+        plan = plan_changed(country_names, args.source, args.output_dir)
+        remove_dashboards(plan["removed"], args.output_dir)
+        print(f"rendering {len(plan['countries'])}/{len(country_names)} countries, removed {len(plan['removed'])}")
+        country_names = plan["countries"]
+
+    report = prerender_all(country_names, args.output_dir, workers=args.workers)
+    print_report('parallel', report)
+    if plan and not report["errors"]:
+        save_state(plan["sha256"], args.output_dir)
+    if args.compare_serial:
+        serial = prerender_all(country_names, args.output_dir, workers=1)
+        print_report('serial', serial)
+        print(f"speedup: {serial['wall_clock'] / report['wall_clock']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+'''
+샘플링된 요청에 대한 선택적 프로파일링
+
+PROFILE_SAMPLE_RATE(0~1, 기본 0=비활성)의 확률로, 또는 PROFILE_ALLOW_HEADER 가 켜져 있을 때
+"X-Profile: 1" 헤더가 붙은 요청에 대해 PROFILE_DIR 에 두 가지 결과를 남긴다.
+- {이름}.prof: 이벤트 루프 스레드의 cProfile 결과 (python -m pstats, snakeviz 등으로 확인)
+- {이름}.folded: 모든 스레드의 스택 샘플 (flamegraph.pl, speedscope 로 플레임그래프 생성)
+  동기 엔드포인트는 스레드풀에서 실행되어 cProfile 에 잡히지 않으므로 스택 샘플로 확인한다.
+'''
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Final
+
+PROFILE_SAMPLE_RATE: Final = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_ALLOW_HEADER: Final = os.getenv('PROFILE_ALLOW_HEADER', '').lower() in ('1', 'true', 'yes')
+PROFILE_DIR: Final = os.getenv('PROFILE_DIR', 'app/data/profiles/')
+STACK_SAMPLE_INTERVAL: Final = 0.005
+# cProfile 은 스레드당 하나만 활성화할 수 있으므로 동시에 하나의 요청만 프로파일링
+profile_slot = threading.Lock()
+
+
+def should_profile(headers) -> bool:
+    if PROFILE_ALLOW_HEADER and headers.get('x-profile') == '1':
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+class StackSampler:
+    '''
+    일정 간격으로 모든 스레드의 호출 스택을 수집하여 folded 형식으로 집계
+    '''
+    def __init__(self, interval: float = STACK_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self._thread.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RequestProfiler:
+    '''
+    with RequestProfiler('GET /movies/{country_name}/'):
+        ...
+    '''
+    def __init__(self, label: str, directory: str = PROFILE_DIR):
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label).strip('_')
+        self.basename = os.path.join(directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{safe_label}")
+        self.directory = directory
+        self.profile = cProfile.Profile()
+        self.sampler = StackSampler()
+
+    def __enter__(self):
+        self.sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.disable()
+        self.sampler.stop()
+        os.makedirs(self.directory, exist_ok=True)
+        self.profile.dump_stats(f"{self.basename}.prof")
+        self.sampler.write(f"{self.basename}.folded")
@@ -0,0 +1,80 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from app.utils.metrics import RENDER_CHART_SECONDS, STAGE_DURATION
+
+
+def render_dashboard(country_name: str, render_params: dict):
+    '''
+    워커 프로세스에서 대시보드 HTML 을 렌더링
+
+    :param render_params: topk_count, image_profile, image_base_url
+    :return: (HTML, {차트 이름: 소요 시간(초)}) - 워커의 메트릭은 서버에 보이지 않으므로 시간을 함께 반환
+    '''
+    # 엔진/커넥션은 프로세스 간에 공유할 수 없으므로 워커 프로세스마다 하나의 엔진을 만들어 재사용
+    from app.database import EngineConn
+    from app.utils.visualizer import Visualizer
+
+    db = EngineConn().get_session()
+    try:
+        visualizer = Visualizer(
+            db=db,
+            country_name=country_name,
+            image_profile=render_params.get("image_profile", "default"),
+            image_base_url=render_params.get("image_base_url")
+        )
+        html = visualizer.render_combined_html(topk_count=render_params.get("topk_count", 5))
+        return html, visualizer.render_timings
+    finally:
+        db.close()
+
+
+class RenderExecutor:
+    '''
+    동시 렌더링 수를 제한하고 같은 키의 동시 요청을 하나의 렌더링으로 합치는 실행기
+
+    렌더링은 CPU 바운드이므로 프로세스 풀에서 실행되어 이벤트 루프를 막지 않는다.
+    '''
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 1) - 1))
+        self._executor = None
+        self._inflight = {}
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def render(self, key: str, country_name: str, render_params: dict) -> str:
+        '''
+        :param key: 요청 합치기에 사용할 키 (대시보드 ETag)
+        :return: 렌더링된 HTML
+        '''
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), render_dashboard, country_name, render_params)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            future.add_done_callback(self._record_timings)
+        # shield: 한 요청이 취소되어도 같은 렌더링을 기다리는 다른 요청에는 영향 없음
+        html, _ = await asyncio.shield(future)
+        return html
+
+    @staticmethod
+    def _record_timings(future):
+        # 합쳐진 요청이 여럿이어도 렌더링 한 번에 대해 한 번만 기록
+        if future.cancelled() or future.exception() is not None:
+            return
+        _, timings = future.result()
+        for chart, elapsed in timings.items():
+            RENDER_CHART_SECONDS.observe(elapsed, chart=chart)
+        STAGE_DURATION.observe(sum(timings.values()), stage='render')
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render_executor = RenderExecutor()
@@ -1,75 +1,139 @@
 # 표준 라이브러리
 import base64
+import copy
+import hashlib
 import os
-import re
+import time
 from io import BytesIO
 from collections import Counter
+from functools import lru_cache
 from statistics import mean
 from typing import Final
 
 # 외부 라이브러리
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from PIL import Image
 from wordcloud import WordCloud
 from jinja2 import Environment, FileSystemLoader
 from sqlalchemy.orm import Session
 
 # 사용자 정의 모듈 (가정: 직접 정의한 함수나 데이터)
-from app.Service.movie import get_movies_by_country_name
+from app.Service.aggregates import get_country_aggregates, tokenize_summary
+from app.Service.movie import get_top_movies_by_country_name
 from app.utils.constant import *
+from app.utils.metrics import RENDER_CHART_SECONDS
+from app.utils.posters import poster_store
+
+# 프로세스 단위 렌더링 리소스 캐시
+@lru_cache(maxsize=4)
+def load_mask_array(mask_path: str, scale: int = 1):
+    '''
+    wordcloud mask 를 한 번만 디코딩하여 읽기 전용 배열로 재사용
+
+    :param scale: 배치 계산용으로 mask 를 1/scale 로 축소 (출력 크기는 WordCloud(scale=...)로 복원)
+    '''
+    if not mask_path or not os.path.exists(mask_path):
+        return None
+    image = Image.open(mask_path).convert('L')
+    if scale > 1:
+        image = image.resize((image.width // scale, image.height // scale), Image.NEAREST)
+    mask_array = np.array(image)
+    mask_array.setflags(write=False)
+    return mask_array
+
+@lru_cache(maxsize=8)
+def get_wordcloud_template(mask_path: str, colormap: str) -> WordCloud:
+    '''
+    설정이 끝난 WordCloud 템플릿. generate 는 인스턴스 상태를 바꾸므로 사용할 때는 복사본을 쓴다.
+    '''
+    return WordCloud(
+        background_color="white",
+        mask=load_mask_array(mask_path, WORDCLOUD_SCALE),
+        scale=WORDCLOUD_SCALE,
+        contour_color="black",
+        contour_width=2,
+        colormap=colormap,
+        max_words=100,
+        prefer_horizontal=True,
+        stopwords=STOPWORDS
+    )
+
+@lru_cache(maxsize=4)
+def get_template(template_path: str, template_name: str = "combined_visualization.html"):
+    return Environment(loader=FileSystemLoader(template_path)).get_template(template_name)
+
+def new_figure(figsize) -> Figure:
+    '''
+    pyplot 전역 상태를 거치지 않는 Agg 캔버스 figure (스레드 간 공유 상태 없음)
+    '''
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
 
 class Visualizer:
-    matplotlib.use('Agg')
 
-    def __init__(self, country_name: str, db: Session, template_path: str = "app/templates/"):
+    def __init__(self, country_name: str, db: Session, template_path: str = "app/templates/",
+                 image_profile: str = "default", image_base_url: str = None, rows: list = None):
+        '''
+        :param image_profile: IMAGE_PROFILES 의 출력 프로필 이름
+        :param image_base_url: 지정하면 이미지를 base64 인라인 대신 IMAGE_STORE_PATH 에 저장하고 이 URL로 참조
+        :param rows: (movie, rank) 리스트를 직접 넘기면 DB 조회를 생략 (벤치마크/오프라인 렌더링용)
+        '''
         self.country_name = country_name
-        self.movies = get_movies_by_country_name(db, self.country_name)  # 이미 SQLAlchemy 모델 객체 리스트
+        self.image_profile = IMAGE_PROFILES[image_profile]
+        self.image_base_url = image_base_url
+        # (Movie, 최신 순위) 리스트. 장르/배우까지 고정된 수의 쿼리로 미리 로드됨
+        # 단어 빈도/장르 수/평점 통계는 적재 시점에 계산된 국가별 집계를 사용
+        # (모집단은 TOP-K 와 같은 최신 랭킹 스냅샷의 영화, aggregates.aggregate_movie_ids 참고)
+        self.aggregates = None
+        if rows is None:
+            rows = get_top_movies_by_country_name(db, self.country_name, limit=5)
+            self.aggregates = get_country_aggregates(db, self.country_name)
+        self.movies = [movie for movie, _ in rows]
+        self.ranks = {movie.id: rank for movie, rank in rows}
+        if self.aggregates is None:
+            # rows 를 직접 넘긴 경우(벤치마크/오프라인 렌더링)에는 넘겨받은 영화가 모집단
+            self.aggregates = {
+                'word_frequencies': Counter(
+                    word for movie in self.movies for word in tokenize_summary(movie.summary)
+                ),
+                'genre_counts': Counter(genre.name for movie in self.movies for genre in movie.genres),
+                'average_score': mean([float(movie.score) for movie in self.movies]) if self.movies else 0.0,
+            }
         self.mask_path = MASK_PATH
-        self.env = Environment(loader=FileSystemLoader(template_path))
-        self.template = self.env.get_template("combined_visualization.html")
+        self.template = get_template(template_path)
+        self.render_timings = {}  # {차트 이름: 마지막 렌더링 소요 시간(초)}
 
     def visualize_TOPK(self, k: int = 5):
         filtered_movies = [
             movie for movie in self.movies
-            if any(ranking.rank <= k for ranking in movie.rankings)  # 'rankings'는 관계 설정을 의미
+            if self.ranks[movie.id] is not None and self.ranks[movie.id] <= k  # 최신 스냅샷의 순위
         ]
         movie_cards = ''.join([self.create_movie_card(movie) for movie in filtered_movies])
         return movie_cards
 
     def visualize_wordcloud(self, colormap: str = "magma"):
-        text = " ".join(re.sub(r"[^\w\s]", "", movie.summary) for movie in self.movies)  # movie.summary로 접근
-        mask_array = None
-        if self.mask_path and os.path.exists(self.mask_path):
-            mask_array = np.array(Image.open(self.mask_path).convert('L'))
-
-        wordcloud = WordCloud(
-            background_color="white",
-            mask=mask_array,
-            contour_color="black",
-            contour_width=2,
-            colormap=colormap,
-            max_words=100,
-            prefer_horizontal=True,
-            stopwords=STOPWORDS
-        ).generate(text)
-
-        fig, ax = plt.subplots(figsize=(12, 12))
+        wordcloud = copy.copy(get_wordcloud_template(self.mask_path, colormap)).generate_from_frequencies(
+            self.aggregates['word_frequencies']
+        )
+
+        fig = new_figure(figsize=(12, 12))
+        ax = fig.subplots()
         ax.imshow(wordcloud, interpolation="bilinear")
         ax.axis("off")
-        img_base64 = self.convert_to_base64(fig)
-        return img_base64
+        return self.figure_to_src(fig, **self.image_profile['wordcloud'])
 
     def visualize_piechart(self, k: int = 8):
-        all_genres = [genre for movie in self.movies for genre in movie.genres]  # movie.genres로 접근
-        genre_counts = Counter(all_genres)
-        top_genres = dict(genre_counts.most_common(k))
+        top_genres = dict(Counter(self.aggregates['genre_counts']).most_common(k))
 
         labels = list(top_genres.keys())
         sizes = list(top_genres.values())
-        colors = plt.cm.Set3(np.linspace(0, 1, len(labels)))
-        fig, ax = plt.subplots(figsize=(12, 10))
+        colors = matplotlib.colormaps['Set3'](np.linspace(0, 1, len(labels)))
+        fig = new_figure(figsize=(12, 10))
+        ax = fig.subplots()
         ax.pie(
             sizes,
             labels=labels,
@@ -79,21 +143,33 @@ class Visualizer:
             textprops={'fontsize': 12, 'weight': 'bold'}
         )
         ax.set_title("Genre Distribution", fontsize=18, weight="bold")
-        img_base64 = self.convert_to_base64(fig)
-        return img_base64
+        return self.figure_to_src(fig, **self.image_profile['piechart'])
 
     def visualize_average_rating(self):
-        average_rating = round(mean([float(movie.score) for movie in self.movies]), 3)  # movie.score로 접근
+        average_rating = round(self.aggregates['average_score'], 3)
         stars_svg = self.display_svg_stars(average_rating)
         return average_rating, stars_svg
 
-    def create_combined_html(self, topk_count=5) -> str:
-        topk_section = self.visualize_TOPK(k=topk_count)
-        wordcloud_image = self.visualize_wordcloud()
-        piechart_image = self.visualize_piechart()
-        average_rating, stars_svg = self.visualize_average_rating()
-
-        rendered_html = self.template.render(
+    def timed(self, chart: str, func, *args, **kwargs):
+        '''
+        차트(섹션) 하나의 렌더링 시간을 render_timings 와 메트릭에 기록
+        '''
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.render_timings[chart] = elapsed
+        RENDER_CHART_SECONDS.observe(elapsed, chart=chart)
+        return result
+
+    def render_combined_html(self, topk_count=5) -> str:
+        topk_section = self.timed('topk', self.visualize_TOPK, k=topk_count)
+        wordcloud_image = self.timed('wordcloud', self.visualize_wordcloud)
+        piechart_image = self.timed('piechart', self.visualize_piechart)
+        average_rating, stars_svg = self.timed('stars', self.visualize_average_rating)
+
+        rendered_html = self.timed(
+            'template',
+            self.template.render,
             country_name=self.country_name,
             movie_cards=topk_section,
             topk_count=topk_count,
@@ -102,7 +178,10 @@ class Visualizer:
             average_rating=average_rating,
             stars_svg=stars_svg
         )
+        return rendered_html
 
+    def create_combined_html(self, topk_count=5) -> str:
+        rendered_html = self.render_combined_html(topk_count=topk_count)
         output_file = os.path.join(TEMPLATE_OUTPUT_PATH, f"{self.country_name}_combined_visualization.html")
         self.save_html(rendered_html, filepath=output_file)
         return output_file
@@ -111,7 +190,7 @@ class Visualizer:
         stars_html = self.display_svg_stars(float(movie.score))  # movie.score로 접근
         return f"""
         <div style="display:inline-block; text-align:center; margin:10px; width:200px;">
-            <img src="{movie.image_url}" style="width:150px; height:200px; object-fit:cover; border:1px solid #ccc; border-radius:8px;">
+            <img src="{poster_store.src(movie.image_url)}" loading="lazy" style="width:150px; height:200px; object-fit:cover; border:1px solid #ccc; border-radius:8px;">
             <div style="margin-top:10px; font-weight:bold;">{movie.title}</div>
             <div style="font-size:12px; color:gray;">{movie.release_year}</div>
             <div style="margin-top:5px;">{stars_html}</div>
@@ -131,13 +210,32 @@ class Visualizer:
             file.write(content)
         print(f"HTML 파일이 '{filepath}'에 저장되었습니다.")
 
-    def convert_to_base64(self, fig=None, format="png", dpi=300, bbox_inches="tight"):
-        if fig is None:
-            fig = plt.gcf()
+    def encode_figure(self, fig, format="png", dpi=300, quality=None, bbox_inches="tight") -> bytes:
         buffer = BytesIO()
-        plt.savefig(buffer, format=format, dpi=dpi, bbox_inches=bbox_inches)
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        plt.close(fig)
+        kwargs = {'pil_kwargs': {'quality': quality}} if quality is not None else {}
+        fig.savefig(buffer, format=format, dpi=dpi, bbox_inches=bbox_inches, **kwargs)
+        data = buffer.getvalue()
         buffer.close()
-        return image_base64
\ No newline at end of file
+        return data
+
+    def figure_to_src(self, fig, format="png", dpi=300, quality=None) -> str:
+        '''
+        figure 를 이미지 src 값으로 변환 (data URI 또는 캐시 가능한 별도 URL)
+        '''
+        data = self.encode_figure(fig, format=format, dpi=dpi, quality=quality)
+        if self.image_base_url is None:
+            return f"data:{IMAGE_MIME_TYPES[format]};base64,{base64.b64encode(data).decode('utf-8')}"
+        # 내용 해시로 파일 이름을 정하므로 같은 이미지는 한 번만 저장되고 URL 은 영구 캐시 가능
+        filename = f"{hashlib.sha256(data).hexdigest()[:32]}.{format}"
+        filepath = os.path.join(IMAGE_STORE_PATH, filename)
+        if not os.path.exists(filepath):
+            os.makedirs(IMAGE_STORE_PATH, exist_ok=True)
+            tmp_path = f"{filepath}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, filepath)
+        return f"{self.image_base_url}{filename}"
+
+    def convert_to_base64(self, fig, format="png", dpi=300, bbox_inches="tight"):
+        data = self.encode_figure(fig, format=format, dpi=dpi, bbox_inches=bbox_inches)
+        return base64.b64encode(data).decode('utf-8')
\ No newline at end of file
@@ -0,0 +1,135 @@
+'''
+깊은 크롤링(페이지네이션) 처리량(movies/minute)과 최대 RSS 벤치마크 (HTTP 백엔드, 로컬 fixture 페이지)
+
+사용법: python -m benchmarks.bench_crawl --countries 10 --top-n 2000 [--per-page 50] [--file]
+- collect:  crawl_countries 로 모든 결과를 메모리에 모은 뒤 JSON 저장 (기존 방식)
+- stream:   stream_to_jsonl 로 받는 대로 JSONL 기록
+- pipeline: stream 과 동시에 follow 모드 적재(SQLite) 실행, 크롤링 종료 후 적재가 끝나기까지의 지연 측정
+fixture 는 로컬 HTTP 서버로 제공하며 (--file 이면 file:// 로 직접 읽음) 각 측정은 별도 프로세스에서 실행된다.
+'''
+import argparse
+import functools
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from benchmarks.bench_posters import QuietHandler
+from benchmarks.synthetic import generate_dataset, write_paged_search_pages
+
+MODES = ('collect', 'stream', 'pipeline')
+
+
+def peak_rss_mb() -> float:
+    '''
+    이 프로세스의 최대 RSS (ru_maxrss 는 fork/exec 를 거쳐도 부모의 최대값이 남으므로 VmHWM 우선)
+    '''
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_crawler(config: dict):
+    # 크롤러는 app/utils 를 기준으로 한 스크립트 방식 import 를 사용
+    sys.path.insert(0, os.path.join('app', 'utils'))
+    from crawler import MovieCrawler
+    return MovieCrawler(backend='http', **config)
+
+
+def ingest_following(path: str, db_path: str, report: dict):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models.models import Base
+    from app.Service.movie import bulk_insert_movies_from_json
+
+    engine = create_engine(f'sqlite:///{db_path}')
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        report["ingested"] = bulk_insert_movies_from_json(db, json_path=path, follow=True)["count"]
+    report["ingest_finished"] = time.perf_counter()
+    engine.dispose()
+
+
+def measure(mode: str, config: dict, workdir: str) -> dict:
+    crawler = make_crawler(config)
+    output = os.path.join(workdir, f"{mode}.jsonl")
+    start = time.perf_counter()
+    report = {}
+    if mode == 'collect':
+        result = crawler.crawl_countries(crawler.load_country_codes(config["country_codes_filepath"]))
+        with open(os.path.join(workdir, 'collect.json'), 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        count = len(result["movies"])
+    else:
+        ingest = None
+        if mode == 'pipeline':
+            ingest = threading.Thread(target=ingest_following, args=(output, output + '.db', report))
+            ingest.start()
+        count = crawler.stream_to_jsonl(output, resume=False)
+        if ingest:
+            crawl_finished = time.perf_counter()
+            ingest.join()
+            report["ingest_lag_seconds"] = round(report["ingest_finished"] - crawl_finished, 3)
+            del report["ingest_finished"]
+    elapsed = time.perf_counter() - start
+    return {
+        "mode": mode, "movies": count, "seconds": round(elapsed, 3),
+        "movies_per_minute": round(count / (elapsed / 60)),
+        "peak_rss_mb": round(peak_rss_mb()),
+        **report,
+    }
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == '--measure':
+        print(json.dumps(measure(sys.argv[2], json.loads(sys.argv[3]), sys.argv[4])))
+        return
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--countries', type=int, default=10)
+    parser.add_argument('--top-n', type=int, default=2000)
+    parser.add_argument('--per-page', type=int, default=50)
+    parser.add_argument('--only', default=','.join(MODES))
+    parser.add_argument('--file', action='store_true', help="HTTP 서버 대신 file:// 로 fixture 읽기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        fixtures = os.path.join(workdir, 'fixtures')
+        data = generate_dataset(args.countries, args.top_n, 25, 5000)
+        country_codes = write_paged_search_pages(fixtures, data, per_page=args.per_page)
+        codes_path = os.path.join(workdir, 'country_code.json')
+        with open(codes_path, 'w', encoding='utf-8') as f:
+            json.dump(country_codes, f)
+        print(f"{len(country_codes)} countries x {args.top_n} movies, {len(os.listdir(fixtures))} pages")
+
+        server = None
+        if args.file:
+            base_url = f"file://{fixtures}/{{}}_{{page}}.html"
+        else:
+            server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=fixtures))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"http://127.0.0.1:{server.server_address[1]}/{{}}_{{page}}.html"
+        config = {"country_codes_filepath": codes_path, "top_n": args.top_n, "base_url": base_url}
+        try:
+            for mode in args.only.split(','):
+                completed = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_crawl', '--measure', mode, json.dumps(config), workdir],
+                    check=True, capture_output=True, text=True
+                )
+                print(completed.stdout.strip().splitlines()[-1])
+        finally:
+            if server:
+                server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+'''
+이미지 출력 프로필별 대시보드 렌더링 시간과 크기 벤치마크
+
+사용법: python -m benchmarks.bench_images [--country "South Korea"] [--repeat 3]
+'''
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+from app.utils.constant import CRAWL_RESULT_PATH, IMAGE_PROFILES
+from app.utils.visualizer import Visualizer
+
+JSON_PATH = CRAWL_RESULT_PATH
+
+
+def load_rows(country_name: str, json_path: str = JSON_PATH) -> list:
+    '''
+    크롤링 JSON 에서 (movie, rank) 리스트를 만들어 DB 없이 Visualizer 에 넘길 수 있게 함
+    '''
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = [r for r in json.load(f)['movies'] if r['country'] == country_name]
+    rows = []
+    for index, record in enumerate(records[:5]):
+        info = record['movie']
+        movie = SimpleNamespace(
+            id=index,
+            title=info['title'],
+            release_year=info['release_year'],
+            score=float(info['score'] or 0),
+            summary=info['summary'] or '',
+            image_url=info['image_url'],
+            genres=[SimpleNamespace(name=name) for name in info['genres']],
+            actors=[SimpleNamespace(name=name) for name in info['actors']],
+        )
+        rows.append((movie, record['rank']))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--country', default='South Korea')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = load_rows(args.country)
+    for profile in IMAGE_PROFILES:
+        visualizer = Visualizer(args.country, db=None, image_profile=profile, rows=rows)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            html = visualizer.render_combined_html()
+            timings.append(time.perf_counter() - start)
+        print(f"{profile:>8}: {min(timings) * 1000:.0f}ms, {len(html.encode('utf-8')) / 1024:.0f}KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+'''
+bulk_insert_movies_from_json 적재 벤치마크
+
+사용법: python -m benchmarks.bench_ingest --movies 10000 [--db-url sqlite:///bench.db]
+'''
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base
+from app.Service.movie import bulk_insert_movies_from_json
+from benchmarks.synthetic import generate_movies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--movies', type=int, default=10000)
+    parser.add_argument('--db-url', default='sqlite://')
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    Base.metadata.create_all(bind=engine)
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *a, **kw: statements.append(1))
+
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(generate_movies(args.movies), f, ensure_ascii=False)
+        json_path = f.name
+    try:
+        with sessionmaker(bind=engine)() as db:
+            start = time.perf_counter()
+            result = bulk_insert_movies_from_json(db, json_path=json_path)
+            elapsed = time.perf_counter() - start
+    finally:
+        os.remove(json_path)
+
+    print(f"movies: {result['count']}, elapsed: {elapsed:.2f}s, "
+          f"rows/s: {result['count'] / elapsed:.0f}, statements: {len(statements)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''
+/movies/{country_name}/ 동시 요청 부하 테스트
+
+실행 중인 서버를 대상으로 측정한다.
+사용법: python -m benchmarks.bench_load --url http://localhost:8000 --clients 32 --requests 200
+'''
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+COUNTRIES = ["South Korea", "United States", "United Kingdom", "Australia", "Brazil", "South Africa"]
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+async def run(url: str, clients: int, total_requests: int) -> list:
+    latencies = []
+    counter = iter(range(total_requests))
+
+    async def client_loop(session):
+        for i in counter:
+            country = COUNTRIES[i % len(COUNTRIES)]
+            start = time.perf_counter()
+            async with session.get(f"{url}/movies/{country}/") as response:
+                await response.read()
+            latencies.append((time.perf_counter() - start, response.status))
+
+    connector = aiohttp.TCPConnector(limit=clients)
+    timeout = aiohttp.ClientTimeout(total=120)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        await asyncio.gather(*(client_loop(session) for _ in range(clients)))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = asyncio.run(run(args.url, args.clients, args.requests))
+    elapsed = time.perf_counter() - start
+    latencies = [latency * 1000 for latency, _ in results]
+    errors = sum(1 for _, status in results if status >= 400)
+    print(f"requests: {len(results)}, errors: {errors}, throughput: {len(results) / elapsed:.1f} req/s")
+    print(f"p50: {statistics.median(latencies):.1f}ms, p99: {percentile(latencies, 99):.1f}ms, "
+          f"max: {max(latencies):.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+'''
+영화 목록 페이지 조회 벤치마크 (OFFSET vs 커서 기반, 깊은 페이지까지 순회)
+
+사용법: python -m benchmarks.bench_pagination --movies 100000 [--page-size 50] [--db-url sqlite:///bench.db]
+'''
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base
+from app.Service.catalog import list_movies
+from app.Service.movie import bulk_insert_movies_from_json, get_movies
+from benchmarks.synthetic import generate_movies
+
+
+def load(db, n_movies: int):
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump(generate_movies(n_movies), f, ensure_ascii=False)
+        json_path = f.name
+    try:
+        bulk_insert_movies_from_json(db, json_path=json_path)
+    finally:
+        os.remove(json_path)
+
+
+def walk_offset(db, page_size: int, checkpoints: set) -> dict:
+    timings, page, skip = {}, 0, 0
+    while True:
+        start = time.perf_counter()
+        rows = get_movies(db, skip=skip, limit=page_size)
+        elapsed = time.perf_counter() - start
+        page += 1
+        if page in checkpoints:
+            timings[page] = elapsed
+        db.expunge_all()
+        if len(rows) < page_size:
+            return timings
+        skip += page_size
+
+
+def walk_keyset(db, page_size: int, checkpoints: set, sort: str) -> dict:
+    timings, page, cursor = {}, 0, None
+    while True:
+        start = time.perf_counter()
+        result = list_movies(db, cursor=cursor, limit=page_size, sort=sort)
+        elapsed = time.perf_counter() - start
+        page += 1
+        if page in checkpoints:
+            timings[page] = elapsed
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--movies', type=int, default=100000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--db-url', default='sqlite://')
+    args = parser.parse_args()
+
+    engine = create_engine(args.db_url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        load(db, args.movies)
+        last_page = (args.movies + args.page_size - 1) // args.page_size
+        checkpoints = {1, 10, 100, 1000, last_page // 2, last_page}
+        results = {
+            'offset': walk_offset(db, args.page_size, checkpoints),
+            'keyset(id)': walk_keyset(db, args.page_size, checkpoints, 'id'),
+            'keyset(-score)': walk_keyset(db, args.page_size, checkpoints, '-score'),
+        }
+
+    pages = sorted(page for page in checkpoints if page <= last_page)
+    print(f"{'page':>16}" + ''.join(f"{page:>10}" for page in pages))
+    for label, timings in results.items():
+        print(f"{label:>16}" + ''.join(f"{timings.get(page, 0) * 1000:>8.2f}ms" for page in pages))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+'''
+포스터 에셋 단계 벤치마크 (로컬 HTTP 서버를 CDN 대신 사용)
+
+사용법: python -m benchmarks.bench_posters --posters 500 [--duplicate-ratio 0.2] [--concurrency 16]
+같은 이미지를 여러 URL 로 제공하여 중복 제거를 확인하고, 두 번째 실행에서 다운로드가 없는지 확인한다.
+'''
+import argparse
+import asyncio
+import functools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from PIL import Image
+
+from app.utils.posters import PosterStore
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def write_posters(directory: str, n_posters: int, duplicate_ratio: float, seed: int = 0) -> list:
+    '''
+    CDN 원본과 비슷한 크기(600x900 JPEG)의 합성 포스터 생성. 일부 URL 은 같은 내용을 가리킴
+    '''
+    rng = random.Random(seed)
+    unique = max(1, int(n_posters * (1 - duplicate_ratio)))
+    names = []
+    for i in range(n_posters):
+        source = i if i < unique else rng.randrange(unique)
+        name = f"poster_{i}.jpg"
+        if source == i:
+            color = tuple(rng.randrange(256) for _ in range(3))
+            Image.new('RGB', (600, 900), color).save(os.path.join(directory, name), quality=90)
+        else:
+            with open(os.path.join(directory, f"poster_{source}.jpg"), 'rb') as src:
+                data = src.read()
+            with open(os.path.join(directory, name), 'wb') as dst:
+                dst.write(data)
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posters', type=int, default=500)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.2)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cdn_dir, tempfile.TemporaryDirectory() as store_dir:
+        names = write_posters(cdn_dir, args.posters, args.duplicate_ratio)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=cdn_dir))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        urls = [f"http://127.0.0.1:{server.server_address[1]}/{name}" for name in names]
+        try:
+            for label in ('cold', 'warm'):
+                store = PosterStore(store_dir)
+                start = time.perf_counter()
+                report = asyncio.run(store.sync(urls, concurrency=args.concurrency))
+                report["elapsed"] = round(time.perf_counter() - start, 3)
+                print(f"{label}: {json.dumps(report)}")
+            files = [name for name in os.listdir(store_dir) if name.endswith('.webp')]
+            print(f"thumbnails: {len(files)}, resolved: {sum(store.src(url) != url for url in urls)}/{len(urls)}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+'''
+검색 인덱스 빌드 시간과 검색 지연 시간(p50/p99) 벤치마크
+
+사용법: python -m benchmarks.bench_search --movies 100000 [--queries 2000] [--from-db]
+(--from-db 를 주면 SQLite 에 적재한 뒤 DB 에서 인덱스를 빌드)
+'''
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base
+from app.Service.movie import _parse_score, bulk_insert_movies_from_json
+from app.Service.search import SearchIndex
+from benchmarks.synthetic import generate_movies
+
+
+def to_documents(records: list) -> list:
+    return [{
+        "id": index + 1,
+        "country": record["country"],
+        "title": record["movie"]["title"],
+        "summary": record["movie"]["summary"],
+        "release_year": record["movie"]["release_year"],
+        "score": _parse_score(record["movie"]["score"]),
+        "genres": record["movie"]["genres"],
+        "actors": record["movie"]["actors"],
+    } for index, record in enumerate(records)]
+
+
+def build_from_db(records: list) -> SearchIndex:
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+        json.dump({"movies": records}, f, ensure_ascii=False)
+        json_path = f.name
+    index = SearchIndex()
+    try:
+        with sessionmaker(bind=engine)() as db:
+            bulk_insert_movies_from_json(db, json_path=json_path)
+            start = time.perf_counter()
+            index.rebuild(db)
+            print(f"index build (from DB): {time.perf_counter() - start:.2f}s")
+    finally:
+        os.remove(json_path)
+    return index
+
+
+def make_queries(n_queries: int, n_movies: int, seed: int = 1) -> list:
+    '''
+    흔한 단어 / 드문 단어 / 다중 단어 / 필터만 있는 검색을 섞은 질의 목록
+    '''
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n_queries):
+        kind = rng.random()
+        if kind < 0.3:
+            query = {"q": f"movie {rng.randrange(n_movies)}"}
+        elif kind < 0.6:
+            query = {"q": f"Actor {rng.randrange(5000)}"}
+        elif kind < 0.8:
+            query = {"q": "genre", "genre": f"Genre {rng.randrange(25)}"}
+        else:
+            query = {"q": "", "country": f"Country {rng.randrange(20)}", "year_from": rng.randint(1950, 2020)}
+        queries.append(query)
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--movies', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--from-db', action='store_true')
+    args = parser.parse_args()
+
+    records = generate_movies(args.movies)["movies"]
+    if args.from_db:
+        index = build_from_db(records)
+    else:
+        index = SearchIndex()
+        start = time.perf_counter()
+        index.build(to_documents(records))
+        print(f"index build: {time.perf_counter() - start:.2f}s")
+
+    timings = {}
+    for query in make_queries(args.queries, args.movies):
+        start = time.perf_counter()
+        index.search(**query)
+        kind = 'filter-only' if not query["q"] else ('faceted' if "genre" in query else 'text')
+        timings.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+    timings['all'] = [elapsed for values in list(timings.values()) for elapsed in values]
+    for kind, values in timings.items():
+        values.sort()
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(f"{kind:>12}: n={len(values):5d} p50={statistics.median(values):6.2f}ms p99={p99:6.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+'''
+대용량 크롤링 파일 스트리밍 파싱 벤치마크 (최대 RSS 비교)
+
+사용법: python -m benchmarks.bench_stream --movies 500000 [--ingest]
+각 측정은 별도 프로세스에서 실행되어 서로의 메모리 사용량에 영향을 주지 않는다.
+'''
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_movies
+
+
+def write_synthetic_file(path: str, n_movies: int, chunk: int = 10000):
+    '''
+    합성 데이터를 청크 단위로 생성하여 {"movies": [...]} 파일로 기록 (생성 과정도 메모리 일정)
+    '''
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"movies": [\n')
+        written = 0
+        while written < n_movies:
+            size = min(chunk, n_movies - written)
+            movies = generate_movies(size, seed=written)["movies"]
+            for index, record in enumerate(movies):
+                record["movie"]["title"] = f"Movie {written + index}"
+                if written + index:
+                    f.write(',\n')
+                f.write(json.dumps(record, ensure_ascii=False))
+            written += size
+        f.write('\n]}\n')
+
+
+def measure(mode: str, path: str):
+    start = time.perf_counter()
+    if mode == 'json.load':
+        with open(path, 'r', encoding='utf-8') as f:
+            count = len(json.load(f)["movies"])
+    elif mode == 'stream':
+        from app.Service.reader import iter_movie_records
+        count = sum(1 for _ in iter_movie_records(path))
+    else:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.models.models import Base
+        from app.Service.movie import bulk_insert_movies_from_json
+        db_path = path + '.db'
+        engine = create_engine(f'sqlite:///{db_path}')
+        Base.metadata.create_all(bind=engine)
+        try:
+            with sessionmaker(bind=engine)() as db:
+                count = bulk_insert_movies_from_json(db, json_path=path)["count"]
+        finally:
+            os.remove(db_path)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:>10}: {count} movies, {elapsed:.1f}s, peak RSS {peak_mb:.0f}MB")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--measure':
+        measure(sys.argv[2], sys.argv[3])
+        return
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--movies', type=int, default=500000)
+    parser.add_argument('--ingest', action='store_true', help="SQLite 적재까지 측정")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'movies.json')
+        write_synthetic_file(path, args.movies)
+        print(f"file size: {os.path.getsize(path) / 1024 / 1024:.0f}MB")
+        modes = ['json.load', 'stream'] + (['ingest'] if args.ingest else [])
+        for mode in modes:
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_stream', '--measure', mode, path], check=True)
+
+
+if __name__ == '__main__':
+    main()
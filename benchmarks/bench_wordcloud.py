@@ -0,0 +1,31 @@
+'''
+워드클라우드 1회 렌더링 지연 시간 벤치마크 (첫 호출 = 콜드, 이후 = 웜)
+
+사용법: python -m benchmarks.bench_wordcloud [--repeat 5] [--profile default]
+'''
+import argparse
+import statistics
+import time
+
+from benchmarks.bench_images import load_rows
+from app.utils.visualizer import Visualizer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--country', default='South Korea')
+    parser.add_argument('--profile', default='default')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    visualizer = Visualizer(args.country, db=None, image_profile=args.profile, rows=load_rows(args.country))
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        visualizer.visualize_wordcloud()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"cold: {timings[0]:.0f}ms, warm median: {statistics.median(timings[1:] or timings):.0f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+'''
+벤치마크 스위트 결과 두 개를 비교하여 변화율을 출력
+
+사용법: python -m benchmarks.compare base.json head.json [--threshold 0.1]
+기준보다 threshold 이상 나빠진 지표가 있으면 종료 코드 1 을 반환한다.
+'''
+import argparse
+import json
+import sys
+
+# 이름이 이 접미사로 끝나면 클수록 좋은 지표, 시간/문장 수 지표는 작을수록 좋음
+HIGHER_IS_BETTER = ('_per_second',)
+LOWER_IS_BETTER = ('seconds', '_ms', 'statements', 'errors')
+
+
+def flatten(results: dict, prefix: str = '') -> dict:
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[name] = value
+    return metrics
+
+
+def direction(name: str) -> int:
+    '''
+    :return: 1 (클수록 좋음), -1 (작을수록 좋음), 0 (비교 대상 아님: 행/페이지 수 등)
+    '''
+    leaf = name.rsplit('.', 1)[-1]
+    if leaf.endswith(HIGHER_IS_BETTER):
+        return 1
+    if leaf.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def compare(base: dict, head: dict, threshold: float) -> list:
+    '''
+    :return: [(지표, 기준 값, 새 값, 변화율, 회귀 여부)]
+    '''
+    base_metrics, head_metrics = flatten(base["results"]), flatten(head["results"])
+    rows = []
+    for name in sorted(base_metrics.keys() & head_metrics.keys()):
+        old, new = base_metrics[name], head_metrics[name]
+        change = (new - old) / old if old else 0.0
+        regressed = direction(name) != 0 and -direction(name) * change > threshold
+        rows.append((name, old, new, change, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark suite results")
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=0.1, help="회귀로 판단할 변화율 (기본 10%%)")
+    args = parser.parse_args()
+
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.head, 'r', encoding='utf-8') as f:
+        head = json.load(f)
+    if base["meta"].get("scale") != head["meta"].get("scale"):
+        print("warning: results were produced with different scales", file=sys.stderr)
+
+    rows = compare(base, head, args.threshold)
+    width = max((len(name) for name, *_ in rows), default=10)
+    for name, old, new, change, regressed in rows:
+        marker = '  REGRESSION' if regressed else ''
+        print(f"{name:<{width}} {old:>12.4g} -> {new:>12.4g} {change:>+8.1%}{marker}")
+    regressions = [row for row in rows if row[4]]
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%}"
+          f" ({(base['meta'].get('commit') or '?')[:12]} -> {(head['meta'].get('commit') or '?')[:12]})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+'''
+재현 가능한 벤치마크 스위트 (결과를 커밋 간 비교 가능한 JSON 으로 저장)
+
+측정 항목
+- ingest:  bulk_insert_movies_from_json 적재 처리량과 SQL 문 수
+- render:  국가별 대시보드 렌더링 시간 (Visualizer.create_combined_html 과 같은 렌더링 + 파일 저장)
+- request: /movies/{country}/ 지연 시간 (서버 없이 ASGI 앱을 직접 호출, 첫 요청=렌더링 / 이후=캐시)
+- parse:   저장된 검색 결과 HTML fixture 에 대한 크롤러 파서 처리량
+
+사용법: python -m benchmarks.suite [--scale small] [--db-url sqlite:///bench.db] [--only ingest,render]
+        [--fixtures-dir 저장된_HTML_디렉토리] [--output benchmarks/results/<commit>.json]
+비교:   python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+'''
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.synthetic import SCALES, generate_dataset, write_dataset, write_search_pages
+
+BENCHMARKS: tuple = ('ingest', 'render', 'request', 'parse')
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def summarize(values: list) -> dict:
+    return {
+        "p50_ms": round(statistics.median(values) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(max(values) * 1000, 3),
+    }
+
+
+def git_revision() -> dict:
+    def run(*args):
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = run('status', '--porcelain', '--untracked-files=no')
+    return {"commit": run('rev-parse', 'HEAD'), "dirty": bool(status) if status is not None else None}
+
+
+def run_ingest(db_url: str, json_path: str, repeat: int) -> dict:
+    '''
+    매 반복마다 스키마를 새로 만든 뒤 적재 (마지막 적재 결과는 이후 벤치마크에서 사용)
+    '''
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.models.models import Base
+    from app.Service.movie import bulk_insert_movies_from_json
+
+    engine = create_engine(db_url)
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *a, **kw: statements.append(1))
+    timings = []
+    for _ in range(repeat):
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        statements.clear()
+        with sessionmaker(bind=engine)() as db:
+            start = time.perf_counter()
+            rows = bulk_insert_movies_from_json(db, json_path=json_path)["count"]
+            timings.append(time.perf_counter() - start)
+    engine.dispose()
+    best = min(timings)
+    return {"rows": rows, "seconds": round(best, 4), "rows_per_second": round(rows / best, 1),
+            "statements": len(statements)}
+
+
+def run_render(db_url: str, countries: list, repeat: int) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.utils.visualizer import Visualizer
+
+    engine = create_engine(db_url)
+    per_country = {}
+    charts = {}
+    with tempfile.TemporaryDirectory() as output_dir, sessionmaker(bind=engine)() as db:
+        for country in countries:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                visualizer = Visualizer(country, db=db)
+                html = visualizer.render_combined_html()
+                with open(os.path.join(output_dir, f"{country}.html"), 'w', encoding='utf-8') as f:
+                    f.write(html)
+                timings.append(time.perf_counter() - start)
+                for chart, elapsed in visualizer.render_timings.items():
+                    charts.setdefault(chart, []).append(elapsed)
+            per_country[country] = {"seconds": round(min(timings), 4), "html_kb": round(len(html.encode()) / 1024, 1)}
+    engine.dispose()
+    all_timings = [result["seconds"] for result in per_country.values()]
+    return {
+        "countries": per_country,
+        "mean_seconds": round(statistics.mean(all_timings), 4),
+        "charts_p50_ms": {chart: round(statistics.median(values) * 1000, 3) for chart, values in charts.items()},
+    }
+
+
+async def asgi_get(app, path: str, headers: dict = None):
+    '''
+    서버/HTTP 클라이언트 없이 ASGI 앱에 GET 요청을 보내고 (상태 코드, 본문 바이트) 반환
+    '''
+    from urllib.parse import quote
+    raw_path = quote(path)
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': raw_path.encode(), 'query_string': b'', 'root_path': '',
+        'headers': [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+        'server': ('bench', 80), 'client': ('bench', 0),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    status = next(message['status'] for message in messages if message['type'] == 'http.response.start')
+    body = b''.join(message.get('body', b'') for message in messages if message['type'] == 'http.response.body')
+    return status, body
+
+
+def run_request(countries: list, requests: int) -> dict:
+    '''
+    DB_URL 환경 변수가 가리키는 DB 로 앱을 띄워 국가별 첫 요청(렌더링)과 이후 요청(캐시)을 측정
+    '''
+    from app.main import app
+    from app.routers.routes import ingest_job
+    from app.utils.render_executor import render_executor
+
+    async def measure():
+        cold, warm, errors = [], [], 0
+        for country in countries:
+            start = time.perf_counter()
+            status, _ = await asgi_get(app, f"/movies/{country}/")
+            cold.append(time.perf_counter() - start)
+            errors += status >= 400
+            for _ in range(requests):
+                start = time.perf_counter()
+                status, _ = await asgi_get(app, f"/movies/{country}/")
+                warm.append(time.perf_counter() - start)
+                errors += status >= 400
+        return cold, warm, errors
+
+    ingest_job.refresh_index()
+    try:
+        cold, warm, errors = asyncio.run(measure())
+    finally:
+        render_executor.shutdown()
+    return {"cold": summarize(cold), "warm": summarize(warm), "requests": len(cold) + len(warm), "errors": errors}
+
+
+def run_parse(paths: list, repeat: int, top_n: int = 50) -> dict:
+    from app.utils.http_backend import HttpBackend
+
+    backend = HttpBackend(base_url='')
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    timings, items = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = sum(len(backend.parse(page, top_n)) for page in pages)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"pages": len(pages), "items": items, "seconds": round(best, 4),
+            "pages_per_second": round(len(pages) / best, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--countries', type=int, help="국가 수 (scale 값 대신 사용)")
+    parser.add_argument('--movies-per-country', type=int)
+    parser.add_argument('--genres', type=int)
+    parser.add_argument('--actors', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db-url', default=None, help="기본값: 임시 디렉토리의 SQLite 파일")
+    parser.add_argument('--only', default=','.join(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--render-countries', type=int, default=3, help="렌더링/요청을 측정할 국가 수")
+    parser.add_argument('--requests', type=int, default=20, help="국가별 캐시 요청 수")
+    parser.add_argument('--fixtures-dir', default=None, help="저장된 검색 결과 HTML (기본값: 합성 fixture)")
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    scale = dict(zip(('countries', 'movies_per_country', 'genres', 'actors'), SCALES[args.scale]))
+    for key in scale:
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_url = args.db_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        # 앱 모듈(app.database)이 import 되기 전에 설정해야 요청 벤치마크가 같은 DB 를 사용
+        os.environ['DB_URL'] = db_url
+        data = generate_dataset(seed=args.seed, **scale)
+        json_path = os.path.join(workdir, 'movies_data_country.json')
+        write_dataset(json_path, data)
+        countries = sorted({record["country"] for record in data["movies"]})[:args.render_countries]
+
+        results = {}
+        if {'ingest', 'render', 'request'} & set(selected):
+            # 렌더링/요청 벤치마크도 적재된 DB 가 필요하므로 ingest 는 항상 먼저 실행
+            results['ingest'] = run_ingest(db_url, json_path, args.repeat if 'ingest' in selected else 1)
+            if 'ingest' not in selected:
+                del results['ingest']
+        if 'render' in selected:
+            results['render'] = run_render(db_url, countries, args.repeat)
+        if 'request' in selected:
+            results['request'] = run_request(countries, args.requests)
+        if 'parse' in selected:
+            if args.fixtures_dir:
+                paths = sorted(os.path.join(args.fixtures_dir, name)
+                               for name in os.listdir(args.fixtures_dir) if name.endswith('.html'))
+            else:
+                paths = write_search_pages(os.path.join(workdir, 'fixtures'), data)
+            results['parse'] = run_parse(paths, args.repeat)
+
+    report = {
+        "meta": {
+            **git_revision(),
+            "timestamp": datetime.utcnow().isoformat(timespec='seconds'),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "db": args.db_url or 'sqlite-file',
+            "scale": {**scale, "seed": args.seed, "name": args.scale},
+        },
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{(report['meta']['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(f"results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+'''
+벤치마크용 합성 데이터 생성기
+
+- generate_movies / generate_dataset: movies_data_country.json 과 같은 구조의 데이터 (국가 x 영화 x 장르 x 배우)
+- write_search_pages: 크롤러 파서용 검색 결과 페이지 fixture (__NEXT_DATA__ JSON / data-testid HTML)
+- write_paged_search_pages: 국가별 검색 결과를 여러 페이지로 나눈 fixture (깊은 크롤링용)
+
+같은 인자와 seed 로 호출하면 항상 같은 데이터를 만든다.
+'''
+import html
+import json
+import os
+import random
+
+SCALES = {
+    # (국가 수, 국가별 영화 수, 장르 수, 배우 수)
+    'small': (5, 20, 25, 500),
+    'medium': (20, 500, 25, 5000),
+    'large': (50, 2000, 30, 50000),
+}
+
+
+def generate_movies(n_movies: int, n_countries: int = 20, n_genres: int = 25, n_actors: int = 5000, seed: int = 0) -> dict:
+    '''
+    movies_data_country.json 과 같은 구조의 합성 데이터를 생성 (국가는 순서대로 돌아가며 배정)
+    '''
+    rng = random.Random(seed)
+    countries = [f"Country {i}" for i in range(n_countries)]
+    genres = [f"Genre {i}" for i in range(n_genres)]
+    actors = [f"Actor {i}" for i in range(n_actors)]
+    movies = []
+    for i in range(n_movies):
+        movies.append({
+            "country": countries[i % n_countries],
+            "movie": {
+                "title": f"Movie {i}",
+                "release_year": str(rng.randint(1950, 2025)),
+                "score": f"{rng.uniform(1, 10):.1f}",
+                "summary": " ".join(rng.choice(genres + actors) for _ in range(30)),
+                "image_url": f"https://example.com/{i}.jpg",
+                "genres": rng.sample(genres, min(3, n_genres)),
+                "actors": rng.sample(actors, min(3, n_actors))
+            },
+            "rank": i // n_countries + 1
+        })
+    return {"movies": movies}
+
+
+def generate_dataset(countries: int, movies_per_country: int, genres: int, actors: int, seed: int = 0) -> dict:
+    return generate_movies(countries * movies_per_country, countries, genres, actors, seed=seed)
+
+
+def write_dataset(path: str, data: dict):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _next_data_page(records: list) -> str:
+    items = [{
+        'titleText': record['movie']['title'],
+        'releaseYear': {'year': int(record['movie']['release_year'])},
+        'ratingSummary': {'aggregateRating': float(record['movie']['score'])},
+        'plot': record['movie']['summary'],
+        'genres': record['movie']['genres'],
+        'principalCredits': [{'credits': [{'name': {'nameText': {'text': name}}} for name in record['movie']['actors']]}],
+        'primaryImage': {'url': record['movie']['image_url']},
+    } for record in records]
+    data = {'props': {'pageProps': {'searchResults': {'titleResults': {'titleListItems': items}}}}}
+    return (
+        '<html><head><script id="__NEXT_DATA__" type="application/json">'
+        f'{json.dumps(data, ensure_ascii=False)}</script></head><body></body></html>'
+    )
+
+
+def _list_item_page(records: list) -> str:
+    items = []
+    for record in records:
+        movie = record['movie']
+        items.append(
+            '<li data-testid="title-item">'
+            f'<img data-testid="title-img" src="{html.escape(movie["image_url"])}">'
+            f'<h3 data-testid="title">{html.escape(movie["title"])}</h3>'
+            f'<span data-testid="title-year">{movie["release_year"]}</span>'
+            f'<span data-testid="title-score">{movie["score"]}</span>'
+            f'<div data-testid="title-summary">{html.escape(movie["summary"])}</div>'
+            + ''.join(f'<span data-testid="title-genre">{html.escape(name)}</span>' for name in movie["genres"])
+            + ''.join(f'<a data-testid="title-star">{html.escape(name)}</a>' for name in movie["actors"])
+            + '</li>'
+        )
+    return f'<html><body><ul>{"".join(items)}</ul></body></html>'
+
+
+def write_search_pages(directory: str, data: dict, per_page: int = 50) -> list:
+    '''
+    국가별 검색 결과 페이지 fixture 를 두 형식으로 저장
+
+    :return: 저장한 파일 경로 리스트
+    '''
+    os.makedirs(directory, exist_ok=True)
+    by_country = {}
+    for record in data["movies"]:
+        by_country.setdefault(record["country"], []).append(record)
+    paths = []
+    for index, records in enumerate(by_country.values()):
+        records = records[:per_page]
+        for style, render in (('next_data', _next_data_page), ('list_item', _list_item_page)):
+            path = os.path.join(directory, f"search_{index}_{style}.html")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(render(records))
+            paths.append(path)
+    return paths
+
+
+def write_paged_search_pages(directory: str, data: dict, per_page: int = 50, style: str = 'next_data') -> dict:
+    '''
+    국가별 검색 결과를 per_page 개씩 {국가 코드}_{페이지}.html 로 저장
+    (크롤러 base_url 예: file://{directory}/{}_{page}.html)
+
+    :return: 크롤러 국가 코드 파일과 같은 {국가 코드: 국가 이름} 딕셔너리
+    '''
+    render = _next_data_page if style == 'next_data' else _list_item_page
+    os.makedirs(directory, exist_ok=True)
+    by_country = {}
+    for record in data["movies"]:
+        by_country.setdefault(record["country"], []).append(record)
+    country_codes = {}
+    for index, (country, records) in enumerate(by_country.items()):
+        code = f"C{index}"
+        country_codes[code] = country
+        for page, offset in enumerate(range(0, len(records), per_page), start=1):
+            with open(os.path.join(directory, f"{code}_{page}.html"), 'w', encoding='utf-8') as f:
+                f.write(render(records[offset:offset + per_page]))
+    return country_codes
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# app.database 는 import 시 엔진을 만들므로 테스트에서는 MySQL 대신 메모리 SQLite 사용
+os.environ.setdefault('DB_URL', 'sqlite://')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app 패키지는 저장소 루트에서, 크롤러 스크립트(crawler.py)는 app/utils 에서 실행되는 것처럼 import
+for path in (ROOT, os.path.join(ROOT, 'app', 'utils')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,36 @@
+import os
+
+from app.utils.cache import GENERATION_FILENAME, DashboardCache
+
+
+def cached(cache: DashboardCache, country: str) -> str:
+    etag = cache.make_etag(country, 'v1', {})
+    cache.put(country, etag, f'<html>{country}</html>')
+    return etag
+
+
+def disk_files(cache: DashboardCache) -> list:
+    return sorted(name for name in os.listdir(cache.cache_dir) if not name.startswith(GENERATION_FILENAME))
+
+
+def test_country_invalidation_keeps_other_countries(tmp_path):
+    cache = DashboardCache(cache_dir=str(tmp_path))
+    korea, japan = cached(cache, 'Korea'), cached(cache, 'Japan')
+
+    cache.invalidate(['Korea'])
+    assert cache.make_etag('Korea', 'v1', {}) != korea
+    assert cache.make_etag('Japan', 'v1', {}) == japan
+    # 무효화되지 않은 국가는 재시작 후에도 디스크 캐시를 그대로 사용
+    assert DashboardCache(cache_dir=str(tmp_path)).get('Japan', japan) == '<html>Japan</html>'
+    assert len(disk_files(cache)) == 1
+    assert cache.updated_at('Korea') > cache.updated_at('Japan')
+
+
+def test_full_invalidation_purges_disk(tmp_path):
+    cache = DashboardCache(cache_dir=str(tmp_path))
+    korea, japan = cached(cache, 'Korea'), cached(cache, 'Japan')
+
+    cache.invalidate()
+    assert cache.make_etag('Korea', 'v1', {}) != korea
+    assert cache.make_etag('Japan', 'v1', {}) != japan
+    assert disk_files(cache) == []
@@ -0,0 +1,67 @@
+import base64
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import models
+from app.models.models import Base
+from app.Service.catalog import encode_cursor, list_movies, list_names
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    country = models.Country(name='South Korea')
+    session.add(country)
+    session.flush()
+    session.add_all(
+        models.Movie(title=f'Movie {index:02d}', release_year='2020', score=5 + index % 4, country_id=country.id)
+        for index in range(12)
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize('sort', ['id', 'title', '-score'])
+def test_cursor_pages_cover_every_movie_once(db, sort):
+    seen, cursor = [], None
+    while True:
+        page = list_movies(db, cursor=cursor, limit=5, sort=sort)
+        seen.extend(item['id'] for item in page['items'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+    assert sorted(seen) == list(range(1, 13))
+
+
+def raw_cursor(payload: str) -> str:
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('sort, cursor', [
+    ('-score', encode_cursor([3])),               # id 정렬의 커서를 다른 정렬에 사용
+    ('id', encode_cursor([7.0, 3])),              # -score 정렬의 커서를 id 정렬에 사용
+    ('title', encode_cursor([3, 'Movie 03'])),    # 값 순서가 뒤바뀐 커서
+    ('id', raw_cursor('{"id": 3}')),               # 리스트가 아닌 JSON
+    ('id', raw_cursor('"3"')),
+    ('id', encode_cursor([True])),
+    ('-score', raw_cursor('[NaN, 3]')),
+    ('id', encode_cursor([])),
+    ('id', 'not base64!'),
+])
+def test_wrong_shape_cursor_is_rejected(db, sort, cursor):
+    with pytest.raises(HTTPException) as error:
+        list_movies(db, cursor=cursor, sort=sort)
+    assert error.value.status_code == 400
+
+
+def test_list_names_rejects_wrong_shape_cursor(db):
+    assert list_names(db, models.Country, cursor=encode_cursor(['A']))['items'][0]['name'] == 'South Korea'
+    with pytest.raises(HTTPException) as error:
+        list_names(db, models.Country, cursor=encode_cursor([1]))
+    assert error.value.status_code == 400
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from app.utils import crawl_queue
+from app.utils.crawl_queue import DONE, FAILED, LEASED, PENDING, CrawlQueue
+
+RUN_ID = 'run'
+
+
+class FakeClock:
+    '''crawl_queue 모듈이 쓰는 time 대역 (sleep 은 시각만 앞으로 보냄)'''
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class UpperJitter:
+    '''백오프 지터를 상한값으로 고정'''
+    def uniform(self, low, high):
+        return high
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(crawl_queue, 'time', clock)
+    monkeypatch.setattr(crawl_queue, 'random', UpperJitter())
+    return clock
+
+
+def make_queue(tmp_path, jobs: int = 1, max_attempts: int = 5) -> CrawlQueue:
+    queue = CrawlQueue(str(tmp_path / 'queue.db'))
+    queue.enqueue(RUN_ID, [('KR', 'South Korea', page) for page in range(1, jobs + 1)], max_attempts=max_attempts)
+    return queue
+
+
+def job_row(queue: CrawlQueue) -> dict:
+    return queue.jobs(RUN_ID)[0]
+
+
+def test_lease_is_exclusive_across_connections(tmp_path):
+    path = make_queue(tmp_path, jobs=60).path
+    leased, errors = [], []
+
+    def worker(index):
+        # 워커마다 따로 연 큐 (같은 파일, 다른 sqlite 연결)
+        queue = CrawlQueue(path)
+        try:
+            while (job := queue.lease(f'worker-{index}', lease_seconds=600)) is not None:
+                leased.append(job.id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert sorted(leased) == list(range(1, 61))
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_is_fenced(tmp_path, clock):
+    queue = make_queue(tmp_path)
+    first = queue.lease('w1', lease_seconds=10)
+    assert queue.lease('w2', lease_seconds=10) is None
+
+    clock.now += 11
+    second = queue.lease('w2', lease_seconds=10)
+    assert second.id == first.id and second.attempts == 2
+    assert job_row(queue)['last_error'] == 'lease expired (w1)'
+
+    # lease 를 잃은 워커는 연장/완료/실패 처리를 할 수 없음
+    assert queue.heartbeat(first.id, 'w1') is False
+    assert queue.complete(first.id, 'w1', 'stale.json') is False
+    assert queue.fail(first.id, 'w1', 'late error') is None
+    assert job_row(queue)['status'] == LEASED and job_row(queue)['lease_owner'] == 'w2'
+
+    assert queue.heartbeat(second.id, 'w2', lease_seconds=10) is True
+    assert queue.complete(second.id, 'w2', 'result.json') is True
+    assert job_row(queue)['status'] == DONE and job_row(queue)['last_error'] is None
+
+
+def test_failed_jobs_back_off_exponentially_until_max_attempts(tmp_path, clock):
+    queue = make_queue(tmp_path, max_attempts=3)
+    for attempt, delay in ((1, 5), (2, 10)):
+        job = queue.lease('w1')
+        assert job.attempts == attempt
+        assert queue.fail(job.id, 'w1', 'boom', base_delay=5) == PENDING
+        assert job_row(queue)['available_at'] == clock.now + delay
+        clock.now += delay - 1
+        assert queue.lease('w1') is None
+        clock.now += 1
+
+    job = queue.lease('w1')
+    assert job.attempts == 3
+    assert queue.fail(job.id, 'w1', 'boom', base_delay=5) == FAILED
+    assert queue.stats(RUN_ID)[FAILED] == 1
+    assert queue.outstanding(RUN_ID) == 0
+
+
+def test_expired_lease_on_last_attempt_fails_the_job(tmp_path, clock):
+    queue = make_queue(tmp_path, max_attempts=1)
+    queue.lease('w1', lease_seconds=10)
+    clock.now += 11
+    assert queue.lease('w2') is None
+    row = job_row(queue)
+    assert row['status'] == FAILED and row['last_error'] == 'lease expired (w1)'
@@ -0,0 +1,64 @@
+import threading
+
+from crawler import DriverPool, MovieCrawler
+
+
+class FakeDriver:
+    instances = []
+
+    def __init__(self):
+        self.quit_called = False
+        FakeDriver.instances.append(self)
+
+    def get(self, url):
+        pass
+
+    @property
+    def current_url(self):
+        return 'about:blank'
+
+    def quit(self):
+        self.quit_called = True
+
+
+def fake_crawler(top_n: int = 20) -> MovieCrawler:
+    crawler = MovieCrawler(top_n=top_n)
+    crawler.initialize_driver = FakeDriver
+    crawler.load_more = lambda driver, rank, strict=False: top_n
+    crawler.process_movie = lambda driver, wait, country, country_code, rank: {
+        'title': f'{country} {rank}', 'year': '2020', 'score': '7.0', 'summary': '', 'img': None,
+        'genre': [], 'stars': [], 'country': country, 'rank': rank,
+    }
+    return crawler
+
+
+def test_iter_country_returns_driver_when_consumer_stops():
+    crawler = fake_crawler()
+    pool = DriverPool(FakeDriver, size=1)
+    records = crawler.iter_country(pool, 'KR', 'South Korea')
+    assert next(records)['rank'] == 1
+    records.close()
+    with pool.acquire() as driver:
+        # 닫힌 제너레이터가 빌렸던 드라이버가 그대로 반납되어 재사용됨
+        assert pool._drivers == [driver]
+    pool.close()
+    assert driver.quit_called
+
+
+def test_stream_releases_drivers_when_consumer_stops():
+    FakeDriver.instances = []
+    crawler = fake_crawler()
+    stream = crawler.stream({'KR': 'South Korea', 'JP': 'Japan'}, maxsize=1)
+    first = next(stream)
+    assert first['rank'] == 1
+    stream.close()
+    assert FakeDriver.instances and all(driver.quit_called for driver in FakeDriver.instances)
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith('crawler')]
+
+
+def test_stream_yields_every_rank():
+    crawler = fake_crawler(top_n=5)
+    records = list(crawler.stream({'KR': 'South Korea', 'JP': 'Japan'}))
+    assert sorted((record['country'], record['rank']) for record in records) == [
+        (country, rank) for country in ('Japan', 'South Korea') for rank in range(1, 6)
+    ]
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base
+from app.Service.movie import bulk_insert_movies_from_json, get_top_movies_by_country_name
+from app.utils.instrumentation import count_statements
+from app.utils.visualizer import Visualizer
+
+COUNTRY = 'South Korea'
+
+
+def movie_record(index: int, ranked: bool = True) -> dict:
+    record = {
+        "country": COUNTRY,
+        "movie": {
+            "title": f"Movie {index}",
+            "release_year": str(1990 + index % 30),
+            "score": str(5 + index % 5),
+            "summary": f"A story about family number {index} and the city",
+            "image_url": f"https://example.com/{index}.jpg",
+            "genres": ["Drama", f"Genre {index % 7}"],
+            "actors": [f"Actor {index}", f"Actor {index + 1}"],
+        },
+    }
+    if ranked:
+        record["rank"] = index + 1
+    return record
+
+
+def load_session(tmp_path, movies: int, ranked: bool = True):
+    path = tmp_path / f'movies_{movies}.json'
+    path.write_text(json.dumps({"movies": [movie_record(i, ranked) for i in range(movies)]}), encoding='utf-8')
+    engine = create_engine(f'sqlite:///{tmp_path}/movies_{movies}.db')
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    bulk_insert_movies_from_json(db, json_path=str(path))
+    db.expunge_all()
+    return db
+
+
+def dashboard_statements(db) -> int:
+    with count_statements() as statements:
+        visualizer = Visualizer(COUNTRY, db)
+        visualizer.visualize_TOPK()
+        # 카드/차트가 읽는 연관 관계도 추가 쿼리 없이 접근되어야 함
+        for movie in visualizer.movies:
+            [genre.name for genre in movie.genres]
+            [actor.name for actor in movie.actors]
+    return statements[0]
+
+
+@pytest.mark.parametrize('ranked', [True, False], ids=['snapshot', 'legacy'])
+def test_dashboard_statement_count_is_constant(tmp_path, ranked):
+    counts = {}
+    for movies in (5, 50, 500):
+        db = load_session(tmp_path, movies, ranked)
+        try:
+            counts[movies] = dashboard_statements(db)
+            assert len(get_top_movies_by_country_name(db, COUNTRY)) == 5
+        finally:
+            db.close()
+    assert len(set(counts.values())) == 1, counts
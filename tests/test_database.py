@@ -0,0 +1,79 @@
+import logging
+import os
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app import database
+from app.database import EngineConn, TimedQueuePool, _install_listeners
+
+
+def test_pool_records_waits_and_timeouts(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/pool.db', poolclass=TimedQueuePool,
+                           pool_size=1, max_overflow=0, pool_timeout=0.1)
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    metrics = engine.pool.wait_metrics
+    assert metrics["checkouts"] == 2 and metrics["timeouts"] == 1
+    assert metrics["wait_max_ms"] >= 100
+
+    # dispose() 로 다시 만든 풀도 같은 지표를 이어서 기록
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert engine.pool.wait_metrics["checkouts"] == 3
+
+
+def test_engine_conn_reports_pool_status(tmp_path):
+    conn = EngineConn(f'sqlite:///{tmp_path}/status.db')
+    with conn.engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+    status = conn.pool_status()["sync"]
+    assert status["class"] == 'TimedQueuePool'
+    assert status["checkouts"] == 1 and status["checked_out"] == 0
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    _install_listeners(engine)
+    return engine
+
+
+def test_slow_queries_are_sampled(engine, monkeypatch, caplog):
+    monkeypatch.setattr(database, 'DB_SLOW_QUERY_MS', 0)
+    with caplog.at_level(logging.WARNING, logger='app.database.slow_query'):
+        monkeypatch.setattr(database, 'DB_SLOW_QUERY_SAMPLE_RATE', 0.0)
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+        assert not caplog.records
+
+        monkeypatch.setattr(database, 'DB_SLOW_QUERY_SAMPLE_RATE', 1.0)
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 2'))
+    assert len(caplog.records) == 1
+    assert 'SELECT 2' in caplog.records[0].getMessage()
+
+
+def test_failed_statement_pops_query_timer(engine):
+    with engine.connect() as connection:
+        with pytest.raises(exc.OperationalError):
+            connection.execute(text('SELECT * FROM missing_table'))
+        assert connection.info['query_start'] == []
+        connection.execute(text('SELECT 1'))
+        assert connection.info['query_start'] == []
+
+
+def test_engine_conn_is_shared_per_process(monkeypatch):
+    monkeypatch.setattr(EngineConn, '_instance', None)
+    monkeypatch.setattr(EngineConn, '_instance_pid', None)
+    parent = EngineConn()
+    assert EngineConn() is parent and EngineConn().engine is parent.engine
+
+    # fork 된 워커 프로세스에서는 부모의 엔진(커넥션)을 쓰지 않고 새로 만듦
+    pid = os.getpid()
+    monkeypatch.setattr(database.os, 'getpid', lambda: pid + 1)
+    child = EngineConn()
+    assert child is not parent and child.engine is not parent.engine
+    assert EngineConn() is child
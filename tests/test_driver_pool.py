@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from crawler import DriverPool, MovieCrawler
+
+
+class FakeDriver:
+    '''get() 한 국가 코드를 기록하고, broken 에 있는 코드면 WebDriverException 을 던지는 드라이버 대역'''
+    broken = set()
+
+    def __init__(self):
+        self.quit_called = False
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        if any(code in url for code in FakeDriver.broken):
+            raise WebDriverException('browser crashed')
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self, failures: int = 0):
+        self.created = []
+        self.failures = failures
+
+    def __call__(self):
+        if self.failures:
+            self.failures -= 1
+            raise WebDriverException('chromedriver failed to start')
+        driver = FakeDriver()
+        self.created.append(driver)
+        return driver
+
+
+def test_driver_is_returned_and_reused():
+    factory = Factory()
+    with DriverPool(factory, size=2) as pool:
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            assert second is first
+    assert factory.created == [first] and first.quit_called
+
+
+def test_driver_is_discarded_on_webdriver_exception():
+    factory = Factory()
+    pool = DriverPool(factory, size=1)
+    with pytest.raises(WebDriverException):
+        with pool.acquire() as broken:
+            raise WebDriverException('session deleted')
+    assert broken.quit_called and pool._drivers == []
+
+    # 폐기된 자리는 새 드라이버로 채워짐
+    with pool.acquire() as replacement:
+        assert replacement is not broken
+    assert pool._drivers == [replacement]
+    pool.close()
+
+
+def test_failed_driver_creation_frees_the_slot():
+    factory = Factory(failures=1)
+    pool = DriverPool(factory, size=1)
+    with pytest.raises(WebDriverException):
+        with pool.acquire():
+            pass
+    with pool.acquire() as driver:
+        assert factory.created == [driver]
+    pool.close()
+
+
+def fake_crawler(factory: Factory, workers: int, top_n: int = 3, delays: dict = None) -> MovieCrawler:
+    crawler = MovieCrawler(top_n=top_n, workers=workers)
+    crawler.initialize_driver = factory
+    crawler.load_more = lambda driver, rank, strict=False: top_n
+
+    def process_movie(driver, wait, country, country_code, rank):
+        time.sleep((delays or {}).get(country_code, 0))
+        return {'title': f'{country} {rank}', 'year': '2020', 'score': '7.0', 'summary': '', 'img': None,
+                'genre': [], 'stars': [], 'country': country, 'rank': rank}
+
+    crawler.process_movie = process_movie
+    return crawler
+
+
+def test_crawl_countries_merges_in_input_order():
+    countries = {'KR': 'South Korea', 'JP': 'Japan', 'US': 'United States'}
+    factory = Factory()
+    # 첫 국가가 가장 늦게 끝나도 결과는 입력 순서
+    crawler = fake_crawler(factory, workers=3, delays={'KR': 0.05})
+    result = crawler.crawl_countries(countries)
+    assert [(movie['country'], movie['rank']) for movie in result['movies']] == [
+        (country, rank) for country in countries.values() for rank in (1, 2, 3)
+    ]
+    assert factory.created and all(driver.quit_called for driver in factory.created)
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith('crawler')]
+
+
+def test_crawl_countries_discards_broken_driver(monkeypatch):
+    monkeypatch.setattr(FakeDriver, 'broken', {'JP'})
+    factory = Factory()
+    crawler = fake_crawler(factory, workers=1)
+    result = crawler.crawl_countries({'JP': 'Japan', 'KR': 'South Korea'})
+    # 오류가 난 국가만 빠지고, 다음 국가는 새 드라이버로 크롤링
+    assert [movie['country'] for movie in result['movies']] == ['South Korea'] * 3
+    assert len(factory.created) == 2
+    assert all(driver.quit_called for driver in factory.created)
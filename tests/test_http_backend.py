@@ -0,0 +1,200 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.utils.http_backend import NEXT_DATA_PATTERN, HttpBackend
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+COUNTRY = 'South Korea'
+
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def next_data_page(list_items: list) -> str:
+    '''저장된 __NEXT_DATA__ fixture 의 titleListItems 만 바꿔 끼운 검색 결과 페이지'''
+    data = json.loads(NEXT_DATA_PATTERN.search(read_fixture('search_next_data.html')).group(1))
+    data['props']['pageProps']['searchResults']['titleResults']['titleListItems'] = list_items
+    return f'<html><head><script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></head></html>'
+
+
+def fixture_list_items() -> list:
+    data = json.loads(NEXT_DATA_PATTERN.search(read_fixture('search_next_data.html')).group(1))
+    return data['props']['pageProps']['searchResults']['titleResults']['titleListItems']
+
+
+def collect(backend: HttpBackend, top_n: int) -> list:
+    async def run():
+        return [page async for page in backend.iter_pages(None, 'KR', COUNTRY, top_n)]
+    return asyncio.run(run())
+
+
+class FakeElement:
+    def __init__(self, text='', src=None):
+        self.text = text
+        self.src = src
+
+    def get_attribute(self, name):
+        return self.src if name == 'src' else None
+
+
+class FakeModalDriver:
+    '''process_movie 가 읽는 모달 XPATH 에 content 값을 돌려주는 WebDriver 대역'''
+    def __init__(self, crawler, content: dict):
+        base = crawler.BASE_XPATH
+        self.elements = {
+            base + crawler.RELATIVE_XPATHS['img']: FakeElement(src=content['img']),
+            **{base + crawler.RELATIVE_XPATHS[key]: FakeElement(content[key])
+               for key in ('title', 'year', 'score', 'summary')},
+        }
+        self.lists = {
+            base + crawler.ELEMENTS_PATH[key]: [FakeElement(text) for text in content[key]]
+            for key in ('genre', 'stars')
+        }
+
+    def find_element(self, by, xpath):
+        return self.elements[xpath]
+
+    def find_elements(self, by, xpath):
+        return self.lists.get(xpath, [])
+
+
+class FakeWait:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def until(self, condition):
+        return condition(self.driver)
+
+
+def selenium_content(content: dict, rank: int) -> dict:
+    from crawler import MovieCrawler
+
+    crawler = MovieCrawler()
+    crawler.click_button = lambda driver, wait, xpath: None
+    crawler.wait_for_modal = lambda driver, opened: None
+    driver = FakeModalDriver(crawler, content)
+    return crawler.process_movie(driver, FakeWait(driver), COUNTRY, 'KR', rank)
+
+
+@pytest.mark.parametrize('fixture', ['search_next_data.html', 'search_list_item.html'])
+def test_parse_fixture(fixture):
+    contents = HttpBackend('unused').parse(read_fixture(fixture), top_n=10)
+
+    assert [content['rank'] for content in contents] == [1, 2, 3]
+    assert contents[0] == {
+        'img': 'https://m.media-amazon.com/images/M/parasite.jpg',
+        'title': 'Parasite',
+        'year': '2019',
+        'score': '8.5',
+        'summary': 'Greed and class discrimination threaten the newly formed symbiotic relationship '
+                   'between the wealthy Park family and the destitute Kim clan.',
+        'genre': ['Drama', 'Thriller'],
+        'stars': ['Bong Joon Ho', 'Song Kang-ho', 'Lee Sun-kyun'],
+        'rank': 1,
+    }
+    assert contents[1]['year'] == '2021–2025'
+    assert contents[2]['summary'].startswith('After being kidnapped & imprisoned')
+
+
+def test_parse_formats_agree():
+    backend = HttpBackend('unused')
+    next_data = backend.parse(read_fixture('search_next_data.html'), top_n=10)
+    list_item = backend.parse(read_fixture('search_list_item.html'), top_n=10)
+    assert next_data == list_item
+    assert backend.parse(read_fixture('search_next_data.html'), top_n=2) == next_data[:2]
+
+
+def test_parse_list_item_matches_selenium_content():
+    backend = HttpBackend('unused')
+    for rank, item in enumerate(fixture_list_items(), start=1):
+        content = backend.parse_list_item(item)
+        # iter_pages 가 rank/country 를 붙인 결과가 process_movie 의 content 와 같아야 transform 이 같은 레코드를 만든다
+        assert dict(content, rank=rank, country=COUNTRY) == selenium_content(content, rank)
+
+
+def test_iter_pages_matches_selenium_content():
+    backend = HttpBackend('file://' + os.path.join(FIXTURES, 'search_next_data.html'))
+    pages = collect(backend, top_n=10)
+    assert len(pages) == 1
+    for content in pages[0]:
+        assert content == selenium_content(content, content['rank'])
+
+
+def write_pages(directory, pages: dict) -> HttpBackend:
+    for page, html in pages.items():
+        (directory / f'KR_{page}.html').write_text(html, encoding='utf-8')
+    return HttpBackend(f'file://{directory}/{{}}_{{page}}.html')
+
+
+def test_iter_pages_stops_on_missing_page(tmp_path):
+    items = fixture_list_items()
+    backend = write_pages(tmp_path, {1: next_data_page(items[:2]), 2: next_data_page(items[2:])})
+    pages = collect(backend, top_n=10)
+    assert [[content['rank'] for content in page] for page in pages] == [[1, 2], [3]]
+
+
+def test_iter_pages_stops_on_repeated_page(tmp_path):
+    # 페이지 인자를 무시하고 같은 페이지를 다시 주는 서버
+    items = fixture_list_items()
+    backend = write_pages(tmp_path, {1: next_data_page(items), 2: next_data_page(items)})
+    pages = collect(backend, top_n=10)
+    assert [[content['title'] for content in page] for page in pages] == [['Parasite', 'Squid Game', 'Oldboy']]
+
+
+def test_iter_pages_stops_on_empty_page(tmp_path):
+    items = fixture_list_items()
+    backend = write_pages(tmp_path, {1: next_data_page(items[:1]), 2: next_data_page([]), 3: next_data_page(items[1:])})
+    pages = collect(backend, top_n=10)
+    assert [[content['rank'] for content in page] for page in pages] == [[1]]
+
+
+def test_iter_pages_requires_first_page(tmp_path):
+    backend = write_pages(tmp_path, {})
+    with pytest.raises(FileNotFoundError):
+        collect(backend, top_n=10)
+
+
+def paged_items(count: int) -> list:
+    '''fixture 항목을 제목만 바꿔 count 개로 늘린 titleListItems'''
+    template = fixture_list_items()
+    return [
+        dict(template[index % len(template)], titleText={'text': f'Title {index + 1}'})
+        for index in range(count)
+    ]
+
+
+def test_iter_pages_continues_ranks_across_pages(tmp_path):
+    items = paged_items(7)
+    backend = write_pages(tmp_path, {1: next_data_page(items[:3]), 2: next_data_page(items[3:6]),
+                                     3: next_data_page(items[6:])})
+    pages = collect(backend, top_n=10)
+    assert [[content['rank'] for content in page] for page in pages] == [[1, 2, 3], [4, 5, 6], [7]]
+    assert [content['title'] for page in pages for content in page] == [f'Title {rank}' for rank in range(1, 8)]
+    assert {content['country'] for page in pages for content in page} == {COUNTRY}
+
+
+def test_iter_pages_stops_at_top_n_mid_page(tmp_path):
+    items = paged_items(6)
+    backend = write_pages(tmp_path, {1: next_data_page(items[:3]), 2: next_data_page(items[3:])})
+    pages = collect(backend, top_n=4)
+    assert [[content['rank'] for content in page] for page in pages] == [[1, 2, 3], [4]]
+
+
+def test_crawl_pages_ranks_per_country(tmp_path):
+    items = paged_items(5)
+    for code, count in (('KR', 5), ('JP', 2)):
+        for page, offset in enumerate(range(0, count, 2), start=1):
+            (tmp_path / f'{code}_{page}.html').write_text(next_data_page(items[offset:min(offset + 2, count)]))
+    backend = HttpBackend(f'file://{tmp_path}/{{}}_{{page}}.html')
+    received = {}
+
+    def on_page(country_code, contents):
+        received.setdefault(country_code, []).append([content['rank'] for content in contents])
+
+    backend.crawl_pages({'KR': COUNTRY, 'JP': 'Japan'}, top_n=10, on_page=on_page)
+    assert received == {'KR': [[1, 2], [3, 4], [5]], 'JP': [[1, 2]]}
@@ -0,0 +1,117 @@
+import json
+import os
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import models
+from app.models.models import Base
+from app.Service.ingest import IngestJob
+from app.Service.reader import file_sha256
+from app.utils.cache import DashboardCache
+from app.utils.constant import CHANGE_MANIFEST_SUFFIX
+from app.utils.prerender import dashboard_path
+
+
+def movie_record(country: str, title: str, rank: int) -> dict:
+    return {
+        "country": country, "rank": rank,
+        "movie": {"title": title, "release_year": "2020", "score": "7.5", "summary": f"{title} summary",
+                  "image_url": None, "genres": ["Drama"], "actors": ["Actor"]},
+    }
+
+
+def make_job(tmp_path, monkeypatch) -> IngestJob:
+    cache = DashboardCache(cache_dir=str(tmp_path / 'cache'))
+    monkeypatch.setattr('app.Service.movie.dashboard_cache', cache)
+    monkeypatch.setattr('app.Service.ingest.dashboard_cache', cache)
+    path = tmp_path / 'movies.json'
+    path.write_text(json.dumps({"movies": [movie_record('Korea', 'Parasite', 1), movie_record('Japan', 'Ran', 1)]}))
+    engine = create_engine(f'sqlite:///{tmp_path}/movies.db')
+    Base.metadata.create_all(bind=engine)
+    return IngestJob(sessionmaker(bind=engine), str(path))
+
+
+def movie_count(job: IngestJob) -> int:
+    with job.session_factory() as db:
+        return db.scalar(select(func.count()).select_from(models.Movie))
+
+
+def test_startup_skips_unchanged_file(tmp_path, monkeypatch):
+    job = make_job(tmp_path, monkeypatch)
+    job.run(skip_unchanged=True)
+    assert job.status["state"] == "done" and job.status["count"] == 2
+
+    restarted = IngestJob(job.session_factory, job.json_path)
+    restarted.run(skip_unchanged=True)
+    assert restarted.status["state"] == "skipped"
+    assert restarted.get_country_id('Korea') is not None
+
+
+def test_startup_ingests_changed_file(tmp_path, monkeypatch):
+    job = make_job(tmp_path, monkeypatch)
+    job.run(skip_unchanged=True)
+    with open(job.json_path, 'w') as f:
+        json.dump({"movies": [movie_record('Korea', 'Oldboy', 1)]}, f)
+
+    restarted = IngestJob(job.session_factory, job.json_path)
+    restarted.run(skip_unchanged=True)
+    assert restarted.status["state"] == "done" and restarted.status["count"] == 1
+    assert movie_count(restarted) == 3
+
+
+def test_dashboard_cache_generation_survives_restart(tmp_path):
+    cache = DashboardCache(cache_dir=str(tmp_path))
+    etag = cache.make_etag('Korea', 'v1', {})
+    cache.put('Korea', etag, '<html>Korea</html>')
+
+    restarted = DashboardCache(cache_dir=str(tmp_path))
+    assert restarted.make_etag('Korea', 'v1', {}) == etag
+    assert restarted.get('Korea', etag) == '<html>Korea</html>'
+
+    restarted.invalidate(['Korea'])
+    assert restarted.make_etag('Korea', 'v1', {}) != etag
+    # 같은 cache_dir 을 쓰는 다른 프로세스의 무효화도 반영됨
+    assert cache.make_etag('Korea', 'v1', {}) == restarted.make_etag('Korea', 'v1', {})
+
+
+def write_crawl(path: str, records: list, previous_sha256: str, changed: list, removed: list):
+    with open(path, 'w') as f:
+        json.dump({"movies": records}, f)
+    with open(os.path.splitext(path)[0] + CHANGE_MANIFEST_SUFFIX, 'w') as f:
+        json.dump({
+            "source_sha256": file_sha256(path), "previous_sha256": previous_sha256,
+            "changed_countries": changed, "removed_countries": removed,
+            "hashes": {record["country"]: {} for record in records},
+        }, f)
+
+
+def test_removed_country_is_retired_and_restored(tmp_path, monkeypatch):
+    job = make_job(tmp_path, monkeypatch)
+    job.prerender_dir = str(tmp_path / 'dashboards')
+    os.makedirs(job.prerender_dir)
+    job.run()
+    prerendered = dashboard_path('Japan', job.prerender_dir)
+    with open(prerendered, 'w') as f:
+        f.write('<html>Japan</html>')
+
+    write_crawl(job.json_path, [movie_record('Korea', 'Parasite', 1)], job.load_state()["sha256"], [], ['Japan'])
+    job.run()
+    assert job.status["state"] == "done" and job.status["removed"] == ['Japan']
+    assert job.get_country_id('Japan') is None and job.get_country_id('Korea') is not None
+    assert not os.path.exists(prerendered)
+    with job.session_factory() as db:
+        country_ids = set(db.scalars(select(models.CountryStats.country_id)).all())
+        assert country_ids == {job.get_country_id('Korea')}
+        # 랭킹 이력은 남겨 둠
+        assert db.scalar(select(func.count()).select_from(models.Ranking)) == 2
+
+    # 재시작 후에도 서빙하지 않음
+    restarted = IngestJob(job.session_factory, job.json_path)
+    restarted.refresh_index()
+    assert restarted.get_country_id('Japan') is None
+
+    write_crawl(job.json_path, [movie_record('Korea', 'Parasite', 1), movie_record('Japan', 'Ran', 1)],
+                job.load_state()["sha256"], ['Japan'], [])
+    job.run()
+    assert job.get_country_id('Japan') is not None
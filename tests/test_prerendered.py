@@ -0,0 +1,35 @@
+import os
+import time
+
+import pytest
+
+from app.routers import routes
+from app.utils.cache import DashboardCache
+
+
+class NoPosters:
+    def version(self):
+        return None
+
+
+@pytest.fixture
+def prerendered(tmp_path, monkeypatch):
+    cache = DashboardCache(cache_dir=str(tmp_path / 'cache'))
+    monkeypatch.setattr(routes, 'dashboard_cache', cache)
+    monkeypatch.setattr(routes, 'poster_store', NoPosters())
+    monkeypatch.setattr(routes, 'dashboard_path', lambda country_name: str(tmp_path / f'{country_name}.html'))
+    for country in ('Korea', 'Japan'):
+        path = tmp_path / f'{country}.html'
+        path.write_text(f'<html>{country}</html>')
+        past = time.time() - 60
+        os.utime(path, (past, past))
+    return cache
+
+
+def test_prerendered_dashboard_is_served_until_reingest(prerendered):
+    assert routes.read_prerendered('Korea', None) == '<html>Korea</html>'
+
+    # 새 스냅샷 없이 영화 정보만 바뀐 재적재
+    prerendered.invalidate(['Korea'])
+    assert routes.read_prerendered('Korea', None) is None
+    assert routes.read_prerendered('Japan', None) == '<html>Japan</html>'
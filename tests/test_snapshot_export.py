@@ -0,0 +1,70 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import models
+from app.models.models import Base
+from app.Service.movie import bulk_insert_movies_from_json
+from app.Service.reader import file_sha256
+from app.Service.snapshot_export import SnapshotStore, export_crawl_file, export_snapshots
+from app.utils.cache import DashboardCache
+
+CRAWLED_AT = datetime(2024, 5, 1, 12, 0, 0, 123456)
+
+
+def write_crawl(tmp_path, manifest: bool = True) -> str:
+    path = tmp_path / 'movies.json'
+    path.write_text(json.dumps({"movies": [
+        {"country": country, "rank": rank,
+         "movie": {"title": f"{country} {rank}", "release_year": "2020", "score": "7.5",
+                   "genres": ["Drama"], "actors": ["Actor"]}}
+        for country in ('Korea', 'Japan') for rank in (1, 2)
+    ]}))
+    if manifest:
+        (tmp_path / 'movies.hashes.json').write_text(json.dumps({
+            "source_sha256": file_sha256(str(path)), "crawled_at": CRAWLED_AT.isoformat(),
+            "changed_countries": ['Korea', 'Japan'], "removed_countries": [], "hashes": {},
+        }))
+    return str(path)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.Service.movie.dashboard_cache', DashboardCache(cache_dir=str(tmp_path / 'cache')))
+    engine = create_engine(f'sqlite:///{tmp_path}/movies.db')
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_file_and_db_exports_share_the_snapshot(tmp_path, db):
+    json_path = write_crawl(tmp_path)
+    bulk_insert_movies_from_json(db, json_path=json_path)
+    assert db.scalars(select(models.Ranking.crawled_at).distinct()).all() == [CRAWLED_AT]
+
+    output_dir = str(tmp_path / 'snapshots')
+    assert export_crawl_file(json_path, output_dir=output_dir) == 4
+    assert export_snapshots(db, output_dir=output_dir) == 4
+
+    frame = SnapshotStore(output_dir).load(['crawled_at', 'country', 'rank'])
+    assert len(frame) == 4
+    assert list(frame['crawled_at'].unique()) == [CRAWLED_AT]
+
+
+def test_reingesting_a_crawl_replaces_its_snapshot(tmp_path, db):
+    json_path = write_crawl(tmp_path)
+    bulk_insert_movies_from_json(db, json_path=json_path)
+    bulk_insert_movies_from_json(db, json_path=json_path)
+    assert db.scalar(select(func.count()).select_from(models.Ranking)) == 4
+    assert db.scalar(select(func.count()).select_from(models.SnapshotScoreStats)) == 2
+
+
+def test_export_crawl_file_requires_snapshot_time(tmp_path):
+    json_path = write_crawl(tmp_path, manifest=False)
+    with pytest.raises(ValueError):
+        export_crawl_file(json_path, output_dir=str(tmp_path / 'snapshots'))
+    assert export_crawl_file(json_path, crawled_at=CRAWLED_AT, output_dir=str(tmp_path / 'snapshots')) == 4
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app.models import models
+from app.models.models import Base
+from app.Service.movie import bulk_insert_movies, finalize_ranking_snapshots, resolve_name_ids
+
+CRAWLED_AT = datetime(2024, 5, 1, 12, 0, 0, 123456)
+RECORDS = [
+    {"country": "South Korea", "rank": rank, "movie": {"title": f"Movie {rank}", "genres": ["Drama"], "actors": []}}
+    for rank in range(1, 4)
+]
+
+
+def test_snapshot_columns_keep_microseconds_on_mysql():
+    for model in (models.Ranking, models.SnapshotGenreCount, models.SnapshotScoreStats):
+        ddl = str(CreateTable(model.__table__).compile(dialect=mysql.dialect()))
+        assert 'crawled_at DATETIME(6)' in ddl, ddl
+
+
+def test_snapshot_time_round_trip(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path}/movies.db')
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        bulk_insert_movies(db, RECORDS, crawled_at=CRAWLED_AT)
+        db.commit()
+        assert db.scalars(select(models.Ranking.crawled_at).distinct()).all() == [CRAWLED_AT]
+
+        # 같은 구성의 다음 스냅샷은 저장된 시각과 정확히 비교되어 직전 스냅샷과 같다고 판단되어야 함
+        country_ids = set(resolve_name_ids(db, models.Country, {"South Korea"}).values())
+        later = CRAWLED_AT.replace(microsecond=654321)
+        bulk_insert_movies(db, RECORDS, crawled_at=later)
+        assert finalize_ranking_snapshots(db, country_ids, later) == set()
+        db.commit()
+        assert db.scalar(select(func.count()).select_from(models.Ranking)) == len(RECORDS)
+        assert db.scalars(select(models.Ranking.crawled_at).distinct()).all() == [CRAWLED_AT]
+    finally:
+        db.close()
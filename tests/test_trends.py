@@ -0,0 +1,67 @@
+import json
+
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from app.models import models
+from app.models.models import Base
+from app.Service.movie import bulk_insert_movies_from_json
+from app.Service.trends import backfill_snapshot_rollups
+
+
+def load_session(tmp_path):
+    records = [
+        {
+            "country": country,
+            "rank": rank,
+            "movie": {
+                "title": f"{country} {rank}",
+                "release_year": "2020",
+                "score": str(5 + rank),
+                "genres": ["Drama", f"Genre {rank % 2}"],
+                "actors": [f"Actor {rank}"],
+            },
+        }
+        for country in ('South Korea', 'Japan') for rank in range(1, 4)
+    ]
+    path = tmp_path / 'movies.json'
+    path.write_text(json.dumps({"movies": records}), encoding='utf-8')
+    engine = create_engine(f'sqlite:///{tmp_path}/movies.db')
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    bulk_insert_movies_from_json(db, json_path=str(path))
+    return db
+
+
+def rollups(db) -> tuple:
+    genre_counts = db.execute(select(
+        models.SnapshotGenreCount.country_id, models.SnapshotGenreCount.crawled_at,
+        models.SnapshotGenreCount.genre_id, models.SnapshotGenreCount.count,
+    ).order_by(*models.SnapshotGenreCount.__table__.primary_key.columns)).all()
+    score_stats = db.execute(select(
+        models.SnapshotScoreStats.country_id, models.SnapshotScoreStats.crawled_at,
+        models.SnapshotScoreStats.movie_count, models.SnapshotScoreStats.score_sum,
+    ).order_by(models.SnapshotScoreStats.country_id)).all()
+    return genre_counts, score_stats
+
+
+def test_backfill_fills_missing_rollups(tmp_path):
+    db = load_session(tmp_path)
+    try:
+        expected = rollups(db)
+        assert expected[0] and len(expected[1]) == 2
+        # 적재가 계산한 롤업의 스냅샷 시각은 랭킹 행에 저장된 값과 같아야 함
+        stored = set(db.scalars(select(models.Ranking.crawled_at).distinct()).all())
+        assert {row.crawled_at for row in expected[0] + expected[1]} == stored
+
+        # 롤업 테이블이 생기기 전에 적재된 스냅샷 (장르 수만 일부 남은 경우 포함)
+        db.execute(delete(models.SnapshotScoreStats))
+        db.commit()
+        assert backfill_snapshot_rollups(db) == 2
+        assert rollups(db) == expected
+
+        assert backfill_snapshot_rollups(db) == 0
+        assert backfill_snapshot_rollups(db, rebuild=True) == 2
+        assert rollups(db) == expected
+    finally:
+        db.close()